@@ -0,0 +1,429 @@
+"""
+Benchmark for the token verification hot path.
+
+Runs fully offline: signing keys are generated locally and the discovery
+document and JWKS are served by an ``httpx.MockTransport``. Every
+combination of the selected targets, JWT backends, token sizes, role
+counts, cache modes and concurrency levels is measured, and the results
+are written as JSON so runs can be compared over time. The report also
+lists the speedup of each JWT backend over python-jose.
+
+Usage:
+    python benchmarks/bench_auth.py --output results.json
+    python benchmarks/bench_auth.py --targets verify_token --concurrency 1 64 --iterations 5000
+
+    # Fail if any scenario is more than 10% slower than a previous run
+    python benchmarks/bench_auth.py --baseline results.json --max-regression 0.1
+"""
+
+import argparse
+import asyncio
+import base64
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+# Settings are read from the environment when the package is imported
+os.environ.setdefault("KEYCLOAK_SERVER_URL", "https://keycloak.bench.local")
+os.environ.setdefault("KEYCLOAK_REALM", "bench")
+os.environ.setdefault("KEYCLOAK_CLIENT_ID", "bench-client")
+os.environ.setdefault("KEYCLOAK_CLIENT_SECRET", "bench-secret")
+os.environ.setdefault("KEYCLOAK_AUDIENCE", "bench-client")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import httpx
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, padding, rsa
+from cryptography.hazmat.primitives.asymmetric.utils import decode_dss_signature
+from starlette.requests import Request
+
+import fastapi_keycloak_auth
+from fastapi_keycloak_auth import dependencies
+from fastapi_keycloak_auth.client import KeycloakClient
+from fastapi_keycloak_auth.config import KeycloakSettings
+
+RESULTS_VERSION = 2
+
+TARGETS = ("verify_token", "get_current_user", "require_role")
+
+JWT_BACKENDS = ("jose", "cryptography")
+
+# Extra claim bytes added to each token
+TOKEN_SIZES = {"small": 0, "medium": 1024, "large": 8192}
+
+KID = "bench-key"
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _int_b64(value: int, length: int | None = None) -> str:
+    return _b64(value.to_bytes(length or (value.bit_length() + 7) // 8, "big"))
+
+
+def _rsa_key() -> tuple[Any, dict]:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    numbers = private_key.public_key().public_numbers()
+    return private_key, {"kty": "RSA", "n": _int_b64(numbers.n), "e": _int_b64(numbers.e)}
+
+
+def _ec_key() -> tuple[Any, dict]:
+    private_key = ec.generate_private_key(ec.SECP256R1())
+    numbers = private_key.public_key().public_numbers()
+    return private_key, {"kty": "EC", "crv": "P-256", "x": _int_b64(numbers.x, 32), "y": _int_b64(numbers.y, 32)}
+
+
+def _ed25519_key() -> tuple[Any, dict]:
+    private_key = ed25519.Ed25519PrivateKey.generate()
+    public_bytes = private_key.public_key().public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+    return private_key, {"kty": "OKP", "crv": "Ed25519", "x": _b64(public_bytes)}
+
+
+# Algorithm -> key generator returning (private key, public JWK members)
+KEY_GENERATORS = {
+    "RS256": _rsa_key,
+    "ES256": _ec_key,
+    "EdDSA": _ed25519_key,
+}
+
+
+def _sign(private_key: Any, algorithm: str, data: bytes) -> bytes:
+    if algorithm == "RS256":
+        return private_key.sign(data, padding.PKCS1v15(), hashes.SHA256())
+    if algorithm == "ES256":
+        r, s = decode_dss_signature(private_key.sign(data, ec.ECDSA(hashes.SHA256())))
+        return r.to_bytes(32, "big") + s.to_bytes(32, "big")
+    return private_key.sign(data)
+
+
+def supports(jwt_backend: str, algorithm: str) -> bool:
+    """Check if a JWT backend can verify an algorithm (python-jose has no EdDSA)."""
+    return not (jwt_backend == "jose" and algorithm == "EdDSA")
+
+
+@dataclass
+class Scenario:
+    """One point of the benchmark matrix."""
+    target: str
+    jwt_backend: str
+    algorithm: str
+    token_size: str
+    roles: int
+    cache: bool
+    concurrency: int
+
+    @property
+    def name(self) -> str:
+        cache = "cache" if self.cache else "nocache"
+        return (
+            f"{self.target}/{self.jwt_backend}/{self.algorithm}/{self.token_size}"
+            f"/roles={self.roles}/{cache}/c={self.concurrency}"
+        )
+
+
+@dataclass
+class Result:
+    """Measurements for one scenario. Latencies are in microseconds."""
+    scenario: str
+    target: str
+    jwt_backend: str
+    algorithm: str
+    token_size: str
+    token_bytes: int
+    roles: int
+    cache: bool
+    concurrency: int
+    iterations: int
+    ops_per_sec: float
+    mean_us: float
+    p50_us: float
+    p90_us: float
+    p99_us: float
+    max_us: float
+
+
+class Realm:
+    """Locally generated signing key plus a mocked discovery/JWKS endpoint."""
+
+    def __init__(self, settings: KeycloakSettings, algorithm: str):
+        self.settings = settings
+        self.algorithm = algorithm
+        self.private_key, public_jwk = KEY_GENERATORS[algorithm]()
+        self.jwks = {"keys": [{**public_jwk, "use": "sig", "alg": algorithm, "kid": KID}]}
+
+    def transport(self) -> httpx.MockTransport:
+        base = f"{self.settings.issuer}/protocol/openid-connect"
+        configuration = {
+            "issuer": self.settings.issuer,
+            "authorization_endpoint": f"{base}/auth",
+            "token_endpoint": f"{base}/token",
+            "userinfo_endpoint": f"{base}/userinfo",
+            "jwks_uri": f"{base}/certs",
+            "end_session_endpoint": f"{base}/logout",
+        }
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if str(request.url) == self.settings.configuration_url:
+                return httpx.Response(200, json=configuration)
+            if str(request.url) == configuration["jwks_uri"]:
+                return httpx.Response(200, json=self.jwks)
+            return httpx.Response(404)
+
+        return httpx.MockTransport(handler)
+
+    def make_token(self, index: int, roles: int, padding: int) -> str:
+        now = int(time.time())
+        payload = {
+            "sub": f"user-{index}",
+            "email": f"user-{index}@bench.local",
+            "preferred_username": f"user-{index}",
+            "iss": self.settings.issuer,
+            "aud": self.settings.audience,
+            "iat": now,
+            "exp": now + 3600,
+            "realm_access": {"roles": [f"role-{i}" for i in range(roles - 1)] + ["bench"]},
+        }
+        if padding:
+            payload["padding"] = "x" * padding
+        header = {"alg": self.algorithm, "typ": "JWT", "kid": KID}
+        signing_input = f"{_b64(json.dumps(header).encode())}.{_b64(json.dumps(payload).encode())}"
+        signature = _sign(self.private_key, self.algorithm, signing_input.encode())
+        return f"{signing_input}.{_b64(signature)}"
+
+
+def _make_request(token: str) -> Request:
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(b"authorization", f"Bearer {token}".encode())],
+    }
+    return Request(scope)
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def run_scenario(
+    scenario: Scenario,
+    realm: Realm,
+    iterations: int,
+    warmup: int,
+    distinct_tokens: int,
+) -> Result:
+    """Measure one scenario and return its result."""
+    settings = realm.settings.model_copy(
+        update={"token_cache_enabled": scenario.cache, "jwt_backend": scenario.jwt_backend},
+    )
+    client = KeycloakClient(settings)
+    client._http_client = httpx.AsyncClient(transport=realm.transport())
+
+    # The FastAPI dependencies use the module-level singletons
+    dependencies._settings = settings
+    dependencies._client = client
+
+    padding = TOKEN_SIZES[scenario.token_size]
+    tokens = [realm.make_token(i, scenario.roles, padding) for i in range(distinct_tokens)]
+    requests = [_make_request(token) for token in tokens]
+
+    role_checker = dependencies.require_role("bench")
+
+    async def call(index: int) -> None:
+        if scenario.target == "verify_token":
+            await client.verify_token(tokens[index % distinct_tokens])
+        elif scenario.target == "get_current_user":
+            await dependencies.get_current_user(requests[index % distinct_tokens])
+        else:
+            await role_checker(requests[index % distinct_tokens])
+
+    try:
+        # Fills the discovery/JWKS caches and, if enabled, the token cache
+        for i in range(max(warmup, distinct_tokens if scenario.cache else 0)):
+            await call(i)
+
+        latencies: list[float] = []
+        counter = itertools.count()
+
+        async def worker() -> None:
+            while (index := next(counter)) < iterations:
+                start = time.perf_counter_ns()
+                await call(index)
+                latencies.append((time.perf_counter_ns() - start) / 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(scenario.concurrency)))
+        elapsed = time.perf_counter() - started
+    finally:
+        await client.aclose()
+        dependencies.clear_settings_cache()
+
+    latencies.sort()
+    return Result(
+        scenario=scenario.name,
+        target=scenario.target,
+        jwt_backend=scenario.jwt_backend,
+        algorithm=scenario.algorithm,
+        token_size=scenario.token_size,
+        token_bytes=len(tokens[0]),
+        roles=scenario.roles,
+        cache=scenario.cache,
+        concurrency=scenario.concurrency,
+        iterations=iterations,
+        ops_per_sec=iterations / elapsed,
+        mean_us=statistics.fmean(latencies),
+        p50_us=_percentile(latencies, 0.50),
+        p90_us=_percentile(latencies, 0.90),
+        p99_us=_percentile(latencies, 0.99),
+        max_us=latencies[-1],
+    )
+
+
+def build_scenarios(args: argparse.Namespace) -> list[Scenario]:
+    """Return the cartesian product of the selected matrix axes, minus unsupported combinations."""
+    caches = {"on": [True], "off": [False], "both": [False, True]}[args.cache]
+    scenarios = [
+        Scenario(target, jwt_backend, algorithm, token_size, roles, cache, concurrency)
+        for target, jwt_backend, algorithm, token_size, roles, cache, concurrency in itertools.product(
+            args.targets, args.jwt_backends, args.algorithms, args.token_sizes, args.roles, caches, args.concurrency,
+        )
+    ]
+    return [scenario for scenario in scenarios if supports(scenario.jwt_backend, scenario.algorithm)]
+
+
+async def run(args: argparse.Namespace) -> dict:
+    """Run all selected scenarios and return the JSON report."""
+    settings = KeycloakSettings()  # type: ignore[call-arg]
+    realms = {algorithm: Realm(settings, algorithm) for algorithm in args.algorithms}
+
+    results = []
+    for scenario in build_scenarios(args):
+        result = await run_scenario(
+            scenario,
+            realms[scenario.algorithm],
+            iterations=args.iterations,
+            warmup=args.warmup,
+            distinct_tokens=args.distinct_tokens,
+        )
+        if not args.quiet:
+            print(
+                f"{result.scenario:<72} {result.ops_per_sec:>10.0f} ops/s  "
+                f"p50 {result.p50_us:>8.1f}us  p99 {result.p99_us:>8.1f}us",
+                file=sys.stderr,
+            )
+        results.append(asdict(result))
+
+    return {
+        "version": RESULTS_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "package_version": fastapi_keycloak_auth.__version__,
+        },
+        "parameters": {
+            "iterations": args.iterations,
+            "warmup": args.warmup,
+            "distinct_tokens": args.distinct_tokens,
+        },
+        "results": results,
+        "speedups": speedups(results),
+    }
+
+
+def speedups(results: list[dict], baseline_backend: str = "jose") -> list[dict]:
+    """
+    Return the throughput of each non-baseline JWT backend relative to the
+    baseline backend in the otherwise identical scenario.
+    """
+    def key(result: dict) -> tuple:
+        return tuple(result[k] for k in ("target", "algorithm", "token_size", "roles", "cache", "concurrency"))
+
+    baseline = {key(result): result for result in results if result["jwt_backend"] == baseline_backend}
+    comparisons = []
+    for result in results:
+        before = baseline.get(key(result))
+        if result["jwt_backend"] == baseline_backend or before is None:
+            continue
+        comparisons.append({
+            "scenario": result["scenario"],
+            "baseline": before["scenario"],
+            "speedup": result["ops_per_sec"] / before["ops_per_sec"],
+            "p50_speedup": before["p50_us"] / result["p50_us"],
+        })
+    return comparisons
+
+
+def compare(report: dict, baseline: dict, max_regression: float) -> list[str]:
+    """
+    Return a message for each scenario whose throughput dropped by more
+    than ``max_regression`` (a fraction) compared to the baseline.
+    """
+    previous = {result["scenario"]: result for result in baseline.get("results", [])}
+    regressions = []
+    for result in report["results"]:
+        before = previous.get(result["scenario"])
+        if before is None:
+            continue
+        change = result["ops_per_sec"] / before["ops_per_sec"] - 1
+        if change < -max_regression:
+            regressions.append(
+                f"{result['scenario']}: {before['ops_per_sec']:.0f} -> {result['ops_per_sec']:.0f} ops/s ({change:+.1%})"
+            )
+    return regressions
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark token verification.")
+    parser.add_argument("--targets", nargs="+", choices=TARGETS, default=list(TARGETS))
+    parser.add_argument("--jwt-backends", nargs="+", choices=JWT_BACKENDS, default=list(JWT_BACKENDS))
+    parser.add_argument("--algorithms", nargs="+", choices=sorted(KEY_GENERATORS), default=sorted(KEY_GENERATORS))
+    parser.add_argument("--token-sizes", nargs="+", choices=list(TOKEN_SIZES), default=list(TOKEN_SIZES))
+    parser.add_argument("--roles", nargs="+", type=int, default=[1, 10, 100], help="Realm roles per token")
+    parser.add_argument("--cache", choices=["on", "off", "both"], default="both", help="Verified-token cache")
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 16, 64], help="Concurrent callers")
+    parser.add_argument("--iterations", type=int, default=2000, help="Measured calls per scenario")
+    parser.add_argument("--warmup", type=int, default=100, help="Unmeasured calls before each scenario")
+    parser.add_argument("--distinct-tokens", type=int, default=100, help="Different tokens cycled through per scenario")
+    parser.add_argument("--output", type=Path, help="Write the JSON report to this file instead of stdout")
+    parser.add_argument("--baseline", type=Path, help="Previous JSON report to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.1, help="Allowed throughput drop vs. baseline (fraction)")
+    parser.add_argument("--quiet", action="store_true", help="Do not print a summary line per scenario")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n", encoding="utf-8")
+    else:
+        print(output)
+
+    if args.baseline:
+        regressions = compare(report, json.loads(args.baseline.read_text(encoding="utf-8")), args.max_regression)
+        for message in regressions:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""
+Benchmark for token cookie sizes.
+
+Builds Keycloak-like access tokens with a growing number of roles and
+groups. For each token it measures the Cookie request header the browser
+sends back, with plain cookies and with KEYCLOAK_COOKIE_COMPRESSION, and
+the time to encode and decode the cookie. Runs offline; the signature is
+random bytes of the size of an RS256 signature, since only its size
+matters here.
+
+Usage:
+    python benchmarks/bench_cookies.py --output cookies.json
+    python benchmarks/bench_cookies.py --roles 10 100 --groups 0 50 --chunk-size 3800
+"""
+
+import argparse
+import base64
+import itertools
+import json
+import os
+import platform
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Settings are read from the environment when the package is imported
+os.environ.setdefault("KEYCLOAK_SERVER_URL", "https://keycloak.bench.local")
+os.environ.setdefault("KEYCLOAK_REALM", "bench")
+os.environ.setdefault("KEYCLOAK_CLIENT_ID", "bench-client")
+os.environ.setdefault("KEYCLOAK_CLIENT_SECRET", "bench-secret")
+os.environ.setdefault("KEYCLOAK_AUDIENCE", "bench-client")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import fastapi_keycloak_auth
+from fastapi_keycloak_auth.config import KeycloakSettings
+from fastapi_keycloak_auth.cookies import read_token_cookie, token_cookie_values
+
+RESULTS_VERSION = 1
+
+# Per-browser limit for one cookie (name, value and attributes)
+COOKIE_LIMIT = 4096
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def make_token(settings: KeycloakSettings, roles: int, groups: int) -> str:
+    now = int(time.time())
+    payload = {
+        "exp": now + 300,
+        "iat": now,
+        "jti": _b64(os.urandom(16)),
+        "iss": settings.issuer,
+        "aud": [settings.audience, "account"],
+        "sub": "5f4b3c2a-1d0e-4f9a-8b7c-6d5e4f3a2b1c",
+        "typ": "Bearer",
+        "azp": settings.client_id,
+        "session_state": _b64(os.urandom(16)),
+        "scope": "openid email profile",
+        "email_verified": True,
+        "name": "Bench User",
+        "preferred_username": "bench-user",
+        "email": "bench-user@bench.local",
+        "realm_access": {"roles": ["offline_access", "uma_authorization", *(f"app-role-{i}" for i in range(roles))]},
+        "resource_access": {"account": {"roles": ["manage-account", "view-profile"]}},
+        "groups": [f"/organisation/department-{i // 10}/team-{i}" for i in range(groups)],
+    }
+    header = {"alg": "RS256", "typ": "JWT", "kid": _b64(os.urandom(32))}
+    signing_input = f"{_b64(json.dumps(header).encode())}.{_b64(json.dumps(payload).encode())}"
+    return f"{signing_input}.{_b64(os.urandom(256))}"
+
+
+@dataclass
+class Result:
+    """Cookie sizes for one token. Sizes are in bytes, times in microseconds."""
+    scenario: str
+    roles: int
+    groups: int
+    token_bytes: int
+    plain_header_bytes: int
+    plain_cookies: int
+    plain_over_limit: bool
+    compressed_header_bytes: int
+    compressed_cookies: int
+    saving: float
+    encode_us: float
+    decode_us: float
+
+
+def _cookie_header(cookies: list[tuple[str, str]]) -> str:
+    return "; ".join(f"{name}={value}" for name, value in cookies)
+
+
+def measure(settings: KeycloakSettings, roles: int, groups: int, iterations: int) -> Result:
+    token = make_token(settings, roles, groups)
+    plain_settings = settings.model_copy(update={"cookie_compression": False, "cookie_chunk_size": 0})
+    compressed_settings = settings.model_copy(update={"cookie_compression": True})
+
+    plain = token_cookie_values(settings.cookie_name, token, plain_settings)
+    compressed = token_cookie_values(settings.cookie_name, token, compressed_settings)
+    cookie_jar = dict(compressed)
+    if read_token_cookie(cookie_jar, settings.cookie_name) != token:
+        raise RuntimeError("Compressed cookie does not round-trip")
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        token_cookie_values(settings.cookie_name, token, compressed_settings)
+    encode_us = (time.perf_counter() - start) / iterations * 1e6
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        read_token_cookie(cookie_jar, settings.cookie_name)
+    decode_us = (time.perf_counter() - start) / iterations * 1e6
+
+    plain_bytes = len(_cookie_header(plain))
+    compressed_bytes = len(_cookie_header(compressed))
+    return Result(
+        scenario=f"roles={roles}/groups={groups}",
+        roles=roles,
+        groups=groups,
+        token_bytes=len(token),
+        plain_header_bytes=plain_bytes,
+        plain_cookies=len(plain),
+        plain_over_limit=plain_bytes > COOKIE_LIMIT,
+        compressed_header_bytes=compressed_bytes,
+        compressed_cookies=len(compressed),
+        saving=1 - compressed_bytes / plain_bytes,
+        encode_us=encode_us,
+        decode_us=decode_us,
+    )
+
+
+def run(args: argparse.Namespace) -> dict:
+    """Measure every roles/groups combination and return the JSON report."""
+    settings = KeycloakSettings(cookie_chunk_size=args.chunk_size)  # type: ignore[call-arg]
+    results = []
+    for roles, groups in itertools.product(args.roles, args.groups):
+        result = measure(settings, roles, groups, args.iterations)
+        if not args.quiet:
+            print(
+                f"{result.scenario:<24} {result.plain_header_bytes:>7} B -> {result.compressed_header_bytes:>6} B "
+                f"({result.saving:>6.1%})  {result.compressed_cookies} cookie(s)  "
+                f"encode {result.encode_us:>6.1f}us  decode {result.decode_us:>6.1f}us",
+                file=sys.stderr,
+            )
+        results.append(asdict(result))
+
+    return {
+        "version": RESULTS_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "package_version": fastapi_keycloak_auth.__version__,
+        },
+        "parameters": {"chunk_size": args.chunk_size, "iterations": args.iterations},
+        "results": results,
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure token cookie sizes with and without compression.")
+    parser.add_argument("--roles", nargs="+", type=int, default=[1, 20, 100, 400], help="Realm roles per token")
+    parser.add_argument("--groups", nargs="+", type=int, default=[0, 50], help="Groups per token")
+    parser.add_argument("--chunk-size", type=int, default=3800, help="KEYCLOAK_COOKIE_CHUNK_SIZE for compressed cookies")
+    parser.add_argument("--iterations", type=int, default=1000, help="Encode/decode calls timed per token")
+    parser.add_argument("--output", type=Path, help="Write the JSON report to this file instead of stdout")
+    parser.add_argument("--quiet", action="store_true", help="Do not print a summary line per token")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    report = run(args)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n", encoding="utf-8")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
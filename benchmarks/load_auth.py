@@ -0,0 +1,253 @@
+"""
+End-to-end load test of the auth router against an in-process Keycloak.
+
+Each virtual user repeatedly runs the full browser cycle
+
+    /auth/login -> Keycloak authorize -> /auth/callback -> /auth/refresh -> /auth/me
+
+against an app built with ``create_auth_router``. Keycloak is replaced by
+``fastapi_keycloak_auth.testing.FakeKeycloak`` (real RS256 tokens), and
+both apps are called through ``httpx.ASGITransport``, so no network or
+server process is involved. Throughput, per-step latency percentiles and
+histograms and the number of calls to each Keycloak endpoint are written
+as JSON.
+
+Usage:
+    python benchmarks/load_auth.py --users 1 16 64 --cycles 50 --output load.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlsplit
+
+# Settings are read from the environment when the package is imported
+os.environ.setdefault("KEYCLOAK_SERVER_URL", "https://keycloak.bench.local")
+os.environ.setdefault("KEYCLOAK_REALM", "bench")
+os.environ.setdefault("KEYCLOAK_CLIENT_ID", "bench-client")
+os.environ.setdefault("KEYCLOAK_CLIENT_SECRET", "bench-secret")
+os.environ.setdefault("KEYCLOAK_AUDIENCE", "bench-client")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import httpx
+from fastapi import FastAPI
+
+import fastapi_keycloak_auth
+from fastapi_keycloak_auth import dependencies
+from fastapi_keycloak_auth.client import KeycloakClient
+from fastapi_keycloak_auth.config import KeycloakSettings
+from fastapi_keycloak_auth.router import create_auth_router
+from fastapi_keycloak_auth.testing import FakeKeycloak
+
+RESULTS_VERSION = 1
+
+STEPS = ("login", "authorize", "callback", "refresh", "me")
+
+# Upper bounds of the latency histogram buckets, in milliseconds
+HISTOGRAM_BUCKETS_MS = (0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+class LoadError(Exception):
+    """Raised when a step of the login cycle returns an unexpected response."""
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _histogram(latencies_ms: list[float]) -> dict[str, int]:
+    buckets = {f"le_{bound}ms": 0 for bound in HISTOGRAM_BUCKETS_MS}
+    buckets["inf"] = 0
+    for value in latencies_ms:
+        for bound in HISTOGRAM_BUCKETS_MS:
+            if value <= bound:
+                buckets[f"le_{bound}ms"] += 1
+                break
+        else:
+            buckets["inf"] += 1
+    return buckets
+
+
+def _summary(latencies_ms: list[float]) -> dict:
+    if not latencies_ms:
+        return {"count": 0}
+    values = sorted(latencies_ms)
+    return {
+        "count": len(values),
+        "mean_ms": statistics.fmean(values),
+        "p50_ms": _percentile(values, 0.50),
+        "p90_ms": _percentile(values, 0.90),
+        "p99_ms": _percentile(values, 0.99),
+        "max_ms": values[-1],
+        "histogram": _histogram(values),
+    }
+
+
+def _path(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.path}?{parts.query}" if parts.query else parts.path
+
+
+class LoadTest:
+    """The app under test, the fake Keycloak and the collected measurements."""
+
+    def __init__(self, settings: KeycloakSettings):
+        self.settings = settings
+        self.keycloak = FakeKeycloak(settings)
+        self.client = KeycloakClient(settings, transport=httpx.ASGITransport(app=self.keycloak))
+
+        # The router and dependencies use the module-level singletons
+        dependencies._settings = settings
+        dependencies._client = self.client
+
+        self.app = FastAPI()
+        self.app.include_router(create_auth_router(prefix=settings.auth_path))
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+
+    async def _timed(self, step: str, request) -> httpx.Response:
+        start = time.perf_counter_ns()
+        response = await request
+        self.latencies[step].append((time.perf_counter_ns() - start) / 1_000_000)
+        return response
+
+    async def cycle(self, browser: httpx.AsyncClient, keycloak: httpx.AsyncClient) -> None:
+        """Run one login -> callback -> refresh -> me cycle."""
+        auth_path = self.settings.auth_path
+
+        response = await self._timed("login", browser.get(f"{auth_path}/login"))
+        if not response.is_redirect:
+            raise LoadError("login")
+
+        response = await self._timed("authorize", keycloak.get(response.headers["location"]))
+        if not response.is_redirect:
+            raise LoadError("authorize")
+
+        response = await self._timed("callback", browser.get(_path(response.headers["location"])))
+        if not response.is_redirect:
+            raise LoadError("callback")
+
+        response = await self._timed("refresh", browser.post(f"{auth_path}/refresh"))
+        if response.status_code != 200:
+            raise LoadError("refresh")
+        access_token = response.json()["access_token"]
+
+        response = await self._timed(
+            "me", browser.get(f"{auth_path}/me", headers={"Authorization": f"Bearer {access_token}"}),
+        )
+        if response.status_code != 200:
+            raise LoadError("me")
+
+    async def user(self, cycles: int) -> None:
+        """One virtual user with its own cookie jar."""
+        async with (
+            httpx.AsyncClient(transport=httpx.ASGITransport(app=self.app), base_url="http://testserver") as browser,
+            httpx.AsyncClient(transport=httpx.ASGITransport(app=self.keycloak)) as keycloak,
+        ):
+            for _ in range(cycles):
+                try:
+                    await self.cycle(browser, keycloak)
+                except LoadError as e:
+                    self.errors[str(e)] += 1
+
+
+async def run_level(settings: KeycloakSettings, users: int, cycles: int, warmup: int) -> dict:
+    """Run ``users`` concurrent virtual users for ``cycles`` cycles each."""
+    load_test = LoadTest(settings)
+    try:
+        await load_test.user(warmup)
+        load_test.latencies.clear()
+        load_test.errors.clear()
+        load_test.keycloak.calls.clear()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(load_test.user(cycles) for _ in range(users)))
+        elapsed = time.perf_counter() - started
+    finally:
+        await load_test.client.aclose()
+        dependencies.clear_settings_cache()
+
+    total_cycles = users * cycles
+    return {
+        "users": users,
+        "cycles": total_cycles,
+        "duration_s": elapsed,
+        "cycles_per_sec": total_cycles / elapsed,
+        "requests_per_sec": sum(len(values) for values in load_test.latencies.values()) / elapsed,
+        "errors": dict(load_test.errors),
+        "steps": {step: _summary(load_test.latencies[step]) for step in STEPS},
+        "upstream_calls": dict(load_test.keycloak.calls),
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    """Run all concurrency levels and return the JSON report."""
+    settings = KeycloakSettings(token_cache_enabled=args.token_cache)  # type: ignore[call-arg]
+    levels = []
+    for users in args.users:
+        level = await run_level(settings, users, args.cycles, args.warmup)
+        if not args.quiet:
+            me = level["steps"]["me"]
+            print(
+                f"users={users:<5} {level['cycles_per_sec']:>8.1f} cycles/s  "
+                f"{level['requests_per_sec']:>8.1f} req/s  /me p99 {me.get('p99_ms', 0):.2f}ms  "
+                f"errors {sum(level['errors'].values())}",
+                file=sys.stderr,
+            )
+        levels.append(level)
+
+    return {
+        "version": RESULTS_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "package_version": fastapi_keycloak_auth.__version__,
+        },
+        "parameters": {
+            "cycles_per_user": args.cycles,
+            "warmup": args.warmup,
+            "token_cache": args.token_cache,
+        },
+        "levels": levels,
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load test the auth router against an in-process Keycloak.")
+    parser.add_argument("--users", nargs="+", type=int, default=[1, 16, 64], help="Concurrent virtual users")
+    parser.add_argument("--cycles", type=int, default=50, help="Login cycles per virtual user")
+    parser.add_argument("--warmup", type=int, default=5, help="Unmeasured cycles before each level")
+    parser.add_argument("--token-cache", action="store_true", help="Enable the verified-token cache")
+    parser.add_argument("--output", type=Path, help="Write the JSON report to this file instead of stdout")
+    parser.add_argument("--quiet", action="store_true", help="Do not print a summary line per level")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n", encoding="utf-8")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
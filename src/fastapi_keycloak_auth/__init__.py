@@ -3,9 +3,9 @@ FastAPI Keycloak Auth - Simple Keycloak authentication for FastAPI + Svelte.
 
 Usage:
     from fastapi import FastAPI
-    from fastapi_keycloak_auth import auth_router, CurrentUser, require_role
+    from fastapi_keycloak_auth import auth_router, CurrentUser, keycloak_lifespan, require_role
 
-    app = FastAPI()
+    app = FastAPI(lifespan=keycloak_lifespan)
     app.include_router(auth_router)
 
     @app.get("/protected")
@@ -31,6 +31,22 @@ load_dotenv()
 
 from .config import KeycloakSettings
 from .client import KeycloakClient
+from .cache import CacheStats, RejectedTokenCache, TokenCache
+from .shared_cache import SharedCache
+from .cache_backends import CacheBackend, FileCacheBackend, MemoryCacheBackend, RedisCacheBackend, create_cache_backend
+from .sessions import Session, SessionStore
+from .jwt_backends import JWTBackend, JoseBackend, CryptographyBackend, SigningKey, TokenNotYetValidError, create_jwt_backend
+from .validation import TokenValidator
+from .extractors import (
+    BearerSource,
+    CookieSource,
+    HeaderSource,
+    QuerySource,
+    SessionSource,
+    TokenExtractor,
+    TokenSource,
+)
+from .executor import ExecutorStats, VerifyExecutor
 from .models import TokenPayload, User, AuthStatus, TokenResponse
 from .events import (
     AuthEvent,
@@ -45,22 +61,61 @@ from .events import (
 from .dependencies import (
     CurrentUser,
     OptionalUser,
+    RequestAuth,
+    authenticate_request,
     get_current_user,
     get_current_user_optional,
     get_keycloak_client,
     get_settings,
     require_role,
     require_any_role,
+    require_policy,
     clear_settings_cache,
     clear_client_cache,
 )
+from .policy import Policy, all_of, any_of, none_of
+from .middleware import KeycloakAuthMiddleware
 from .router import auth_router, create_auth_router
+from .lifespan import keycloak_lifespan
 
 __all__ = [
     # Config
     "KeycloakSettings",
     # Client
     "KeycloakClient",
+    # Cache
+    "CacheStats",
+    "TokenCache",
+    "RejectedTokenCache",
+    "SharedCache",
+    "CacheBackend",
+    "MemoryCacheBackend",
+    "FileCacheBackend",
+    "RedisCacheBackend",
+    "create_cache_backend",
+    # Sessions
+    "Session",
+    "SessionStore",
+    # JWT backends
+    "JWTBackend",
+    "JoseBackend",
+    "CryptographyBackend",
+    "SigningKey",
+    "TokenNotYetValidError",
+    "create_jwt_backend",
+    # Validation
+    "TokenValidator",
+    # Token extraction
+    "TokenExtractor",
+    "TokenSource",
+    "CookieSource",
+    "BearerSource",
+    "HeaderSource",
+    "QuerySource",
+    "SessionSource",
+    # Executor
+    "VerifyExecutor",
+    "ExecutorStats",
     # Models
     "TokenPayload",
     "User",
@@ -78,17 +133,29 @@ __all__ = [
     # Dependencies
     "CurrentUser",
     "OptionalUser",
+    "RequestAuth",
+    "authenticate_request",
     "get_current_user",
     "get_current_user_optional",
     "get_keycloak_client",
     "get_settings",
     "require_role",
     "require_any_role",
+    "require_policy",
     "clear_settings_cache",
     "clear_client_cache",
+    # Policies
+    "Policy",
+    "all_of",
+    "any_of",
+    "none_of",
+    # Middleware
+    "KeycloakAuthMiddleware",
     # Router
     "auth_router",
     "create_auth_router",
+    # Lifespan
+    "keycloak_lifespan",
 ]
 
 __version__ = "1.0.0"
\ No newline at end of file
@@ -0,0 +1,172 @@
+"""
+Caches for verified and rejected tokens.
+"""
+
+import hashlib
+import os
+import stat
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from .models import TokenPayload
+
+
+def check_private(path: str, st: os.stat_result) -> None:
+    """
+    Refuse a cache or snapshot file that other local users can touch.
+
+    Anyone who can write it could plant tokens or signing keys, so it must be
+    owned by this user with no group or other permission bits.
+    """
+    if not hasattr(os, "getuid"):
+        return
+    if st.st_uid != os.getuid() or st.st_mode & 0o077:
+        mode = "0700" if stat.S_ISDIR(st.st_mode) else "0600"
+        raise PermissionError(f"{path} must be owned by this user with mode {mode}")
+
+
+@dataclass
+class CacheStats:
+    """Counters for sizing a token cache."""
+    hits: int = 0
+    misses: int = 0
+    # Entries dropped because the cache was full
+    evictions: int = 0
+    # Entries dropped because the token or TTL expired
+    expirations: int = 0
+    size: int = 0
+
+
+def token_hash(token: str) -> str:
+    """Return the cache key for a token (the raw token is never stored)."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class TokenCache:
+    """
+    Bounded LRU cache of verified token payloads.
+
+    Each entry expires at the token's ``exp`` or after ``max_ttl`` seconds,
+    whichever comes first.
+    """
+
+    def __init__(self, max_size: int = 1024, max_ttl: float = 60.0):
+        self.max_size = max_size
+        self.max_ttl = max_ttl
+        self._entries: OrderedDict[str, tuple[TokenPayload, float]] = OrderedDict()
+        self._stats = CacheStats()
+
+    def get(self, token: str) -> TokenPayload | None:
+        """Return the cached payload for a token, or None on a miss."""
+        key = token_hash(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats.misses += 1
+            return None
+
+        payload, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self._stats.expirations += 1
+            self._stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._stats.hits += 1
+        return payload
+
+    def set(self, token: str, payload: TokenPayload, exp: float | None = None) -> None:
+        """Cache a verified payload until ``exp`` or ``max_ttl``, whichever is first."""
+        expires_at = time.time() + self.max_ttl
+        if exp is not None:
+            expires_at = min(expires_at, exp)
+
+        key = token_hash(token)
+        self._entries[key] = (payload, expires_at)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._stats.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)."""
+        self._entries.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the cache counters."""
+        return CacheStats(
+            hits=self._stats.hits,
+            misses=self._stats.misses,
+            evictions=self._stats.evictions,
+            expirations=self._stats.expirations,
+            size=len(self._entries),
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RejectedTokenCache:
+    """
+    Bounded LRU cache of recently rejected tokens.
+
+    Stores the error each token was rejected with (keyed by token hash),
+    so a flood of the same invalid token is turned away without decoding
+    or verifying it again. Entries expire after ``ttl`` seconds.
+    """
+
+    def __init__(self, max_size: int = 4096, ttl: float = 300.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[type[Exception], tuple, float]] = OrderedDict()
+        self._stats = CacheStats()
+
+    def get(self, token: str) -> Exception | None:
+        """Return a fresh copy of the error a token was rejected with, or None."""
+        key = token_hash(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats.misses += 1
+            return None
+
+        error_type, args, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self._stats.expirations += 1
+            self._stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._stats.hits += 1
+        return error_type(*args)
+
+    def add(self, token: str, error: Exception) -> None:
+        """Remember that a token was rejected with ``error``."""
+        key = token_hash(token)
+        self._entries[key] = (type(error), error.args, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._stats.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)."""
+        self._entries.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the cache counters."""
+        return CacheStats(
+            hits=self._stats.hits,
+            misses=self._stats.misses,
+            evictions=self._stats.evictions,
+            expirations=self._stats.expirations,
+            size=len(self._entries),
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
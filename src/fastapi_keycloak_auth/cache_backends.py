@@ -0,0 +1,368 @@
+"""
+Async cache backends shared between processes and hosts.
+
+KeycloakClient uses a backend (if configured) for verified tokens,
+userinfo responses and the JWKS, so pods behind a load balancer share
+one cache instead of each warming its own.
+
+Usage:
+    KEYCLOAK_CACHE_BACKEND_URL=redis://localhost:6379/0
+    KEYCLOAK_CACHE_BACKEND_URL=file:///var/cache/keycloak-auth
+
+    # or programmatically
+    client = KeycloakClient(settings, cache_backend=MemoryCacheBackend())
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import os
+import ssl
+import struct
+import tempfile
+import time
+from collections import OrderedDict
+from typing import Protocol, runtime_checkable
+from urllib.parse import unquote, urlparse
+
+from .cache import check_private
+
+
+class CacheBackendError(Exception):
+    """Raised when a cache backend returns an error or malformed response."""
+
+
+# Errors of an unreachable or misbehaving backend, for callers that degrade
+# gracefully. A RESP connection dropped mid-reply raises IncompleteReadError,
+# a garbled reply ValueError.
+BACKEND_ERRORS = (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError, CacheBackendError)
+
+
+@runtime_checkable
+class CacheBackend(Protocol):
+    """Interface for async key/value cache backends."""
+
+    async def get(self, key: str) -> bytes | None:
+        """Return the value for a key, or None if missing or expired."""
+        ...
+
+    async def get_many(self, keys: list[str]) -> list[bytes | None]:
+        """Return the values for several keys in one round trip, in order."""
+        ...
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store a value that expires after ``ttl`` seconds."""
+        ...
+
+    async def delete(self, key: str) -> None:
+        """Remove a key."""
+        ...
+
+    async def aclose(self) -> None:
+        """Release connections held by the backend."""
+        ...
+
+
+class MemoryCacheBackend:
+    """In-process LRU backend with per-key expiry."""
+
+    def __init__(self, max_size: int = 10_000):
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def get_many(self, keys: list[str]) -> list[bytes | None]:
+        return [await self.get(key) for key in keys]
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        self._entries[key] = (value, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    async def aclose(self) -> None:
+        pass
+
+
+# =============================================================================
+# File backend
+# =============================================================================
+
+# Each file starts with the wall-clock expiry as a big-endian double
+_EXPIRY = struct.Struct(">d")
+
+
+class FileCacheBackend:
+    """
+    Backend keeping one file per key in a directory.
+
+    Shared by all workers on a host and kept across restarts. File names
+    are hashes of the keys, so a lookup is a single open. Writes go to a
+    temporary file that is moved into place, so readers never see a
+    partial value. Expired files are removed when read and by a sweep
+    every ``sweep_interval`` writes. The directory must be private to this
+    user, as other users could otherwise read or plant entries.
+    """
+
+    def __init__(self, directory: str, key_prefix: str = "", sweep_interval: int = 1000):
+        self.directory = directory
+        self.key_prefix = key_prefix
+        self.sweep_interval = sweep_interval
+        self._writes = 0
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        check_private(directory, os.stat(directory))
+
+    def _path(self, key: str) -> str:
+        name = hashlib.sha256((self.key_prefix + key).encode()).hexdigest()
+        return os.path.join(self.directory, name)
+
+    def _read(self, key: str) -> bytes | None:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        if len(data) < _EXPIRY.size or _EXPIRY.unpack_from(data)[0] <= time.time():
+            with contextlib.suppress(OSError):
+                os.unlink(path)
+            return None
+        return data[_EXPIRY.size:]
+
+    def _write(self, key: str, value: bytes, ttl: float) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_EXPIRY.pack(time.time() + ttl))
+                f.write(value)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+            raise
+
+    def _delete(self, key: str) -> None:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self._path(key))
+
+    def sweep(self) -> int:
+        """Remove expired files and return how many were removed."""
+        removed = 0
+        now = time.time()
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                try:
+                    with open(entry.path, "rb") as f:
+                        header = f.read(_EXPIRY.size)
+                    if len(header) < _EXPIRY.size or _EXPIRY.unpack(header)[0] <= now:
+                        os.unlink(entry.path)
+                        removed += 1
+                except OSError:
+                    continue
+        return removed
+
+    async def get(self, key: str) -> bytes | None:
+        return await asyncio.to_thread(self._read, key)
+
+    async def get_many(self, keys: list[str]) -> list[bytes | None]:
+        if not keys:
+            return []
+        return await asyncio.to_thread(lambda: [self._read(key) for key in keys])
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        await asyncio.to_thread(self._write, key, value, ttl)
+        self._writes += 1
+        if self.sweep_interval and self._writes % self.sweep_interval == 0:
+            await asyncio.to_thread(self.sweep)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._delete, key)
+
+    async def aclose(self) -> None:
+        pass
+
+
+# =============================================================================
+# Redis (RESP2) backend
+# =============================================================================
+
+def _encode_command(*args: str | bytes) -> bytes:
+    parts = [f"*{len(args)}\r\n".encode()]
+    for arg in args:
+        data = arg.encode() if isinstance(arg, str) else arg
+        parts.append(f"${len(data)}\r\n".encode())
+        parts.append(data)
+        parts.append(b"\r\n")
+    return b"".join(parts)
+
+
+async def _read_reply(reader: asyncio.StreamReader):
+    line = await reader.readline()
+    if not line.endswith(b"\r\n"):
+        raise ConnectionError("Connection closed by cache server")
+    kind, body = line[:1], line[1:-2]
+
+    if kind == b"+":
+        return body
+    if kind == b"-":
+        raise CacheBackendError(body.decode(errors="replace"))
+    if kind == b":":
+        return int(body)
+    if kind == b"$":
+        length = int(body)
+        if length < 0:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2]
+    if kind == b"*":
+        count = int(body)
+        if count < 0:
+            return None
+        return [await _read_reply(reader) for _ in range(count)]
+    raise CacheBackendError(f"Unexpected reply from cache server: {line!r}")
+
+
+class _RedisConnection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    async def execute(self, *commands: tuple[str | bytes, ...]) -> list:
+        """Send all commands in one write and read the replies (pipelining)."""
+        self.writer.write(b"".join(_encode_command(*command) for command in commands))
+        await self.writer.drain()
+        replies = []
+        error = None
+        for _ in commands:
+            try:
+                replies.append(await _read_reply(self.reader))
+            except CacheBackendError as e:
+                # Keep reading so the connection stays in sync
+                error = error or e
+                replies.append(None)
+        if error is not None:
+            raise error
+        return replies
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class RedisCacheBackend:
+    """
+    Backend for servers speaking the Redis protocol (Redis, Valkey, KeyDB, ...).
+
+    Uses a small pool of connections. ``get_many`` pipelines one GET per key,
+    which also works on clustered setups where MGET across slots does not.
+    """
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        max_connections: int = 10,
+        timeout: float = 1.0,
+        key_prefix: str = "",
+    ):
+        parsed = urlparse(url)
+        if parsed.scheme not in ("redis", "rediss"):
+            raise ValueError(f"Unsupported cache URL scheme: {parsed.scheme}")
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.username = unquote(parsed.username) if parsed.username else None
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.ssl = ssl.create_default_context() if parsed.scheme == "rediss" else None
+        self.timeout = timeout
+        self.key_prefix = key_prefix
+        self._idle: list[_RedisConnection] = []
+        self._semaphore = asyncio.Semaphore(max_connections)
+
+    async def _connect(self) -> _RedisConnection:
+        reader, writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+        connection = _RedisConnection(reader, writer)
+        commands = []
+        if self.password is not None:
+            commands.append(("AUTH", self.username, self.password) if self.username else ("AUTH", self.password))
+        if self.db:
+            commands.append(("SELECT", str(self.db)))
+        if commands:
+            try:
+                await connection.execute(*commands)
+            except BaseException:
+                connection.close()
+                raise
+        return connection
+
+    async def _execute(self, *commands: tuple[str | bytes, ...]) -> list:
+        async with self._semaphore:
+            connection = self._idle.pop() if self._idle else None
+            try:
+                if connection is None:
+                    connection = await asyncio.wait_for(self._connect(), self.timeout)
+                replies = await asyncio.wait_for(connection.execute(*commands), self.timeout)
+            except CacheBackendError:
+                # The connection read all replies and is still usable
+                if connection is not None:
+                    self._idle.append(connection)
+                raise
+            except BaseException:
+                if connection is not None:
+                    connection.close()
+                raise
+            self._idle.append(connection)
+            return replies
+
+    async def get(self, key: str) -> bytes | None:
+        (value,) = await self._execute(("GET", self.key_prefix + key))
+        return value
+
+    async def get_many(self, keys: list[str]) -> list[bytes | None]:
+        if not keys:
+            return []
+        return await self._execute(*(("GET", self.key_prefix + key) for key in keys))
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        milliseconds = int(ttl * 1000)
+        if milliseconds <= 0:
+            return
+        await self._execute(("SET", self.key_prefix + key, value, "PX", str(milliseconds)))
+
+    async def delete(self, key: str) -> None:
+        await self._execute(("DEL", self.key_prefix + key))
+
+    async def aclose(self) -> None:
+        while self._idle:
+            self._idle.pop().close()
+
+
+def create_cache_backend(url: str, key_prefix: str = "") -> CacheBackend:
+    """
+    Create a cache backend from a URL.
+
+    Supported schemes: ``memory://``, ``file:///path/to/dir``, ``redis://``
+    and ``rediss://`` (TLS).
+    """
+    if url.startswith("memory://"):
+        return MemoryCacheBackend()
+    if url.startswith("file://"):
+        return FileCacheBackend(unquote(urlparse(url).path), key_prefix=key_prefix)
+    return RedisCacheBackend(url, key_prefix=key_prefix)
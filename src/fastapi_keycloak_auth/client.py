@@ -2,127 +2,722 @@
 Keycloak HTTP client for token operations.
 """
 
+import asyncio
+import contextlib
+import json
+import logging
+import time
+from collections.abc import Collection, Iterable
+
 import httpx
 from jose import JWTError, jwt
+from jose.exceptions import JWKError
+from pydantic import ValidationError
 
+from .cache import RejectedTokenCache, TokenCache, token_hash
+from .cache_backends import BACKEND_ERRORS, CacheBackend, create_cache_backend
 from .config import KeycloakSettings
+from .executor import VerifyExecutor
+from .extractors import TokenExtractor
+from .jwt_backends import (
+    JoseBackend,
+    JWTBackend,
+    SigningKey,
+    TokenNotYetValidError,
+    create_jwt_backend,
+    key_algorithm,
+    unverified_token,
+)
 from .models import TokenPayload, TokenResponse, OpenIdConfiguration
+from .sessions import SessionStore
+from .shared_cache import SharedCache
+from .singleflight import SingleFlight
+from .snapshot import SnapshotStore
+from .validation import TokenValidator
+
+logger = logging.getLogger(__name__)
+
+
+def build_signing_keys(
+    jwks: dict,
+    backend: JWTBackend | None = None,
+    algorithms: Collection[str] | None = None,
+) -> dict[str | None, SigningKey]:
+    """
+    Parse a JWKS document into a ``kid -> signing key`` index.
+
+    Each key is bound to the algorithm from its ``alg`` member (or derived
+    from its key type and curve) and built with ``backend`` (python-jose
+    by default). Keys whose algorithm is not in ``algorithms``, encryption
+    keys and keys that cannot be parsed are skipped, so a single
+    unsupported entry does not break verification for the others.
+    """
+    backend = backend or JoseBackend()
+    signing_keys: dict[str | None, SigningKey] = {}
+    for key_data in jwks.get("keys", []):
+        if key_data.get("use", "sig") != "sig":
+            continue
+        kid = key_data.get("kid")
+        try:
+            algorithm = key_algorithm(key_data)
+            if algorithms is not None and algorithm not in algorithms:
+                logger.debug(f"Skipping JWK {kid}: algorithm {algorithm} is not allowed")
+                continue
+            key = backend.load_key(key_data, algorithm)
+            signing_keys[kid] = SigningKey(kid=kid, algorithm=algorithm, key=key, jwk=key_data)
+        except (JWKError, KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Skipping unsupported JWK {kid}: {e}")
+    return signing_keys
+
+
+def _check_jwks(jwks) -> dict:
+    """
+    Return ``jwks`` if it looks like a JSON Web Key Set.
+
+    Raises:
+        ValueError: If it is not an object with a list of key objects
+    """
+    keys = jwks.get("keys", []) if isinstance(jwks, dict) else None
+    if not isinstance(keys, list) or not all(isinstance(key, dict) for key in keys):
+        raise ValueError("Response is not a JSON Web Key Set")
+    return jwks
 
 
 class KeycloakClient:
-    """HTTP client for Keycloak operations."""
+    """
+    HTTP client for Keycloak operations.
+
+    Cached remote lookups (discovery document, JWKS) are fetched through
+    a SingleFlight, so concurrent cache misses result in one request.
+    """
 
-    def __init__(self, settings: KeycloakSettings):
+    def __init__(
+        self,
+        settings: KeycloakSettings,
+        cache_backend: CacheBackend | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
         self.settings = settings
+        # Custom httpx transport, e.g. httpx.ASGITransport for an in-process Keycloak
+        self.transport = transport
         self._openid_configuration: OpenIdConfiguration | None = None
         self._jwks: dict | None = None
+        self.jwt_backend = create_jwt_backend(settings.jwt_backend)
+        self.validator = TokenValidator.from_settings(settings)
+        # Backend keys are namespaced per realm (JWKS) and per validator (verified tokens)
+        self._jwks_key = f"jwks:{token_hash(settings.issuer)[:16]}"
+        self.token_extractor = TokenExtractor.from_settings(settings)
+        self.verify_executor: VerifyExecutor | None = None
+        if settings.verify_executor != "none":
+            self.verify_executor = VerifyExecutor(
+                settings.verify_executor,
+                max_workers=settings.verify_executor_workers,
+                max_concurrency=settings.verify_max_concurrency,
+            )
+        self._signing_keys: dict[str | None, SigningKey] | None = None
+        self._jwks_fetched_at: float | None = None
+        # Wall-clock time the JWKS was fetched, for comparing with other workers
+        self._jwks_updated_at: float = 0.0
+        self._jwks_refresh_task: asyncio.Task | None = None
+        self._revalidate_task: asyncio.Task | None = None
+        self._flights = SingleFlight()
+        # Recent refresh results by refresh token hash: (tokens, expires at)
+        self._recent_refreshes: dict[str, tuple[TokenResponse, float]] = {}
+        self._http_client: httpx.AsyncClient | None = None
+        self.shared_cache: SharedCache | None = None
+        if settings.shared_cache_path:
+            self.shared_cache = SharedCache(
+                settings.shared_cache_path,
+                slots=settings.shared_cache_slots,
+                slot_size=settings.shared_cache_slot_size,
+                max_ttl=settings.token_cache_ttl,
+                namespace=self.validator.fingerprint,
+            )
+        self.token_cache: TokenCache | SharedCache | None = None
+        if settings.token_cache_enabled and self.shared_cache is not None:
+            self.token_cache = self.shared_cache
+        elif settings.token_cache_enabled:
+            self.token_cache = TokenCache(
+                max_size=settings.token_cache_max_size,
+                max_ttl=settings.token_cache_ttl,
+            )
+        self.rejected_tokens: RejectedTokenCache | None = None
+        if settings.rejected_cache_enabled:
+            self.rejected_tokens = RejectedTokenCache(
+                max_size=settings.rejected_cache_max_size,
+                ttl=settings.rejected_cache_ttl,
+            )
+        self.cache_backend = cache_backend
+        if cache_backend is None and settings.cache_backend_url:
+            self.cache_backend = create_cache_backend(settings.cache_backend_url, key_prefix=settings.cache_key_prefix)
+        self.session_store: SessionStore | None = None
+        if settings.session_store_url:
+            self.session_store = SessionStore(
+                create_cache_backend(settings.session_store_url, key_prefix=settings.cache_key_prefix),
+                default_ttl=settings.session_ttl,
+            )
+        self.snapshot: SnapshotStore | None = None
+        if settings.snapshot_path:
+            self.snapshot = SnapshotStore(settings.snapshot_path, ttl=settings.snapshot_ttl)
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """
+        Shared, connection-pooled HTTP client for Keycloak requests.
+
+        Created lazily on first use and kept open until aclose() is called,
+        so consecutive requests reuse TCP/TLS connections.
+        """
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(
+                verify=self.settings.ssl_context,
+                http2=self.settings.http2,
+                timeout=self.settings.http_timeouts,
+                limits=self.settings.http_limits,
+                transport=self.transport,
+            )
+        return self._http_client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client and release pooled connections."""
+        await self.stop_jwks_refresh()
+        if self._revalidate_task is not None:
+            self._revalidate_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._revalidate_task
+            self._revalidate_task = None
+        if self.cache_backend is not None:
+            await self.cache_backend.aclose()
+        if self.session_store is not None:
+            await self.session_store.aclose()
+        if self.shared_cache is not None:
+            if self.token_cache is self.shared_cache:
+                self.token_cache = None
+            self.shared_cache.close()
+            self.shared_cache = None
+        if self.verify_executor is not None:
+            self.verify_executor.shutdown()
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    async def __aenter__(self) -> "KeycloakClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def warmup(self) -> bool:
+        """
+        Preload the discovery document and JWKS and parse the signing keys.
+
+        If a snapshot is configured and valid, it is loaded from disk
+        without any network request and revalidated against Keycloak in
+        the background.
+
+        Returns True on success. Failures are logged and reported as False
+        instead of raised, so a Keycloak outage does not stop the app from
+        starting; the caches are filled lazily on the next request instead.
+        """
+        if self.load_snapshot():
+            self._revalidate_task = asyncio.create_task(self._revalidate_snapshot())
+            return True
+
+        try:
+            await self.get_openid_configuration()
+            self._find_signing_key(None, await self.get_jwks())
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning(f"Keycloak warm-up failed: {e}")
+            return False
+        return True
+
+    def load_snapshot(self) -> bool:
+        """Fill the discovery and JWKS caches from the snapshot file, if valid."""
+        if self.snapshot is None:
+            return False
+        snapshot = self.snapshot.load(self.settings.issuer)
+        if snapshot is None:
+            return False
+        self._openid_configuration = snapshot.openid_configuration
+        self._signing_keys = build_signing_keys(snapshot.jwks, self.jwt_backend, self.validator.algorithms)
+        self._jwks = snapshot.jwks
+        # Leave _jwks_fetched_at unset so an unknown kid refetches immediately
+        self._jwks_fetched_at = None
+        return True
+
+    async def _revalidate_snapshot(self) -> None:
+        try:
+            await self._flights.do("openid_configuration", self._fetch_openid_configuration)
+            await self.refresh_jwks()
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning(f"Snapshot revalidation failed: {e}")
+
+    async def _save_snapshot(self, jwks: dict) -> None:
+        if self.snapshot is None or self._openid_configuration is None:
+            return
+        try:
+            await asyncio.to_thread(self.snapshot.save, self.settings.issuer, self._openid_configuration, jwks)
+        except OSError as e:
+            logger.warning(f"Could not write snapshot {self.snapshot.path}: {e}")
+
+    @property
+    def is_ready(self) -> bool:
+        """Check if discovery document and JWKS are loaded."""
+        return self._openid_configuration is not None and self._jwks is not None
 
     async def get_openid_configuration(self) -> OpenIdConfiguration:
-        """Fetch and cache OpenID configuration from Keycloak."""
+        """
+        Fetch and cache OpenID configuration from Keycloak.
+
+        Concurrent calls on a cold cache share a single request.
+        """
         if self._openid_configuration is None:
-            async with httpx.AsyncClient(verify=self.settings.ssl_context) as client:
-                response = await client.get(self.settings.configuration_url)
-                response.raise_for_status()
-                self._openid_configuration = OpenIdConfiguration(**response.json())
+            return await self._flights.do("openid_configuration", self._fetch_openid_configuration)
+        return self._openid_configuration
+
+    async def _fetch_openid_configuration(self) -> OpenIdConfiguration:
+        response = await self.http_client.get(self.settings.configuration_url)
+        response.raise_for_status()
+        self._openid_configuration = OpenIdConfiguration(**response.json())
         return self._openid_configuration
 
     async def get_jwks(self) -> dict:
-        """Fetch and cache JWKS from Keycloak."""
-        if self._jwks is None:
-            openid_configuration = await self.get_openid_configuration()
-
-            async with httpx.AsyncClient(verify=self.settings.ssl_context) as client:
-                response = await client.get(openid_configuration.jwks_uri)
-                response.raise_for_status()
-                self._jwks = response.json()
+        """
+        Fetch and cache JWKS from Keycloak.
+
+        Concurrent calls on a cold cache share a single request. With a
+        shared cache or cache backend, a JWKS fetched by another worker is
+        used instead.
+        """
+        if self._jwks is None and not self._adopt_shared_jwks():
+            return await self._flights.do("jwks", self._load_jwks)
         return self._jwks
 
+    async def _load_jwks(self) -> dict:
+        cached = await self._backend_get(self._jwks_key)
+        if cached is not None:
+            try:
+                jwks = _check_jwks(json.loads(cached))
+            except ValueError:
+                pass
+            else:
+                self._signing_keys = build_signing_keys(jwks, self.jwt_backend, self.validator.algorithms)
+                self._jwks = jwks
+                self._jwks_fetched_at = time.monotonic()
+                self._jwks_updated_at = time.time()
+                return jwks
+        return await self._fetch_jwks()
+
+    async def refresh_jwks(self) -> dict:
+        """
+        Refetch the JWKS from Keycloak.
+
+        Concurrent calls share a single in-flight request.
+        """
+        return await self._flights.do("jwks", self._fetch_jwks)
+
+    async def _fetch_jwks(self) -> dict:
+        openid_configuration = await self.get_openid_configuration()
+
+        response = await self.http_client.get(openid_configuration.jwks_uri)
+        response.raise_for_status()
+        jwks = _check_jwks(response.json())
+        self._signing_keys = build_signing_keys(jwks, self.jwt_backend, self.validator.algorithms)
+        self._jwks = jwks
+        self._jwks_fetched_at = time.monotonic()
+        self._jwks_updated_at = time.time()
+        if self.shared_cache is not None:
+            self.shared_cache.set_jwks(jwks, self._jwks_updated_at)
+        await self._backend_set(self._jwks_key, json.dumps(jwks).encode(), self.settings.jwks_cache_ttl)
+        await self._save_snapshot(jwks)
+        return jwks
+
+    def _token_key(self, token: str) -> str:
+        return f"token:{self.validator.fingerprint}:{token_hash(token)}"
+
+    async def _backend_get(self, key: str) -> bytes | None:
+        if self.cache_backend is None:
+            return None
+        try:
+            return await self.cache_backend.get(key)
+        except BACKEND_ERRORS as e:
+            logger.warning(f"Cache backend get failed: {e}")
+            return None
+
+    async def _backend_set(self, key: str, value: bytes, ttl: float) -> None:
+        if self.cache_backend is None or ttl <= 0:
+            return
+        try:
+            await self.cache_backend.set(key, value, ttl)
+        except BACKEND_ERRORS as e:
+            logger.warning(f"Cache backend set failed: {e}")
+
+    def _adopt_shared_jwks(self) -> bool:
+        """Use the JWKS from the shared cache if another worker stored a newer one."""
+        if self.shared_cache is None:
+            return False
+        shared = self.shared_cache.get_jwks(newer_than=self._jwks_updated_at if self._jwks is not None else 0.0)
+        if shared is None:
+            return False
+        jwks, updated_at = shared
+        self._signing_keys = build_signing_keys(jwks, self.jwt_backend, self.validator.algorithms)
+        self._jwks = jwks
+        self._jwks_updated_at = updated_at
+        self._jwks_fetched_at = time.monotonic() - max(0.0, time.time() - updated_at)
+        return True
+
+    async def get_signing_key(self, kid: str | None) -> SigningKey:
+        """
+        Return the parsed public key and its algorithm for a key ID.
+
+        Keys are parsed once per JWKS fetch and looked up by ``kid``.
+        Tokens without a ``kid`` are accepted if the realm has exactly one
+        signing key. An unknown ``kid`` first checks the shared cache for a
+        JWKS refetched by another worker, then triggers a JWKS refetch (at
+        most once per ``jwks_min_refresh_interval``) to pick up rotated keys.
+        """
+        key = self._find_signing_key(kid, await self.get_jwks())
+        if key is None and self._adopt_shared_jwks():
+            key = self._find_signing_key(kid, self._jwks)
+        if key is None and self._jwks_refetch_allowed():
+            try:
+                jwks = await self.refresh_jwks()
+            except (httpx.HTTPError, ValueError) as e:
+                logger.warning(f"JWKS refetch for unknown key {kid} failed: {e}")
+            else:
+                key = self._find_signing_key(kid, jwks)
+        if key is None:
+            raise JWTError(f"Unknown signing key: {kid}")
+        return key
+
+    def _find_signing_key(self, kid: str | None, jwks: dict) -> SigningKey | None:
+        if self._signing_keys is None:
+            self._signing_keys = build_signing_keys(jwks, self.jwt_backend, self.validator.algorithms)
+
+        key = self._signing_keys.get(kid)
+        if key is None and kid is None and len(self._signing_keys) == 1:
+            key = next(iter(self._signing_keys.values()))
+        return key
+
+    def _jwks_refetch_allowed(self) -> bool:
+        if self._flights.in_flight("jwks") or self._jwks_fetched_at is None:
+            return True
+        return time.monotonic() - self._jwks_fetched_at >= self.settings.jwks_min_refresh_interval
+
     def clear_jwks_cache(self) -> None:
         """Clear JWKS cache (useful for key rotation)."""
         self._jwks = None
+        self._signing_keys = None
+        self._jwks_fetched_at = None
+
+    def start_jwks_refresh(self, interval: float | None = None) -> None:
+        """
+        Start refreshing the JWKS in the background.
+
+        Uses ``jwks_refresh_interval`` from settings if no interval is given.
+        Does nothing if neither is set or a refresh task is already running.
+        """
+        interval = interval or self.settings.jwks_refresh_interval
+        if not interval or (self._jwks_refresh_task and not self._jwks_refresh_task.done()):
+            return
+        self._jwks_refresh_task = asyncio.create_task(self._jwks_refresh_loop(interval))
+
+    async def stop_jwks_refresh(self) -> None:
+        """Stop the background JWKS refresh task."""
+        task, self._jwks_refresh_task = self._jwks_refresh_task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    async def _jwks_refresh_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.refresh_jwks()
+            except (httpx.HTTPError, ValueError) as e:
+                logger.warning(f"Background JWKS refresh failed: {e}")
+            except Exception:
+                # Keep refreshing; a crashed task would silently stop key rotation
+                logger.exception("Background JWKS refresh failed")
 
     async def exchange_code(self, code: str) -> TokenResponse:
         """Exchange authorization code for tokens."""
         openid_configuration = await self.get_openid_configuration()
 
-        async with httpx.AsyncClient(verify=self.settings.ssl_context) as client:
-            response = await client.post(
-                openid_configuration.token_endpoint,
-                data={
-                    "grant_type": "authorization_code",
-                    "client_id": self.settings.client_id,
-                    "client_secret": self.settings.client_secret,
-                    "code": code,
-                    "redirect_uri": self.settings.callback_url,
-                },
-            )
-            response.raise_for_status()
-            data = response.json()
-            return TokenResponse(
-                access_token=data["access_token"],
-                refresh_token=data.get("refresh_token"),
-                token_type=data.get("token_type", "Bearer"),
-                expires_in=data.get("expires_in", 300),
-            )
+        response = await self.http_client.post(
+            openid_configuration.token_endpoint,
+            data={
+                "grant_type": "authorization_code",
+                "client_id": self.settings.client_id,
+                "client_secret": self.settings.client_secret,
+                "code": code,
+                "redirect_uri": self.settings.callback_url,
+            },
+        )
+        response.raise_for_status()
+        data = response.json()
+        return TokenResponse(
+            access_token=data["access_token"],
+            refresh_token=data.get("refresh_token"),
+            token_type=data.get("token_type", "Bearer"),
+            expires_in=data.get("expires_in", 300),
+            # Keycloak reports 0 for offline tokens, which do not expire
+            refresh_expires_in=data.get("refresh_expires_in") or None,
+        )
 
     async def refresh_tokens(self, refresh_token: str) -> TokenResponse:
-        """Refresh access token using refresh token."""
+        """
+        Refresh access token using refresh token.
+
+        Concurrent refreshes with the same refresh token (several tabs, or
+        parallel SPA requests) share one call to Keycloak. The result is
+        reused for ``refresh_grace_period`` seconds, because with refresh
+        token rotation a late caller's token is already invalid. Failures
+        are only shared with concurrent callers.
+        """
+        key = token_hash(refresh_token)
+        recent = self._recent_refreshes.get(key)
+        if recent is not None and recent[1] > time.monotonic():
+            return recent[0]
+
+        tokens = await self._flights.do(("refresh", key), lambda: self._refresh_tokens(refresh_token))
+        if self.settings.refresh_grace_period > 0:
+            self._remember_refresh(key, tokens)
+        return tokens
+
+    def _remember_refresh(self, key: str, tokens: TokenResponse) -> None:
+        now = time.monotonic()
+        # Entries are added in expiry order, so expired ones are at the front
+        while self._recent_refreshes:
+            oldest = next(iter(self._recent_refreshes))
+            if self._recent_refreshes[oldest][1] > now:
+                break
+            del self._recent_refreshes[oldest]
+        self._recent_refreshes.pop(key, None)
+        self._recent_refreshes[key] = (tokens, now + self.settings.refresh_grace_period)
+
+    async def _refresh_tokens(self, refresh_token: str) -> TokenResponse:
         openid_configuration = await self.get_openid_configuration()
 
-        async with httpx.AsyncClient(verify=self.settings.ssl_context) as client:
-            response = await client.post(
-                openid_configuration.token_endpoint,
-                data={
-                    "grant_type": "refresh_token",
-                    "client_id": self.settings.client_id,
-                    "client_secret": self.settings.client_secret,
-                    "refresh_token": refresh_token,
-                },
-            )
-            response.raise_for_status()
-            data = response.json()
-            return TokenResponse(
-                access_token=data["access_token"],
-                refresh_token=data.get("refresh_token"),
-                token_type=data.get("token_type", "Bearer"),
-                expires_in=data.get("expires_in", 300),
-            )
+        response = await self.http_client.post(
+            openid_configuration.token_endpoint,
+            data={
+                "grant_type": "refresh_token",
+                "client_id": self.settings.client_id,
+                "client_secret": self.settings.client_secret,
+                "refresh_token": refresh_token,
+            },
+        )
+        response.raise_for_status()
+        data = response.json()
+        return TokenResponse(
+            access_token=data["access_token"],
+            refresh_token=data.get("refresh_token"),
+            token_type=data.get("token_type", "Bearer"),
+            expires_in=data.get("expires_in", 300),
+            refresh_expires_in=data.get("refresh_expires_in") or None,
+        )
 
     async def verify_token(self, token: str) -> TokenPayload:
-        """Verify and decode JWT token."""
-        jwks = await self.get_jwks()
-
-        # Decode without audience verification (Keycloak can be tricky)
-        payload = jwt.decode(
-            token,
-            jwks,
-            algorithms=["RS256"],
-            issuer=self.settings.issuer,
-            options={"verify_aud": False},
-        )
+        """
+        Verify and decode JWT token.
+
+        If the token cache or a cache backend is enabled, a previously
+        verified token is returned from the cache without re-checking the
+        signature. With a verify executor, the signature check runs in its
+        thread or process pool.
 
-        # Manual audience check
-        aud = payload.get("aud", [])
-        if isinstance(aud, str):
-            aud = [aud]
+        Malformed, expired and wrong-issuer tokens are rejected before the
+        signature check. With the rejected-token cache enabled, a token
+        that was rejected recently fails again without being decoded.
+        """
+        cached = await self._get_cached_token(token)
+        if cached is not None:
+            return cached
 
-        valid_audiences = [self.settings.audience]
-        if "," in self.settings.audience:
-            valid_audiences.extend(a.strip() for a in self.settings.audience.split(","))
+        header = self._precheck_token(token)
+        signing_key = await self.get_signing_key(header.get("kid"))
+        try:
+            return await self._verify_with_key(token, header, signing_key)
+        except JWTError as e:
+            self._reject(token, e)
+            raise
 
-        if aud and not any(a in valid_audiences for a in aud):
-            raise JWTError(f"Invalid audience: {aud}")
+    async def verify_tokens(self, tokens: Iterable[str]) -> dict[str, TokenPayload | Exception]:
+        """
+        Verify many tokens at once, e.g. to re-validate open websocket sessions.
 
-        return TokenPayload(**payload)
+        Identical tokens are verified once and tokens are grouped by
+        ``kid``, so each signing key is looked up once per batch. Signature
+        checks run concurrently (in parallel with a verify executor). A
+        failing token does not fail the batch: its entry holds the
+        exception instead of the payload.
+
+        Returns:
+            Dict mapping each distinct token to its TokenPayload or to the
+            JWTError (or other verification error) it raised
+        """
+        results: dict[str, TokenPayload | Exception] = {}
+        unique = list(dict.fromkeys(tokens))
+
+        cached = await self._get_cached_tokens(unique)
+        by_kid: dict[str | None, list[tuple[str, dict]]] = {}
+        for token, result in zip(unique, cached):
+            if result is not None:
+                results[token] = result
+                continue
+            try:
+                header = self._precheck_token(token)
+            except JWTError as e:
+                results[token] = e
+            else:
+                by_kid.setdefault(header.get("kid"), []).append((token, header))
+
+        async def verify(token: str, header: dict, signing_key: SigningKey) -> None:
+            try:
+                results[token] = await self._verify_with_key(token, header, signing_key)
+            except JWTError as e:
+                self._reject(token, e)
+                results[token] = e
+
+        checks = []
+        for kid, group in by_kid.items():
+            try:
+                signing_key = await self.get_signing_key(kid)
+            except (JWTError, httpx.HTTPError, ValueError) as e:
+                results.update((token, e) for token, _ in group)
+                continue
+            checks.extend(verify(token, header, signing_key) for token, header in group)
+        await asyncio.gather(*checks)
+
+        return {token: results[token] for token in unique}
+
+    async def _get_cached_token(self, token: str) -> TokenPayload | None:
+        if self.token_cache is not None:
+            cached = self.token_cache.get(token)
+            if cached is not None:
+                return cached
+        if self.cache_backend is not None:
+            return self._load_cached_token(token, await self._backend_get(self._token_key(token)))
+        return None
+
+    async def _get_cached_tokens(self, tokens: list[str]) -> list[TokenPayload | None]:
+        """Like _get_cached_token for many tokens, with one backend round trip for all L1 misses."""
+        results = [self.token_cache.get(token) if self.token_cache is not None else None for token in tokens]
+        misses = [i for i, result in enumerate(results) if result is None]
+        if self.cache_backend is None or not misses:
+            return results
+        keys = [self._token_key(tokens[i]) for i in misses]
+        try:
+            values = await self.cache_backend.get_many(keys)
+        except BACKEND_ERRORS as e:
+            logger.warning(f"Cache backend get failed: {e}")
+            return results
+        for i, value in zip(misses, values):
+            results[i] = self._load_cached_token(tokens[i], value)
+        return results
+
+    def _precheck_token(self, token: str) -> dict:
+        """
+        Reject a token before any signature work and return its header.
+
+        Checks the token structure, the header and the (still unverified)
+        claims with the validator. Tokens naming an
+        unknown ``kid`` are rejected by get_signing_key, which refetches
+        the JWKS at most once per ``jwks_min_refresh_interval``.
+        """
+        if self.rejected_tokens is not None:
+            error = self.rejected_tokens.get(token)
+            if error is not None:
+                raise error
+
+        try:
+            header, claims = unverified_token(token)
+            self.validator.check_header(header)
+            self.validator.validate(claims)
+        except JWTError as e:
+            self._reject(token, e)
+            raise
+        return header
+
+    def _reject(self, token: str, error: JWTError) -> None:
+        # A token that is not valid yet will be shortly, so it is not remembered
+        if self.rejected_tokens is not None and not isinstance(error, TokenNotYetValidError):
+            self.rejected_tokens.add(token, error)
+
+    async def _verify_with_key(self, token: str, header: dict, signing_key: SigningKey) -> TokenPayload:
+        # Only the algorithm the key is bound to is accepted (no algorithm confusion)
+        if header.get("alg") != signing_key.algorithm:
+            raise JWTError(f"Token algorithm {header.get('alg')} does not match signing key {signing_key.kid}")
+
+        # Verify signature, then re-check the claims (exp may have passed while queued)
+        if self.verify_executor is not None:
+            payload = await self.verify_executor.verify(self.jwt_backend, token, signing_key)
+        else:
+            payload = self.jwt_backend.verify(token, signing_key.key, [signing_key.algorithm])
+        self.validator.validate(payload)
+
+        try:
+            result = TokenPayload(**payload)
+        except ValidationError as e:
+            raise JWTError(f"Invalid token claims: {e.error_count()} malformed claim(s)") from e
+        if self.token_cache is not None:
+            self.token_cache.set(token, result, result.exp)
+        if self.cache_backend is not None:
+            ttl = self._cache_ttl(result.exp, self.settings.token_cache_ttl)
+            await self._backend_set(self._token_key(token), result.model_dump_json().encode(), ttl)
+        return result
+
+    def _load_cached_token(self, token: str, cached: bytes | None) -> TokenPayload | None:
+        """Parse a payload from the cache backend and keep it in the token cache."""
+        if cached is None:
+            return None
+        try:
+            result = TokenPayload.model_validate_json(cached)
+        except ValidationError:
+            return None
+        if self.token_cache is not None:
+            self.token_cache.set(token, result, result.exp)
+        return result
+
+    @staticmethod
+    def _cache_ttl(exp: float | None, max_ttl: float) -> float:
+        """Seconds until ``exp``, capped at ``max_ttl``."""
+        if exp is None:
+            return max_ttl
+        return min(max_ttl, exp - time.time())
 
     async def get_userinfo(self, access_token: str) -> dict:
-        """Fetch user info from Keycloak userinfo endpoint."""
+        """
+        Fetch user info from Keycloak userinfo endpoint.
+
+        With a cache backend, responses are cached per access token until
+        the token expires or ``userinfo_cache_ttl`` passes.
+        """
+        cache_key = None
+        if self.cache_backend is not None:
+            cache_key = f"userinfo:{token_hash(access_token)}"
+            cached = await self._backend_get(cache_key)
+            if cached is not None:
+                return json.loads(cached)
+
         openid_configuration = await self.get_openid_configuration()
 
-        async with httpx.AsyncClient(verify=self.settings.ssl_context) as client:
-            response = await client.get(
-                openid_configuration.userinfo_endpoint,
-                headers={"Authorization": f"Bearer {access_token}"},
-            )
-            response.raise_for_status()
-            return response.json()
\ No newline at end of file
+        response = await self.http_client.get(
+            openid_configuration.userinfo_endpoint,
+            headers={"Authorization": f"Bearer {access_token}"},
+        )
+        response.raise_for_status()
+        userinfo = response.json()
+
+        if cache_key is not None:
+            try:
+                exp = jwt.get_unverified_claims(access_token).get("exp")
+            except JWTError:
+                exp = None
+            # Only cache for tokens with a known lifetime
+            if isinstance(exp, (int, float)):
+                ttl = self._cache_ttl(exp, self.settings.userinfo_cache_ttl)
+                await self._backend_set(cache_key, json.dumps(userinfo).encode(), ttl)
+        return userinfo
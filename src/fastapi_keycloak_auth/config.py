@@ -3,6 +3,7 @@ Configuration for Keycloak authentication.
 """
 from typing import Literal
 
+import httpx
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -32,12 +33,79 @@ class KeycloakSettings(BaseSettings):
     ssl_verify: bool = Field(default=True, description="Verify SSL certificates")
     ca_cert: str | None = Field(default=None, description="Path to CA certificate file")
 
+    # HTTP client settings
+    http2: bool = Field(default=False, description="Use HTTP/2 for Keycloak requests (requires httpx[http2])")
+    http_timeout: float = Field(default=10.0, description="Timeout in seconds for Keycloak requests")
+    http_connect_timeout: float = Field(default=5.0, description="Connect timeout in seconds for Keycloak requests")
+    http_max_connections: int = Field(default=100, description="Maximum number of pooled connections to Keycloak")
+    http_max_keepalive_connections: int = Field(default=20, description="Maximum number of idle keep-alive connections")
+    http_keepalive_expiry: float = Field(default=30.0, description="Seconds an idle keep-alive connection is kept open")
+
+    # Startup
+    warmup_on_startup: bool = Field(default=True, description="Preload discovery document and JWKS in keycloak_lifespan")
+    warmup_required: bool = Field(default=False, description="Fail startup if the warm-up cannot reach Keycloak")
+
+    # Discovery/JWKS snapshot
+    snapshot_path: str | None = Field(default=None, description="File to persist discovery document and JWKS for fast cold starts (disabled if not set)")
+    snapshot_ttl: float = Field(default=3600.0, description="Maximum age in seconds of a snapshot loaded at startup")
+
+    # Token verification
+    jwt_backend: Literal["jose", "cryptography"] = Field(default="jose", description="Signature verification backend (cryptography is faster, requires the cryptography package)")
+    jwt_algorithms: str = Field(default="RS256 RS384 RS512 ES256 ES384 ES512 EdDSA", description="Allowed token signature algorithms (space or comma separated); each key only verifies its own algorithm")
+    authorized_parties: str | None = Field(default=None, description="Allowed azp (authorized party) values, space or comma separated (not checked if not set)")
+    required_claims: str = Field(default="", description="Claims every token must contain, space or comma separated; name=value also requires that value (e.g. azp nbf typ=Bearer)")
+    token_leeway: float = Field(default=0.0, description="Seconds of clock skew allowed when checking exp and nbf")
+    verify_executor: Literal["none", "thread", "process"] = Field(default="none", description="Run signature checks in a thread or process pool instead of on the event loop")
+    verify_executor_workers: int | None = Field(default=None, description="Worker threads/processes for signature checks (default: CPU count)")
+    verify_max_concurrency: int | None = Field(default=None, description="Maximum signature checks submitted to the pool at once (default: 4 x workers)")
+
+    # Rejected-token cache
+    rejected_cache_enabled: bool = Field(default=False, description="Remember recently rejected tokens to turn repeats away without decoding or verifying them")
+    rejected_cache_max_size: int = Field(default=4096, description="Maximum number of remembered rejected tokens")
+    rejected_cache_ttl: float = Field(default=300.0, description="Seconds a rejected token is remembered")
+
+    # JWKS rotation
+    jwks_min_refresh_interval: float = Field(default=30.0, description="Minimum seconds between JWKS refetches triggered by an unknown key ID")
+    jwks_refresh_interval: float | None = Field(default=None, description="Refresh the JWKS in the background every N seconds (disabled if not set)")
+
+    # Token refresh
+    refresh_grace_period: float = Field(default=5.0, description="Seconds a refresh result is reused for repeated refreshes with the same refresh token (0 to disable)")
+    session_refresh_threshold: float = Field(default=60.0, description="Sliding sessions: refresh the access cookie when it expires within this many seconds")
+
+    # Verified-token cache
+    token_cache_enabled: bool = Field(default=False, description="Cache verified tokens to skip repeated signature checks")
+    token_cache_max_size: int = Field(default=1024, description="Maximum number of cached verified tokens")
+    token_cache_ttl: float = Field(default=60.0, description="Maximum seconds a verified token is cached (capped at its exp)")
+
+    # Cross-worker shared cache
+    shared_cache_path: str | None = Field(default=None, description="Memory-mapped file shared by all workers for JWKS and verified tokens, e.g. /dev/shm/keycloak-auth (disabled if not set)")
+    shared_cache_slots: int = Field(default=4096, description="Number of verified-token slots in the shared cache")
+    shared_cache_slot_size: int = Field(default=4096, description="Bytes per shared cache slot (larger token payloads are not cached)")
+
+    # Distributed cache backend
+    cache_backend_url: str | None = Field(default=None, description="Cache for verified tokens, userinfo and JWKS shared across pods (memory://, file:///path, redis://, rediss://)")
+    cache_key_prefix: str = Field(default="fastapi-keycloak-auth:", description="Prefix for keys stored in the cache backend")
+    userinfo_cache_ttl: float = Field(default=60.0, description="Maximum seconds a userinfo response is cached (capped at the token's exp)")
+    jwks_cache_ttl: float = Field(default=300.0, description="Seconds the JWKS is kept in the cache backend")
+
     # Cookie settings
     cookie_name: str = Field(default="access_token", description="Name of the access token cookie")
     refresh_cookie_name: str = Field(default="refresh_token", description="Name of the refresh token cookie")
     cookie_secure: bool = Field(default=False, description="Set Secure flag on cookies (requires HTTPS)")
     cookie_httponly: bool = Field(default=True, description="Set HttpOnly flag on cookies")
     cookie_samesite: Literal["lax", "strict", "none"] | None = Field(default="lax", description="SameSite cookie attribute (lax, strict, none)")
+    cookie_compression: bool = Field(default=False, description="Store token cookies zlib-compressed (plain cookies are still accepted)")
+    cookie_chunk_size: int = Field(default=0, description="Split token cookie values longer than this across numbered cookies (0 disables; e.g. 3800)")
+
+    # Token extraction
+    token_sources: str = Field(default="cookie bearer session", description="Where to look for credentials, in order: cookie, bearer, header, query (WebSockets only), session (space or comma separated)")
+    token_header: str = Field(default="X-Access-Token", description="Header read by the 'header' token source")
+    token_query_param: str = Field(default="access_token", description="Query parameter read by the 'query' token source")
+
+    # Server-side sessions
+    session_store_url: str | None = Field(default=None, description="Keep tokens server-side and only set an opaque session cookie (memory://, file:///path, redis://, rediss://; disabled if not set)")
+    session_cookie_name: str = Field(default="session_id", description="Name of the session ID cookie")
+    session_ttl: float = Field(default=1800.0, description="Seconds a session is kept when Keycloak does not report the refresh token lifetime")
 
     # URL settings
     frontend_url: str = Field(default="http://localhost:5173", description="Frontend URL for redirects (Svelte dev server)")
@@ -58,6 +126,25 @@ class KeycloakSettings(BaseSettings):
             return self.ca_cert
         return True
 
+    @property
+    def http_timeouts(self) -> httpx.Timeout:
+        """Return the timeout configuration for httpx."""
+        return httpx.Timeout(self.http_timeout, connect=self.http_connect_timeout)
+
+    @property
+    def http_limits(self) -> httpx.Limits:
+        """Return the connection pool limits for httpx."""
+        return httpx.Limits(
+            max_connections=self.http_max_connections,
+            max_keepalive_connections=self.http_max_keepalive_connections,
+            keepalive_expiry=self.http_keepalive_expiry,
+        )
+
+    @property
+    def allowed_algorithms(self) -> frozenset[str]:
+        """Return the allowed token signature algorithms."""
+        return frozenset(self.jwt_algorithms.replace(",", " ").split())
+
     @property
     def issuer(self) -> str:
         """Return the token issuer URL."""
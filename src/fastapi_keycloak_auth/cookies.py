@@ -0,0 +1,206 @@
+"""
+Access and refresh token cookies, and the server-side session cookie.
+
+The router sets the cookies on its responses, the sliding-session
+middleware appends them as raw ``Set-Cookie`` headers to responses it
+did not create. Both use the cookie options from the settings.
+
+Large tokens can exceed the browser limit of about 4 KB per cookie. With
+KEYCLOAK_COOKIE_COMPRESSION the token is stored zlib-compressed, and a
+value longer than KEYCLOAK_COOKIE_CHUNK_SIZE is split across numbered
+cookies (``access_token=chunks-3``, ``access_tokenC1`` ...
+``access_tokenC3``). read_token_cookie accepts plain, compressed and
+chunked values, so the settings can be changed without logging users out.
+
+Usage:
+    KEYCLOAK_COOKIE_COMPRESSION=true
+    KEYCLOAK_COOKIE_CHUNK_SIZE=3800
+"""
+
+import base64
+import struct
+import zlib
+from collections.abc import Iterable, Mapping
+
+from starlette.responses import Response
+
+from .config import KeycloakSettings
+from .models import TokenResponse
+
+# Prefix of compressed cookie values (a JWT never starts with it)
+COMPRESSED_PREFIX = "z."
+# Value of the base cookie when the token is split across numbered cookies
+CHUNKS_PREFIX = "chunks-"
+MAX_CHUNKS = 32
+# Limit for decompressed tokens, so a crafted cookie cannot inflate without bound
+MAX_TOKEN_SIZE = 64 * 1024
+
+# First byte of the compressed data: JWT segments as bytes, or the token text
+_SEGMENTS = b"\x01"
+_TEXT = b"\x00"
+_LENGTHS = struct.Struct(">II")
+
+
+def _b64decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def compress_token(token: str) -> str:
+    """
+    Return a compressed cookie value for a token.
+
+    The base64url segments of a JWT are decoded first, so zlib compresses
+    the JSON instead of its base64 form and the signature is stored as
+    raw bytes. Tokens whose segments do not decode back to the same text
+    are compressed as text.
+    """
+    segments = token.split(".")
+    try:
+        parts = [_b64decode(segment) for segment in segments]
+        compact = len(parts) == 3 and all(_b64encode(p) == s for p, s in zip(parts, segments))
+    except ValueError:
+        compact = False
+
+    if compact:
+        data = _SEGMENTS + _LENGTHS.pack(len(parts[0]), len(parts[1])) + b"".join(parts)
+    else:
+        data = _TEXT + token.encode()
+    return COMPRESSED_PREFIX + _b64encode(zlib.compress(data, 9))
+
+
+def decompress_token(value: str) -> str:
+    """
+    Reverse compress_token. Values without the prefix are returned unchanged.
+
+    Raises:
+        ValueError: If the value is malformed or inflates beyond MAX_TOKEN_SIZE
+    """
+    if not value.startswith(COMPRESSED_PREFIX):
+        return value
+
+    inflater = zlib.decompressobj()
+    try:
+        data = inflater.decompress(_b64decode(value[len(COMPRESSED_PREFIX):]), MAX_TOKEN_SIZE)
+    except zlib.error as e:
+        raise ValueError(f"Invalid compressed token: {e}") from e
+    if not inflater.eof or inflater.unconsumed_tail:
+        raise ValueError("Compressed token is truncated or too large")
+
+    kind, body = data[:1], data[1:]
+    if kind == _TEXT:
+        return body.decode()
+    if kind == _SEGMENTS and len(body) >= _LENGTHS.size:
+        header_length, payload_length = _LENGTHS.unpack_from(body)
+        rest = body[_LENGTHS.size:]
+        if header_length + payload_length <= len(rest):
+            header = rest[:header_length]
+            payload = rest[header_length:header_length + payload_length]
+            signature = rest[header_length + payload_length:]
+            return ".".join(_b64encode(part) for part in (header, payload, signature))
+    raise ValueError("Malformed compressed token")
+
+
+def token_cookie_values(name: str, token: str, settings: KeycloakSettings) -> list[tuple[str, str]]:
+    """Return the cookies (name, value) storing a token, compressed and chunked per settings."""
+    value = compress_token(token) if settings.cookie_compression else token
+    size = settings.cookie_chunk_size
+    if size <= 0 or len(value) <= size:
+        return [(name, value)]
+    chunks = [value[i:i + size] for i in range(0, len(value), size)]
+    return [(name, f"{CHUNKS_PREFIX}{len(chunks)}"), *((f"{name}C{i}", chunk) for i, chunk in enumerate(chunks, 1))]
+
+
+def read_token_cookie(cookies: Mapping[str, str], name: str) -> str | None:
+    """Return the token stored in cookie ``name``, or None if missing or malformed."""
+    value = cookies.get(name)
+    if not value:
+        return None
+    if value.startswith(CHUNKS_PREFIX):
+        count = value[len(CHUNKS_PREFIX):]
+        # isdigit() alone accepts digits such as "²" that int() rejects
+        if not (count.isascii() and count.isdigit()) or not 0 < int(count) <= MAX_CHUNKS:
+            return None
+        chunks = [cookies.get(f"{name}C{i}") for i in range(1, int(count) + 1)]
+        if not all(chunks):
+            return None
+        value = "".join(chunks)
+    try:
+        return decompress_token(value) or None
+    except ValueError:
+        return None
+
+
+def _set_token_cookie(response: Response, name: str, token: str, settings: KeycloakSettings, max_age: int | None) -> None:
+    for key, value in token_cookie_values(name, token, settings):
+        response.set_cookie(
+            key=key,
+            value=value,
+            httponly=settings.cookie_httponly,
+            secure=settings.cookie_secure,
+            samesite=settings.cookie_samesite,
+            max_age=max_age,
+        )
+
+
+def set_token_cookies(response: Response, tokens: TokenResponse, settings: KeycloakSettings) -> None:
+    """Set the access token cookie and, if present, the refresh token cookie."""
+    _set_token_cookie(response, settings.cookie_name, tokens.access_token, settings, max_age=tokens.expires_in)
+    if tokens.refresh_token:
+        _set_token_cookie(response, settings.refresh_cookie_name, tokens.refresh_token, settings, max_age=None)
+
+
+def set_session_cookie(response: Response, session_id: str, settings: KeycloakSettings) -> None:
+    """
+    Set the server-side session ID cookie (always HttpOnly).
+
+    The cookie has no Max-Age: sessions are refreshed on the server without
+    re-sending it, so the store's TTL alone decides when a session ends.
+    """
+    response.set_cookie(
+        key=settings.session_cookie_name,
+        value=session_id,
+        httponly=True,
+        secure=settings.cookie_secure,
+        samesite=settings.cookie_samesite,
+    )
+
+
+def _is_chunk(cookie: str, name: str) -> bool:
+    return cookie.startswith(f"{name}C") and cookie[len(name) + 1:].isdigit()
+
+
+def delete_token_cookies(response: Response, settings: KeycloakSettings, present: Iterable[str] = ()) -> None:
+    """
+    Delete the access and refresh token cookies and, in session mode, the
+    session cookie. Chunk cookies are deleted if their names are in
+    ``present`` (the cookies sent with the request).
+    """
+    response.delete_cookie(settings.cookie_name)
+    response.delete_cookie(settings.refresh_cookie_name)
+    if settings.session_store_url:
+        response.delete_cookie(settings.session_cookie_name)
+    for cookie in present:
+        if _is_chunk(cookie, settings.cookie_name) or _is_chunk(cookie, settings.refresh_cookie_name):
+            response.delete_cookie(cookie)
+
+
+def _set_cookie_headers(response: Response) -> list[tuple[bytes, bytes]]:
+    return [(name, value) for name, value in response.raw_headers if name == b"set-cookie"]
+
+
+def token_cookie_headers(tokens: TokenResponse, settings: KeycloakSettings) -> list[tuple[bytes, bytes]]:
+    """Return the raw ``Set-Cookie`` headers set by set_token_cookies."""
+    response = Response()
+    set_token_cookies(response, tokens, settings)
+    return _set_cookie_headers(response)
+
+
+def delete_cookie_headers(settings: KeycloakSettings, present: Iterable[str] = ()) -> list[tuple[bytes, bytes]]:
+    """Return the raw ``Set-Cookie`` headers set by delete_token_cookies."""
+    response = Response()
+    delete_token_cookies(response, settings, present)
+    return _set_cookie_headers(response)
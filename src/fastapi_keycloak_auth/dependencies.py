@@ -2,20 +2,31 @@
 FastAPI dependencies for authentication.
 """
 
+import logging
+from dataclasses import dataclass
 from typing import Annotated
 
-from fastapi import Depends, HTTPException, Request, status
+import httpx
+from fastapi import Depends, HTTPException, status
+from starlette.requests import HTTPConnection
+from starlette.types import Scope
 from jose import JWTError
 
+from .cache_backends import BACKEND_ERRORS
 from .client import KeycloakClient
 from .config import KeycloakSettings
 from .events import (
     AuthEvent,
+    RefreshEventData,
     TokenInvalidEventData,
     TokenVerifiedEventData,
     auth_events,
 )
 from .models import TokenPayload
+from .policy import Policy, all_of, any_of
+from .sessions import Session
+
+logger = logging.getLogger(__name__)
 
 
 # =============================================================================
@@ -64,79 +75,164 @@ def clear_client_cache() -> None:
 # Auth Dependencies
 # =============================================================================
 
-async def get_current_user(request: Request) -> TokenPayload:
+@dataclass(frozen=True)
+class RequestAuth:
+    """Outcome of authenticating one request, kept on ``request.state.keycloak_auth``."""
+    token: str | None
+    user: TokenPayload | None = None
+    error: JWTError | None = None
+    session_id: str | None = None
+
+
+def _extract_credentials(scope: Scope, client: KeycloakClient) -> tuple[str | None, str | None]:
+    """Return the token or server-side session ID found by the client's token extractor."""
+    token, session_id = client.token_extractor.extract(scope)
+    if session_id is not None and client.session_store is None:
+        return None, None
+    return token, session_id
+
+
+async def authenticate_request(request: HTTPConnection) -> RequestAuth:
     """
-    Dependency to get the current authenticated user.
+    Verify the request's token once and remember the outcome on the request.
 
-    Extracts token from cookie or Authorization header and validates it.
+    Takes an HTTPConnection, so the dependencies work on WebSocket routes
+    as well as HTTP routes.
 
-    Raises:
-        HTTPException: 401 if not authenticated or token is invalid
+    Every auth dependency of a route goes through here, so stacking
+    CurrentUser with role or policy checkers verifies the token and emits
+    TOKEN_VERIFIED / TOKEN_INVALID only once per request.
     """
-    settings = get_settings()
     client = get_keycloak_client()
+    token, session_id = _extract_credentials(request.scope, client)
 
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Not authenticated",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+    cached = getattr(request.state, "keycloak_auth", None)
+    if isinstance(cached, RequestAuth) and cached.token == token and cached.session_id == session_id:
+        return cached
 
-    # Get token from cookie (using configured name) or header
-    token = request.cookies.get(settings.cookie_name)
-    if not token:
-        auth_header = request.headers.get("Authorization")
-        if auth_header and auth_header.startswith("Bearer "):
-            token = auth_header.removeprefix("Bearer ")
+    if session_id is not None:
+        result = await _authenticate_session(client, session_id)
+    else:
+        result = await _authenticate_token(client, token)
+    request.state.keycloak_auth = result
+    return result
 
-    if not token:
-        raise credentials_exception
 
+async def _authenticate_token(client: KeycloakClient, token: str | None) -> RequestAuth:
+    if token is None:
+        return RequestAuth(token=None)
     try:
         user = await client.verify_token(token)
-
-        # Emit TOKEN_VERIFIED event
-        if auth_events.has_handlers(AuthEvent.TOKEN_VERIFIED):
-            await auth_events.emit(AuthEvent.TOKEN_VERIFIED, TokenVerifiedEventData(user=user))
-
-        return user
     except JWTError as e:
         # Emit TOKEN_INVALID event
         if auth_events.has_handlers(AuthEvent.TOKEN_INVALID):
             await auth_events.emit(AuthEvent.TOKEN_INVALID, TokenInvalidEventData(error=str(e), token=token))
+        return RequestAuth(token=token, error=e)
 
-        raise credentials_exception from e
+    # Emit TOKEN_VERIFIED event
+    if auth_events.has_handlers(AuthEvent.TOKEN_VERIFIED):
+        await auth_events.emit(AuthEvent.TOKEN_VERIFIED, TokenVerifiedEventData(user=user))
+    return RequestAuth(token=token, user=user)
 
 
-async def get_current_user_optional(request: Request) -> TokenPayload | None:
+async def _authenticate_session(client: KeycloakClient, session_id: str) -> RequestAuth:
     """
-    Dependency to get the current user if authenticated, None otherwise.
+    Look up a server-side session, refreshing its access token if it is
+    about to expire.
+    """
+    try:
+        session = await client.session_store.get(session_id)
+        if (
+            session is not None
+            and session.refresh_token
+            and session.expires_within(client.settings.session_refresh_threshold)
+        ):
+            session = await _refresh_session(client, session_id, session)
+    except BACKEND_ERRORS as e:
+        logger.warning(f"Session store lookup failed: {e}")
+        return RequestAuth(token=None, session_id=session_id, error=JWTError("Session store unavailable"))
+
+    if session is None or session.expires_within(0):
+        return RequestAuth(token=None, session_id=session_id, error=JWTError("Session expired or unknown"))
+
+    # Emit TOKEN_VERIFIED event
+    if auth_events.has_handlers(AuthEvent.TOKEN_VERIFIED):
+        await auth_events.emit(AuthEvent.TOKEN_VERIFIED, TokenVerifiedEventData(user=session.user))
+    return RequestAuth(token=None, session_id=session_id, user=session.user)
+
+
+def _refresh_rejected(error: httpx.HTTPStatusError) -> bool:
+    """
+    Whether Keycloak rejected the refresh token itself (400/401 ``invalid_grant``).
 
-    Does not raise an exception if not authenticated.
+    Other errors, such as a 5xx from Keycloak or its proxy or a rejected
+    client, say nothing about the session and must not end it.
     """
-    settings = get_settings()
-    client = get_keycloak_client()
+    response = error.response
+    if response.status_code not in (400, 401):
+        return False
+    try:
+        body = response.json()
+    except ValueError:
+        return True
+    return not isinstance(body, dict) or body.get("error", "invalid_grant") == "invalid_grant"
 
-    token = request.cookies.get(settings.cookie_name)
-    if not token:
-        auth_header = request.headers.get("Authorization")
-        if auth_header and auth_header.startswith("Bearer "):
-            token = auth_header.removeprefix("Bearer ")
 
-    if not token:
-        return None
+async def _refresh_session(client: KeycloakClient, session_id: str, session: Session) -> Session | None:
+    """
+    Replace a session's tokens with refreshed ones.
 
+    Returns None (and deletes the session) if Keycloak rejects the refresh
+    token. If Keycloak is unreachable or fails, the old session is returned
+    and used until its access token expires. Concurrent requests of one
+    session share a single refresh (see KeycloakClient.refresh_tokens).
+    """
     try:
-        result = await client.verify_token(token)
-        # Emit TOKEN_VERIFIED event
-        if auth_events.has_handlers(AuthEvent.TOKEN_VERIFIED):
-            await auth_events.emit(AuthEvent.TOKEN_VERIFIED, TokenVerifiedEventData(user=result))
-        return result
-    except JWTError as e:
-        # Emit TOKEN_INVALID event
-        if auth_events.has_handlers(AuthEvent.TOKEN_INVALID):
-            await auth_events.emit(AuthEvent.TOKEN_INVALID, TokenInvalidEventData(error=str(e), token=token))
+        tokens = await client.refresh_tokens(session.refresh_token)
+        user = await client.verify_token(tokens.access_token)
+    except httpx.HTTPStatusError as e:
+        if not _refresh_rejected(e):
+            logger.warning(f"Session refresh failed: {e}")
+            return session
+        await client.session_store.delete(session_id)
         return None
+    except (httpx.HTTPError, JWTError) as e:
+        logger.warning(f"Session refresh failed: {e}")
+        return session
+
+    # Emit REFRESH event
+    if auth_events.has_handlers(AuthEvent.REFRESH):
+        await auth_events.emit(AuthEvent.REFRESH, RefreshEventData(tokens=tokens))
+    return await client.session_store.save(session_id, tokens, user)
+
+
+async def get_current_user(request: HTTPConnection) -> TokenPayload:
+    """
+    Dependency to get the current authenticated user.
+
+    Extracts token from cookie or Authorization header and validates it.
+    The result is memoized per request.
+
+    Raises:
+        HTTPException: 401 if not authenticated or token is invalid
+    """
+    auth = await authenticate_request(request)
+    if auth.user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        ) from auth.error
+    return auth.user
+
+
+async def get_current_user_optional(request: HTTPConnection) -> TokenPayload | None:
+    """
+    Dependency to get the current user if authenticated, None otherwise.
+
+    Does not raise an exception if not authenticated.
+    """
+    return (await authenticate_request(request)).user
 
 
 def require_role(role: str):
@@ -149,9 +245,11 @@ def require_role(role: str):
             ...
     """
 
-    async def role_checker(request: Request) -> TokenPayload:
+    policy = all_of(f"realm:{role}")
+
+    async def role_checker(request: HTTPConnection) -> TokenPayload:
         user = await get_current_user(request)
-        if not user.has_role(role):
+        if not policy.allows(user):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Role '{role}' required",
@@ -171,9 +269,11 @@ def require_any_role(*roles: str):
             ...
     """
 
-    async def role_checker(request: Request) -> TokenPayload:
+    policy = any_of(*(f"realm:{role}" for role in roles))
+
+    async def role_checker(request: HTTPConnection) -> TokenPayload:
         user = await get_current_user(request)
-        if not any(user.has_role(role) for role in roles):
+        if not policy.allows(user):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"One of roles {roles} required",
@@ -183,6 +283,30 @@ def require_any_role(*roles: str):
     return role_checker
 
 
+def require_policy(policy: Policy):
+    """
+    Dependency factory to require a compiled Policy.
+
+    Usage:
+        editors = all_of("client:my-api:editor") & none_of("suspended")
+
+        @app.post("/articles")
+        async def create(user = Depends(require_policy(editors))):
+            ...
+    """
+
+    async def policy_checker(request: HTTPConnection) -> TokenPayload:
+        user = await get_current_user(request)
+        if not policy.allows(user):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Insufficient permissions",
+            )
+        return user
+
+    return policy_checker
+
+
 # =============================================================================
 # Type aliases for cleaner dependency injection
 # =============================================================================
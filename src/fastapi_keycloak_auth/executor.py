@@ -0,0 +1,140 @@
+"""
+Executor offload for JWT signature verification.
+
+Signature checks are CPU-bound. Run inline, a burst of large tokens
+blocks the event loop and delays every other coroutine. With an executor
+the verify step runs in a thread pool (the crypto libraries release the
+GIL) or a process pool, and at most ``max_concurrency`` verifications
+are submitted at once; further callers wait without blocking the loop.
+
+Usage:
+    KEYCLOAK_VERIFY_EXECUTOR=thread
+    KEYCLOAK_VERIFY_EXECUTOR_WORKERS=4
+
+    stats = client.verify_executor.stats
+"""
+
+import asyncio
+import functools
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Literal
+
+from .jwt_backends import JWTBackend, SigningKey, create_jwt_backend
+
+
+@dataclass
+class ExecutorStats:
+    """Counters for sizing the verification executor. Times are in seconds."""
+    max_workers: int = 0
+    max_concurrency: int = 0
+    # Verifications waiting for or running in a worker
+    in_flight: int = 0
+    # Verifications waiting for a worker (in_flight minus busy workers)
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    completed: int = 0
+    # Time from the verify call until a worker started on it
+    wait_time_total: float = 0.0
+    wait_time_max: float = 0.0
+
+    @property
+    def wait_time_mean(self) -> float:
+        """Average time a verification waited for a worker."""
+        return self.wait_time_total / self.completed if self.completed else 0.0
+
+
+def _run_timed(fn, *args) -> tuple[float, Any]:
+    return time.monotonic(), fn(*args)
+
+
+# Keys built in a worker process, by backend name, algorithm and JWK
+_process_keys: dict[tuple, Any] = {}
+
+
+def _verify_in_process(backend_name: str, key_data: dict, algorithm: str, token: str) -> tuple[float, dict]:
+    started_at = time.monotonic()
+    cache_key = (backend_name, algorithm, tuple(sorted((k, str(v)) for k, v in key_data.items())))
+    entry = _process_keys.get(cache_key)
+    if entry is None:
+        backend = create_jwt_backend(backend_name)
+        entry = _process_keys[cache_key] = (backend, backend.load_key(key_data, algorithm))
+    backend, key = entry
+    return started_at, backend.verify(token, key, [algorithm])
+
+
+class VerifyExecutor:
+    """
+    Bounded thread or process pool for ``JWTBackend.verify``.
+
+    In process mode the signing key is rebuilt from its JWK once per
+    worker process and cached there, since parsed keys cannot be pickled.
+    """
+
+    def __init__(
+        self,
+        kind: Literal["thread", "process"] = "thread",
+        max_workers: int | None = None,
+        max_concurrency: int | None = None,
+    ):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown executor kind: {kind}")
+        self.kind = kind
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_concurrency = max_concurrency or 4 * self.max_workers
+        self._executor: Executor | None = None
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._stats = ExecutorStats(max_workers=self.max_workers, max_concurrency=self.max_concurrency)
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "thread":
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="keycloak-verify")
+            else:
+                # spawn: forking a process with a running event loop and threads is unsafe
+                self._executor = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    async def verify(self, backend: JWTBackend, token: str, signing_key: SigningKey) -> dict:
+        """
+        Verify a token signature in the pool and return its claims.
+
+        Raises:
+            JWTError: If the backend rejects the token
+        """
+        if self.kind == "thread":
+            call = functools.partial(_run_timed, backend.verify, token, signing_key.key, [signing_key.algorithm])
+        else:
+            call = functools.partial(_verify_in_process, backend.name, signing_key.jwk, signing_key.algorithm, token)
+
+        stats = self._stats
+        enqueued_at = time.monotonic()
+        stats.in_flight += 1
+        stats.queue_depth = max(0, stats.in_flight - self.max_workers)
+        stats.max_queue_depth = max(stats.max_queue_depth, stats.queue_depth)
+        try:
+            async with self._semaphore:
+                started_at, claims = await asyncio.get_running_loop().run_in_executor(self._get_executor(), call)
+        finally:
+            stats.in_flight -= 1
+            stats.queue_depth = max(0, stats.in_flight - self.max_workers)
+
+        wait_time = max(0.0, started_at - enqueued_at)
+        stats.completed += 1
+        stats.wait_time_total += wait_time
+        stats.wait_time_max = max(stats.wait_time_max, wait_time)
+        return claims
+
+    @property
+    def stats(self) -> ExecutorStats:
+        """Return a snapshot of the counters."""
+        return ExecutorStats(**vars(self._stats))
+
+    def shutdown(self) -> None:
+        """Stop the workers. Queued verifications are cancelled."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
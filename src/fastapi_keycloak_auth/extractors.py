@@ -0,0 +1,208 @@
+"""
+Token extraction from the raw ASGI scope.
+
+A TokenExtractor tries its sources in order and returns the first token
+(or server-side session ID) found. Sources read ``scope["headers"]``
+directly. The Cookie header is searched for the one cookie a source
+needs instead of being parsed into a dict, and nothing is decoded until
+a source asks for it. The dependencies, the middleware and the router
+all use the client's extractor.
+
+Sources:
+    cookie      access token cookie (plain, compressed or chunked)
+    bearer      Authorization: Bearer <token>
+    header      custom header (KEYCLOAK_TOKEN_HEADER)
+    query       query parameter, WebSocket connections only (KEYCLOAK_TOKEN_QUERY_PARAM)
+    session     server-side session cookie (with KEYCLOAK_SESSION_STORE_URL)
+
+Usage:
+    KEYCLOAK_TOKEN_SOURCES=bearer cookie query
+
+    # or programmatically
+    client.token_extractor = TokenExtractor([BearerSource(), HeaderSource("X-Api-Token")])
+"""
+
+from collections.abc import Iterator, Mapping, Sequence
+from typing import Literal, Protocol
+from urllib.parse import unquote_plus
+
+from starlette.requests import cookie_parser
+from starlette.types import Scope
+
+from .config import KeycloakSettings
+from .cookies import read_token_cookie
+
+
+def scope_header(scope: Scope, name: str) -> str | None:
+    """Return the first value of a request header (``name`` in lower case)."""
+    key = name.encode("latin-1")
+    for header, value in scope.get("headers", ()):
+        if header == key:
+            return value.decode("latin-1")
+    return None
+
+
+class ScopeCookies(Mapping[str, str]):
+    """
+    Cookies of an ASGI scope, looked up in the raw Cookie headers.
+
+    ``cookies[name]`` and ``cookies.get(name)`` scan for one cookie without
+    splitting the header; iterating parses the whole header once.
+    """
+
+    __slots__ = ("_scope", "_parsed")
+
+    def __init__(self, scope: Scope):
+        self._scope = scope
+        self._parsed: dict[str, str] | None = None
+
+    def _cookie_headers(self) -> Iterator[bytes]:
+        return (value for header, value in self._scope.get("headers", ()) if header == b"cookie")
+
+    def __getitem__(self, name: str) -> str:
+        if self._parsed is not None:
+            return self._parsed[name]
+        key = name.encode("latin-1") + b"="
+        for header in self._cookie_headers():
+            start = 0
+            while (index := header.find(key, start)) >= 0:
+                # Only match at the start of a cookie, not inside another name or value
+                if index == 0 or header[index - 1] in b"; \t":
+                    end = header.find(b";", index)
+                    value = header[index + len(key):end if end >= 0 else len(header)].strip()
+                    if len(value) >= 2 and value[:1] == value[-1:] == b'"':
+                        value = value[1:-1]
+                    return value.decode("latin-1")
+                start = index + 1
+        raise KeyError(name)
+
+    def _parse(self) -> dict[str, str]:
+        if self._parsed is None:
+            self._parsed = cookie_parser("; ".join(h.decode("latin-1") for h in self._cookie_headers()))
+        return self._parsed
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._parse())
+
+    def __len__(self) -> int:
+        return len(self._parse())
+
+
+class TokenSource(Protocol):
+    """A place a credential can come from."""
+
+    # "token" for access tokens, "session" for server-side session IDs
+    kind: Literal["token", "session"]
+
+    def extract(self, scope: Scope, cookies: ScopeCookies) -> str | None:
+        """Return the credential, or None if this source has none."""
+        ...
+
+
+class CookieSource:
+    """Access token cookie, reassembled and decompressed if needed."""
+    kind = "token"
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def extract(self, scope: Scope, cookies: ScopeCookies) -> str | None:
+        return read_token_cookie(cookies, self.name)
+
+
+class BearerSource:
+    """``Authorization: Bearer <token>`` header."""
+    kind = "token"
+
+    def extract(self, scope: Scope, cookies: ScopeCookies) -> str | None:
+        value = scope_header(scope, "authorization")
+        if value and value.startswith("Bearer "):
+            return value.removeprefix("Bearer ") or None
+        return None
+
+
+class HeaderSource:
+    """Custom header carrying the bare token."""
+    kind = "token"
+
+    def __init__(self, name: str):
+        self.name = name.lower()
+
+    def extract(self, scope: Scope, cookies: ScopeCookies) -> str | None:
+        return (scope_header(scope, self.name) or "").strip() or None
+
+
+class QuerySource:
+    """
+    Query parameter, for WebSocket clients that cannot set headers.
+
+    Ignored on HTTP requests unless ``websocket_only`` is False, as query
+    strings end up in access logs.
+    """
+    kind = "token"
+
+    def __init__(self, name: str, websocket_only: bool = True):
+        self.name = name
+        self.websocket_only = websocket_only
+
+    def extract(self, scope: Scope, cookies: ScopeCookies) -> str | None:
+        if self.websocket_only and scope["type"] != "websocket":
+            return None
+        query = scope.get("query_string", b"").decode("latin-1")
+        for pair in query.split("&"):
+            key, _, value = pair.partition("=")
+            if unquote_plus(key) == self.name:
+                return unquote_plus(value) or None
+        return None
+
+
+class SessionSource:
+    """Server-side session ID cookie."""
+    kind = "session"
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def extract(self, scope: Scope, cookies: ScopeCookies) -> str | None:
+        return cookies.get(self.name) or None
+
+
+class TokenExtractor:
+    """Ordered chain of token sources; the first one with a credential wins."""
+
+    def __init__(self, sources: Sequence[TokenSource]):
+        self.sources = tuple(sources)
+
+    @classmethod
+    def from_settings(cls, settings: KeycloakSettings) -> "TokenExtractor":
+        """
+        Build the chain named in KEYCLOAK_TOKEN_SOURCES. ``session`` is
+        skipped unless KEYCLOAK_SESSION_STORE_URL is set.
+
+        Raises:
+            ValueError: If a source name is unknown
+        """
+        factories = {
+            "cookie": lambda: CookieSource(settings.cookie_name),
+            "bearer": BearerSource,
+            "header": lambda: HeaderSource(settings.token_header),
+            "query": lambda: QuerySource(settings.token_query_param),
+            "session": lambda: SessionSource(settings.session_cookie_name),
+        }
+        sources = []
+        for name in settings.token_sources.replace(",", " ").split():
+            if name not in factories:
+                raise ValueError(f"Unknown token source: {name!r}")
+            # Session cookies mean nothing without a session store
+            if name != "session" or settings.session_store_url:
+                sources.append(factories[name]())
+        return cls(sources)
+
+    def extract(self, scope: Scope) -> tuple[str | None, str | None]:
+        """Return ``(token, None)``, ``(None, session_id)`` or ``(None, None)``."""
+        cookies = ScopeCookies(scope)
+        for source in self.sources:
+            value = source.extract(scope, cookies)
+            if value is not None:
+                return (value, None) if source.kind == "token" else (None, value)
+        return None, None
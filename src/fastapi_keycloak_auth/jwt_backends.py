@@ -0,0 +1,335 @@
+"""
+Signature verification backends for JWTs.
+
+A backend turns JWKs into key objects once per JWKS fetch and verifies
+token signatures with them. Claims (exp, nbf, iss, ...) are checked by
+validate_claims() afterwards, so every backend enforces the same rules.
+
+Every key is bound to exactly one algorithm, taken from its ``alg``
+member or derived from its key type and curve. A token is only verified
+with the algorithm of the key it names, which rules out algorithm
+confusion (e.g. an HS256 token "signed" with an RSA public key).
+
+Usage:
+    KEYCLOAK_JWT_BACKEND=cryptography
+
+Backends:
+    jose: python-jose (default), supports RS* and ES*
+    cryptography: verifies with pre-built ``cryptography`` public keys,
+        skipping python-jose's key wrapping and claim handling. Supports
+        RS*, ES* and EdDSA. Requires the ``cryptography`` package
+        (``pip install python-jose[cryptography]``).
+"""
+
+import binascii
+import json
+import time
+from base64 import urlsafe_b64decode
+from dataclasses import dataclass, field
+from typing import Any, Protocol, runtime_checkable
+
+from jose import jwk, jws
+from jose.exceptions import ExpiredSignatureError, JWSError, JWTClaimsError, JWTError
+
+try:
+    from cryptography.exceptions import InvalidSignature
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import ec, ed448, ed25519, padding, rsa
+    from cryptography.hazmat.primitives.asymmetric.utils import encode_dss_signature
+except ImportError:  # pragma: no cover - optional dependency
+    rsa = None
+
+# Supported algorithm -> (key type, curve); symmetric algorithms and "none" are never accepted
+ALGORITHMS: dict[str, tuple[str, str | None]] = {
+    "RS256": ("RSA", None),
+    "RS384": ("RSA", None),
+    "RS512": ("RSA", None),
+    "ES256": ("EC", "P-256"),
+    "ES384": ("EC", "P-384"),
+    "ES512": ("EC", "P-521"),
+    "EdDSA": ("OKP", None),
+}
+
+_EDDSA_CURVES = ("Ed25519", "Ed448")
+
+
+class TokenNotYetValidError(JWTClaimsError):
+    """The token's ``nbf`` is in the future; it becomes valid on its own."""
+
+# Algorithm for keys without an "alg" member, by (key type, curve)
+_DEFAULT_ALGORITHMS = {
+    ("RSA", None): "RS256",
+    ("EC", "P-256"): "ES256",
+    ("EC", "P-384"): "ES384",
+    ("EC", "P-521"): "ES512",
+    ("OKP", "Ed25519"): "EdDSA",
+    ("OKP", "Ed448"): "EdDSA",
+}
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    """A parsed public key and the one algorithm it may verify."""
+    kid: str | None
+    algorithm: str
+    key: Any
+    # Source JWK, for rebuilding the key in another process
+    jwk: dict = field(default_factory=dict, compare=False, repr=False)
+
+
+def key_algorithm(key_data: dict) -> str:
+    """
+    Return the algorithm a JWK is bound to.
+
+    Raises:
+        ValueError: If the algorithm is unsupported or does not match the
+            key type or curve
+    """
+    kty = key_data.get("kty")
+    crv = key_data.get("crv")
+    alg = key_data.get("alg") or _DEFAULT_ALGORITHMS.get((kty, None if kty == "RSA" else crv))
+    if alg not in ALGORITHMS:
+        raise ValueError(f"Unsupported algorithm {alg!r} for key type {kty!r}")
+
+    expected_kty, expected_crv = ALGORITHMS[alg]
+    if kty != expected_kty or (expected_crv and crv != expected_crv) or (kty == "OKP" and crv not in _EDDSA_CURVES):
+        raise ValueError(f"Algorithm {alg} does not match key type {kty!r} (curve {crv!r})")
+    return alg
+
+
+@runtime_checkable
+class JWTBackend(Protocol):
+    """Interface for JWT signature verification backends."""
+
+    name: str
+
+    def load_key(self, key_data: dict, algorithm: str) -> Any:
+        """
+        Build a public key object from a JWK for use with ``algorithm``.
+
+        Raises:
+            ValueError: If the key type is not supported by the backend
+        """
+        ...
+
+    def verify(self, token: str, key: Any, algorithms: list[str]) -> dict:
+        """
+        Verify the token signature and return its (unvalidated) claims.
+
+        Raises:
+            JWTError: If the token is malformed, its algorithm is not
+                allowed or the signature is invalid
+        """
+        ...
+
+
+def _b64decode(segment: str) -> bytes:
+    return urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def unverified_header(token: str) -> dict:
+    """
+    Decode the JOSE header of a token without verifying it.
+
+    Only the header segment is decoded, unlike ``jwt.get_unverified_header``
+    which also decodes payload and signature.
+
+    Raises:
+        JWTError: If the header cannot be decoded
+    """
+    try:
+        header = json.loads(_b64decode(token[:token.index(".")]))
+    except (ValueError, binascii.Error) as e:
+        raise JWTError("Error decoding token headers.") from e
+    if not isinstance(header, dict):
+        raise JWTError("Invalid header string: must be a json object")
+    return header
+
+
+def unverified_token(token: str) -> tuple[dict, dict]:
+    """
+    Decode the header and claims of a token without verifying it.
+
+    Used to reject malformed, expired or foreign tokens before any
+    signature work. Nothing returned here may be trusted until the
+    signature has been verified.
+
+    Raises:
+        JWTError: If the token does not have three segments or its header
+            or payload cannot be decoded
+    """
+    segments = token.split(".")
+    if len(segments) != 3:
+        raise JWTError("Not enough segments" if len(segments) < 3 else "Too many segments")
+    header = unverified_header(token)
+    try:
+        payload = _b64decode(segments[1])
+    except (ValueError, binascii.Error) as e:
+        raise JWTError("Invalid payload padding") from e
+    return header, _parse_claims(payload)
+
+
+def _parse_claims(payload: bytes) -> dict:
+    try:
+        claims = json.loads(payload)
+    except ValueError as e:
+        raise JWTError("Invalid payload string") from e
+    if not isinstance(claims, dict):
+        raise JWTError("Invalid payload string: must be a json object")
+    return claims
+
+
+class JoseBackend:
+    """Backend using python-jose."""
+
+    name = "jose"
+
+    def load_key(self, key_data: dict, algorithm: str) -> Any:
+        return jwk.construct(key_data, algorithm)
+
+    def verify(self, token: str, key: Any, algorithms: list[str]) -> dict:
+        try:
+            payload = jws.verify(token, key, algorithms)
+        except JWSError as e:
+            raise JWTError(e) from e
+        return _parse_claims(payload)
+
+
+class CryptographyBackend:
+    """Backend verifying signatures directly with ``cryptography``."""
+
+    name = "cryptography"
+
+    _HASHES = {
+        "RS256": "SHA256", "RS384": "SHA384", "RS512": "SHA512",
+        "ES256": "SHA256", "ES384": "SHA384", "ES512": "SHA512",
+    }
+
+    def __init__(self):
+        if rsa is None:
+            raise ImportError(
+                "The cryptography JWT backend requires the cryptography package "
+                "(pip install python-jose[cryptography])"
+            )
+
+    def load_key(self, key_data: dict, algorithm: str) -> Any:
+        kty = key_data.get("kty")
+        if kty == "RSA":
+            return rsa.RSAPublicNumbers(
+                e=int.from_bytes(_b64decode(key_data["e"]), "big"),
+                n=int.from_bytes(_b64decode(key_data["n"]), "big"),
+            ).public_key()
+        if kty == "EC":
+            curves = {"P-256": ec.SECP256R1, "P-384": ec.SECP384R1, "P-521": ec.SECP521R1}
+            if key_data.get("crv") not in curves:
+                raise ValueError(f"Unsupported curve: {key_data.get('crv')}")
+            return ec.EllipticCurvePublicNumbers(
+                x=int.from_bytes(_b64decode(key_data["x"]), "big"),
+                y=int.from_bytes(_b64decode(key_data["y"]), "big"),
+                curve=curves[key_data["crv"]](),
+            ).public_key()
+        if kty == "OKP":
+            curves = {"Ed25519": ed25519.Ed25519PublicKey, "Ed448": ed448.Ed448PublicKey}
+            if key_data.get("crv") not in curves:
+                raise ValueError(f"Unsupported curve: {key_data.get('crv')}")
+            return curves[key_data["crv"]].from_public_bytes(_b64decode(key_data["x"]))
+        raise ValueError(f"Unsupported key type: {kty}")
+
+    def verify(self, token: str, key: Any, algorithms: list[str]) -> dict:
+        try:
+            signing_input, _, signature_segment = token.rpartition(".")
+            header_segment, _, payload_segment = signing_input.partition(".")
+            header = json.loads(_b64decode(header_segment))
+            payload = _b64decode(payload_segment)
+            signature = _b64decode(signature_segment)
+        except (ValueError, binascii.Error) as e:
+            raise JWTError("Invalid token format") from e
+        if not isinstance(header, dict):
+            raise JWTError("Invalid header string: must be a json object")
+
+        alg = header.get("alg")
+        if alg not in algorithms or alg not in ALGORITHMS:
+            raise JWTError("The specified alg value is not allowed")
+
+        try:
+            self._verify_signature(alg, key, signing_input.encode(), signature)
+        except InvalidSignature as e:
+            raise JWTError("Signature verification failed.") from e
+        return _parse_claims(payload)
+
+    def _verify_signature(self, alg: str, key: Any, data: bytes, signature: bytes) -> None:
+        kty = ALGORITHMS[alg][0]
+        if kty == "RSA" and isinstance(key, rsa.RSAPublicKey):
+            key.verify(signature, data, padding.PKCS1v15(), getattr(hashes, self._HASHES[alg])())
+        elif kty == "EC" and isinstance(key, ec.EllipticCurvePublicKey):
+            # JWS uses the raw r || s encoding, cryptography expects DER
+            size = (key.curve.key_size + 7) // 8
+            if len(signature) != 2 * size:
+                raise InvalidSignature()
+            r = int.from_bytes(signature[:size], "big")
+            s = int.from_bytes(signature[size:], "big")
+            key.verify(encode_dss_signature(r, s), data, ec.ECDSA(getattr(hashes, self._HASHES[alg])()))
+        elif kty == "OKP" and isinstance(key, (ed25519.Ed25519PublicKey, ed448.Ed448PublicKey)):
+            key.verify(signature, data)
+        else:
+            raise JWTError("Key does not match the token algorithm")
+
+
+JWT_BACKENDS: dict[str, type[JWTBackend]] = {
+    "jose": JoseBackend,
+    "cryptography": CryptographyBackend,
+}
+
+
+def create_jwt_backend(name: str) -> JWTBackend:
+    """
+    Create a JWT backend by name.
+
+    Raises:
+        ValueError: If the name is unknown
+        ImportError: If the backend's dependency is not installed
+    """
+    try:
+        return JWT_BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown JWT backend: {name}") from None
+
+
+def _numeric_claim(claims: dict, name: str, message: str) -> int | None:
+    if name not in claims:
+        return None
+    try:
+        return int(claims[name])
+    except (TypeError, ValueError, OverflowError):
+        raise JWTClaimsError(message) from None
+
+
+def validate_claims(claims: dict, issuer: str, leeway: float = 0) -> None:
+    """
+    Check the registered claims of a verified token.
+
+    Follows python-jose's rules: ``iat``, ``nbf`` and ``exp`` must be
+    numeric if present, the token must be valid now (within ``leeway``
+    seconds) and ``iss`` must match. The audience is checked separately.
+
+    Raises:
+        JWTError: If a claim is invalid (ExpiredSignatureError if expired,
+            TokenNotYetValidError if not yet valid)
+    """
+    now = time.time()
+
+    _numeric_claim(claims, "iat", "Issued At claim (iat) must be an integer.")
+
+    nbf = _numeric_claim(claims, "nbf", "Not Before claim (nbf) must be an integer.")
+    if nbf is not None and nbf > now + leeway:
+        raise TokenNotYetValidError("The token is not yet valid (nbf)")
+
+    exp = _numeric_claim(claims, "exp", "Expiration Time claim (exp) must be an integer.")
+    if exp is not None and exp < now - leeway:
+        raise ExpiredSignatureError("Signature has expired.")
+
+    if claims.get("iss") != issuer:
+        raise JWTClaimsError("Invalid issuer")
+
+    if "sub" in claims and not isinstance(claims["sub"], str):
+        raise JWTClaimsError("Subject must be a string.")
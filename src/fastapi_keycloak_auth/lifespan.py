@@ -0,0 +1,53 @@
+"""
+Application lifespan integration.
+
+Usage:
+    from fastapi import FastAPI
+    from fastapi_keycloak_auth import keycloak_lifespan
+
+    app = FastAPI(lifespan=keycloak_lifespan)
+
+Or combined with an existing lifespan:
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        async with keycloak_lifespan(app):
+            yield
+"""
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from fastapi import FastAPI
+
+from .dependencies import get_keycloak_client, get_settings
+
+
+@asynccontextmanager
+async def keycloak_lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Open the shared Keycloak HTTP client on startup and close it on shutdown.
+
+    Before the app accepts traffic, the discovery document and JWKS are
+    preloaded (KEYCLOAK_WARMUP_ON_STARTUP) and the background JWKS refresh
+    is started if KEYCLOAK_JWKS_REFRESH_INTERVAL is set.
+
+    Raises:
+        RuntimeError: If KEYCLOAK_WARMUP_REQUIRED is set and warm-up fails
+    """
+    settings = get_settings()
+    client = get_keycloak_client()
+    # Create the shared httpx client up front; connections are opened lazily (by the warm-up, if enabled)
+    client.http_client
+
+    if settings.warmup_on_startup:
+        ready = await client.warmup()
+        if not ready and settings.warmup_required:
+            await client.aclose()
+            raise RuntimeError("Keycloak warm-up failed")
+
+    client.start_jwks_refresh()
+    try:
+        yield
+    finally:
+        await client.aclose()
@@ -0,0 +1,197 @@
+"""
+ASGI middleware that authenticates every request once.
+
+The middleware finds the token with the client's TokenExtractor (or
+looks up the server-side session), verifies it with the KeycloakClient and stores the outcome on
+the scope (``request.state.keycloak_auth``). CurrentUser, OptionalUser,
+require_role and require_policy then read it instead of verifying
+again. Paths in ``bypass_paths`` (exact) or under ``bypass_prefixes``
+are passed through without looking at the token. If the signing keys
+cannot be loaded (Keycloak unreachable or answering garbage), the
+request is treated as unauthenticated; with ``require_auth`` it gets a
+503 instead of a 401.
+
+With ``sliding_session``, a cookie session whose access token is missing
+or expires within KEYCLOAK_SESSION_REFRESH_THRESHOLD seconds is refreshed
+with the refresh cookie before the request is handled, and the new
+cookies are added to the response, so the browser never sees a 401.
+
+Usage:
+    from fastapi import FastAPI
+    from fastapi_keycloak_auth import KeycloakAuthMiddleware
+
+    app = FastAPI(lifespan=keycloak_lifespan)
+    app.add_middleware(KeycloakAuthMiddleware, bypass_paths=["/health", "/auth/ready"])
+
+    # Reject unauthenticated requests before routing
+    app.add_middleware(KeycloakAuthMiddleware, require_auth=True, bypass_prefixes=["/public/", "/auth/"])
+
+    # Refresh cookie sessions transparently
+    app.add_middleware(KeycloakAuthMiddleware, sliding_session=True, bypass_prefixes=["/auth/"])
+"""
+
+import logging
+import time
+from collections.abc import Iterable
+
+import httpx
+from jose import JWTError
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from starlette.websockets import WebSocketClose
+
+from .client import KeycloakClient
+from .cookies import delete_cookie_headers, read_token_cookie, token_cookie_headers
+from .dependencies import (
+    RequestAuth,
+    _authenticate_session,
+    _authenticate_token,
+    _extract_credentials,
+    _refresh_rejected,
+    get_keycloak_client,
+)
+from .events import AuthEvent, RefreshEventData, auth_events
+from .extractors import ScopeCookies, scope_header
+from .jwt_backends import unverified_token
+
+logger = logging.getLogger(__name__)
+
+
+def _expires_within(token: str, seconds: float) -> bool:
+    """Check the (unverified) exp of a token; undecodable tokens count as expiring."""
+    try:
+        _, claims = unverified_token(token)
+        return float(claims["exp"]) - time.time() <= seconds
+    except (JWTError, KeyError, TypeError, ValueError):
+        return True
+
+
+def _replace_cookie(scope: Scope, name: str, value: str) -> None:
+    """Replace (or add) a cookie in the request headers of ``scope``."""
+    cookies = dict(ScopeCookies(scope))
+    cookies[name] = value
+    cookie_header = "; ".join(f"{key}={val}" for key, val in cookies.items()).encode("latin-1")
+    headers = [(key, val) for key, val in scope["headers"] if key != b"cookie"]
+    headers.append((b"cookie", cookie_header))
+    scope["headers"] = headers
+
+
+class KeycloakAuthMiddleware:
+    """
+    Pure ASGI middleware authenticating HTTP and WebSocket connections.
+
+    By default unauthenticated requests are passed on and left to the
+    route dependencies. With ``require_auth``, requests without a valid
+    token get a 401 (WebSockets are closed with code 1008) unless their
+    path is bypassed. ``sliding_session`` only applies to HTTP requests
+    authenticated by cookie.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        client: KeycloakClient | None = None,
+        bypass_paths: Iterable[str] = (),
+        bypass_prefixes: Iterable[str] = (),
+        require_auth: bool = False,
+        sliding_session: bool = False,
+    ):
+        self.app = app
+        self.client = client
+        self.bypass_paths = frozenset(bypass_paths)
+        self.bypass_prefixes = tuple(bypass_prefixes)
+        self.require_auth = require_auth
+        self.sliding_session = sliding_session
+
+    def is_bypassed(self, path: str) -> bool:
+        """Check whether a path skips authentication."""
+        return path in self.bypass_paths or (bool(self.bypass_prefixes) and path.startswith(self.bypass_prefixes))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket") or self.is_bypassed(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        client = self.client or get_keycloak_client()
+        set_cookies: list[tuple[bytes, bytes]] = []
+        if self.sliding_session and scope["type"] == "http":
+            set_cookies = await self._slide_session(scope, client)
+
+        token, session_id = _extract_credentials(scope, client)
+        unavailable = False
+        try:
+            if session_id is not None:
+                auth = await _authenticate_session(client, session_id)
+            else:
+                auth = await _authenticate_token(client, token)
+        except (httpx.HTTPError, ValueError) as e:
+            # Public and OptionalUser routes must keep working while Keycloak is down
+            logger.warning(f"Token verification unavailable: {e}")
+            auth = RequestAuth(token=token, session_id=session_id, error=JWTError("Signing keys unavailable"))
+            unavailable = True
+        scope.setdefault("state", {})["keycloak_auth"] = auth
+
+        if set_cookies:
+            send = self._with_cookies(send, set_cookies)
+
+        if self.require_auth and auth.user is None:
+            if scope["type"] == "websocket":
+                response = WebSocketClose(code=1013 if unavailable else 1008)
+            elif unavailable:
+                response = JSONResponse({"detail": "Authentication unavailable"}, status_code=503)
+            else:
+                response = JSONResponse(
+                    {"detail": "Not authenticated"},
+                    status_code=401,
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+    async def _slide_session(self, scope: Scope, client: KeycloakClient) -> list[tuple[bytes, bytes]]:
+        """
+        Refresh a cookie session close to expiry and return the Set-Cookie headers.
+
+        The new access token replaces the old one in the request's cookies,
+        so the rest of the request is handled with it.
+        """
+        settings = client.settings
+        if scope_header(scope, "authorization") is not None:
+            return []
+        cookies = ScopeCookies(scope)
+        refresh_token = read_token_cookie(cookies, settings.refresh_cookie_name)
+        if not refresh_token:
+            return []
+        access_token = read_token_cookie(cookies, settings.cookie_name)
+        if access_token and not _expires_within(access_token, settings.session_refresh_threshold):
+            return []
+
+        try:
+            tokens = await client.refresh_tokens(refresh_token)
+        except httpx.HTTPStatusError as e:
+            # Refresh token expired or revoked: end the session instead of retrying on every request
+            if _refresh_rejected(e):
+                return delete_cookie_headers(settings, cookies)
+            logger.warning(f"Sliding session refresh failed: {e}")
+            return []
+        except httpx.HTTPError as e:
+            logger.warning(f"Sliding session refresh failed: {e}")
+            return []
+
+        # Emit REFRESH event
+        if auth_events.has_handlers(AuthEvent.REFRESH):
+            await auth_events.emit(AuthEvent.REFRESH, RefreshEventData(tokens=tokens))
+
+        _replace_cookie(scope, settings.cookie_name, tokens.access_token)
+        return token_cookie_headers(tokens, settings)
+
+    @staticmethod
+    def _with_cookies(send: Send, set_cookies: list[tuple[bytes, bytes]]) -> Send:
+        async def send_with_cookies(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), *set_cookies]
+            await send(message)
+
+        return send_with_cookies
@@ -2,9 +2,20 @@
 Pydantic models for authentication.
 """
 
+from functools import cached_property
+
 from pydantic import BaseModel, Field
 
 
+def _names(values) -> frozenset[str]:
+    """Return the strings in a claim value as a set (other values are ignored)."""
+    if isinstance(values, str):
+        values = values.split()
+    if not isinstance(values, (list, tuple)):
+        return frozenset()
+    return frozenset(value for value in values if isinstance(value, str))
+
+
 class TokenPayload(BaseModel):
     """Validated JWT token payload from Keycloak."""
 
@@ -17,6 +28,9 @@ class TokenPayload(BaseModel):
     family_name: str | None = Field(default=None, description="Last name")
     realm_access: dict | None = Field(default=None, description="Realm-level access")
     resource_access: dict | None = Field(default=None, description="Resource-level access")
+    groups: list[str] | None = Field(default=None, description="Group memberships (requires a group mapper)")
+    scope: str | None = Field(default=None, description="Granted scopes (space separated)")
+    exp: float | None = Field(default=None, description="Expiration time (Unix timestamp)")
 
     @property
     def roles(self) -> list[str]:
@@ -25,9 +39,30 @@ class TokenPayload(BaseModel):
             return self.realm_access.get("roles", [])
         return []
 
+    @cached_property
+    def role_set(self) -> frozenset[str]:
+        """Realm roles as a set, built once per token."""
+        return _names(self.roles)
+
+    @cached_property
+    def grants(self) -> frozenset[str]:
+        """
+        Everything the token grants, as qualified names for Policy checks.
+
+        Built once per token: ``realm:<role>``, ``client:<client_id>:<role>``,
+        ``group:<group>`` and ``scope:<scope>``.
+        """
+        grants = {f"realm:{role}" for role in self.role_set}
+        for client_id, access in (self.resource_access or {}).items():
+            if isinstance(access, dict):
+                grants.update(f"client:{client_id}:{role}" for role in _names(access.get("roles")))
+        grants.update(f"group:{group}" for group in _names(self.groups))
+        grants.update(f"scope:{scope}" for scope in _names(self.scope))
+        return frozenset(grants)
+
     def has_role(self, role: str) -> bool:
         """Check if user has a specific realm role."""
-        return role in self.roles
+        return role in self.role_set
 
     def get_client_roles(self, client_id: str) -> list[str]:
         """Get roles for a specific client."""
@@ -70,6 +105,7 @@ class TokenResponse(BaseModel):
     refresh_token: str | None = None
     token_type: str = "Bearer"
     expires_in: int
+    refresh_expires_in: int | None = None
 
 
 class AuthStatus(BaseModel):
@@ -0,0 +1,131 @@
+"""
+Compiled access policies over roles, groups and scopes.
+
+A Policy is built once, when the route is defined, into frozensets of
+qualified names. Checking a token is then a few set operations against
+``TokenPayload.grants``, which is built once per verified token, instead
+of a scan of the role list per required role.
+
+Terms:
+    admin                   realm role (same as realm:admin)
+    realm:admin             realm role
+    client:my-api:editor    role of client my-api
+    group:/staff            group membership
+    scope:orders:write      granted scope
+
+Usage:
+    from fastapi_keycloak_auth import all_of, any_of, none_of, require_policy
+
+    editors = all_of("client:my-api:editor") & any_of("group:/staff", "admin") & none_of("suspended")
+
+    @app.post("/articles")
+    async def create_article(user = Depends(require_policy(editors))):
+        ...
+"""
+
+from collections.abc import Iterable
+
+from .models import TokenPayload
+
+_KINDS = ("realm", "client", "group", "scope")
+
+
+def compile_term(term: str) -> str:
+    """
+    Return the qualified name of a policy term.
+
+    Raises:
+        ValueError: If the term is empty or has an unknown prefix
+    """
+    kind, sep, name = term.partition(":")
+    if not sep:
+        kind, name = "realm", term
+    if kind not in _KINDS or not name or (kind == "client" and ":" not in name.strip(":")):
+        raise ValueError(f"Invalid policy term: {term!r}")
+    return f"{kind}:{name}"
+
+
+def _compile(terms: Iterable[str]) -> frozenset[str]:
+    return frozenset(compile_term(term) for term in terms)
+
+
+class Policy:
+    """
+    Requirements a token must meet: all of ``required``, at least one of
+    each set in ``any_of`` and none of ``forbidden``.
+
+    Policies combine with ``&``.
+    """
+
+    __slots__ = ("required", "any_of", "forbidden")
+
+    def __init__(
+        self,
+        required: frozenset[str] = frozenset(),
+        any_of: tuple[frozenset[str], ...] = (),
+        forbidden: frozenset[str] = frozenset(),
+    ):
+        self.required = required
+        self.any_of = any_of
+        self.forbidden = forbidden
+
+    def allows(self, token: TokenPayload) -> bool:
+        """Check whether a token meets the policy."""
+        grants = token.grants
+        return (
+            self.required <= grants
+            and all(not options.isdisjoint(grants) for options in self.any_of)
+            and self.forbidden.isdisjoint(grants)
+        )
+
+    def __and__(self, other: "Policy") -> "Policy":
+        if not isinstance(other, Policy):
+            return NotImplemented
+        return Policy(
+            required=self.required | other.required,
+            any_of=self.any_of + other.any_of,
+            forbidden=self.forbidden | other.forbidden,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Policy):
+            return NotImplemented
+        return (
+            self.required == other.required
+            and set(self.any_of) == set(other.any_of)
+            and self.forbidden == other.forbidden
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.required, frozenset(self.any_of), self.forbidden))
+
+    def __repr__(self) -> str:
+        parts = []
+        if self.required:
+            parts.append(f"all_of{tuple(sorted(self.required))}")
+        parts.extend(f"any_of{tuple(sorted(options))}" for options in self.any_of)
+        if self.forbidden:
+            parts.append(f"none_of{tuple(sorted(self.forbidden))}")
+        return " & ".join(parts) or "Policy()"
+
+
+def all_of(*terms: str) -> Policy:
+    """Policy requiring every term."""
+    return Policy(required=_compile(terms))
+
+
+def any_of(*terms: str) -> Policy:
+    """
+    Policy requiring at least one term.
+
+    Raises:
+        ValueError: If no terms are given
+    """
+    if not terms:
+        raise ValueError("any_of() requires at least one term")
+    return Policy(any_of=(_compile(terms),))
+
+
+def none_of(*terms: str) -> Policy:
+    """Policy rejecting tokens with any of the terms."""
+    return Policy(forbidden=_compile(terms))
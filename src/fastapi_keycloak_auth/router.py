@@ -2,19 +2,23 @@
 FastAPI router with authentication endpoints.
 """
 
+import logging
 from urllib.parse import urlencode
 
 import httpx
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
-from fastapi.responses import RedirectResponse
+from fastapi.responses import JSONResponse, RedirectResponse
 from jose import JWTError
 
+from .cache_backends import BACKEND_ERRORS
+from .cookies import delete_token_cookies, read_token_cookie, set_session_cookie, set_token_cookies
 from .dependencies import (
     get_current_user,
     get_current_user_optional,
     get_keycloak_client,
     get_settings,
 )
+from .extractors import ScopeCookies
 from .events import (
     AuthEvent,
     LoginEventData,
@@ -24,6 +28,16 @@ from .events import (
 )
 from .models import AuthStatus, TokenPayload, User
 
+logger = logging.getLogger(__name__)
+
+
+def _store_unavailable(error: Exception) -> HTTPException:
+    logger.warning(f"Session store unavailable: {error}")
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Session store unavailable",
+    )
+
 
 def create_auth_router(
     prefix: str | None = None,
@@ -48,6 +62,7 @@ def create_auth_router(
         GET {prefix}/refresh - Refresh access token
         GET {prefix}/me - Get current user info
         GET {prefix}/status - Check authentication status
+        GET {prefix}/ready - Check if Keycloak keys are loaded (readiness probe)
 
     Example:
         # Default: /auth/*
@@ -98,7 +113,8 @@ def create_auth_router(
         """
         OAuth2 callback handler.
 
-        Exchanges authorization code for tokens and sets them as cookies.
+        Exchanges authorization code for tokens and sets them as cookies
+        (or, with a session store, stores them and sets a session cookie).
         Redirects to frontend after successful authentication.
         """
         settings = get_settings()
@@ -117,26 +133,31 @@ def create_auth_router(
 
         response = RedirectResponse(url=redirect_url, status_code=302)
 
-        # Set access token cookie
-        response.set_cookie(
-            key=settings.cookie_name,
-            value=tokens.access_token,
-            httponly=settings.cookie_httponly,
-            secure=settings.cookie_secure,
-            samesite=settings.cookie_samesite,
-            max_age=tokens.expires_in,
-        )
-
-        # Set refresh token cookie if available
-        if tokens.refresh_token:
-            response.set_cookie(
-                key=settings.refresh_cookie_name,
-                value=tokens.refresh_token,
-                httponly=settings.cookie_httponly,
-                secure=settings.cookie_secure,
-                samesite=settings.cookie_samesite,
-            )
+        if client.session_store is not None:
+            # Keep the tokens server-side, the browser only gets the session ID
+            try:
+                user = await client.verify_token(tokens.access_token)
+            except JWTError as e:
+                if auth_events.has_handlers(AuthEvent.TOKEN_INVALID):
+                    await auth_events.emit(AuthEvent.TOKEN_INVALID, TokenInvalidEventData(error=str(e), token=tokens.access_token))
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Failed to verify token",
+                ) from e
+            try:
+                session_id = await client.session_store.create(tokens, user)
+            except BACKEND_ERRORS as e:
+                raise _store_unavailable(e) from e
+            set_session_cookie(response, session_id, settings)
+            # Emit LOGIN event
+            if auth_events.has_handlers(AuthEvent.LOGIN):
+                await auth_events.emit(AuthEvent.LOGIN, LoginEventData(user=user, tokens=tokens))
+            return response
+
+        # Set access and refresh token cookies
+        set_token_cookies(response, tokens, settings)
 
+        if tokens.refresh_token:
             try:
                 user = await client.verify_token(tokens.access_token)
                 # Emit LOGIN event
@@ -157,7 +178,8 @@ def create_auth_router(
         """
         Logout user.
 
-        Clears authentication cookies and redirects to Keycloak logout.
+        Clears authentication cookies (and ends the server-side session)
+        and redirects to Keycloak logout.
         After Keycloak logout, user is redirected to {auth_path}/logout-callback,
         which then redirects to the frontend.
         """
@@ -167,8 +189,18 @@ def create_auth_router(
 
         # Try to get user for event (may be None if token expired)
         user = None
-        token = request.cookies.get(settings.cookie_name)
-        if token:
+        token, session_id = client.token_extractor.extract(request.scope)
+        if session_id and client.session_store is not None:
+            # The cookies are cleared even if the store cannot be reached
+            try:
+                session = await client.session_store.get(session_id)
+                await client.session_store.delete(session_id)
+            except BACKEND_ERRORS as e:
+                logger.warning(f"Could not delete session on logout: {e}")
+                session = None
+            if auth_events.has_handlers(AuthEvent.LOGOUT):
+                await auth_events.emit(AuthEvent.LOGOUT, LogoutEventData(user=session.user if session else None))
+        elif token:
             try:
                 user = await client.verify_token(token)
             except JWTError as e:
@@ -189,13 +221,13 @@ def create_auth_router(
         }
 
         response = RedirectResponse(f"{openid_configuration.end_session_endpoint}?{urlencode(params)}")
-        response.delete_cookie(settings.cookie_name)
-        response.delete_cookie(settings.refresh_cookie_name)
+        delete_token_cookies(response, settings, ScopeCookies(request.scope))
 
         return response
 
     @router.get("/logout-callback")
     async def logout_callback(
+        request: Request,
         redirect: str | None = Query(default=None, description="URL to redirect to"),
     ):
         """
@@ -210,8 +242,7 @@ def create_auth_router(
 
         # Ensure cookies are cleared (belt and suspenders)
         response = RedirectResponse(url=redirect_url, status_code=302)
-        response.delete_cookie(settings.cookie_name)
-        response.delete_cookie(settings.refresh_cookie_name)
+        delete_token_cookies(response, settings, ScopeCookies(request.scope))
 
         return response
 
@@ -224,13 +255,26 @@ def create_auth_router(
         Refresh access token.
 
         Uses refresh token from cookie or request body to get new tokens.
+        If the refresh token came from the cookie, the cookies are updated.
+        A server-side session is refreshed in the store; its tokens are not
+        returned.
         """
         settings = get_settings()
         client = get_keycloak_client()
 
-        # Get refresh token from cookie if not provided in body
-        if not refresh_token:
-            refresh_token = request.cookies.get(settings.refresh_cookie_name)
+        # Get refresh token from cookie (or session) if not provided in body
+        from_cookie = not refresh_token
+        session_id = None
+        if from_cookie:
+            cookies = ScopeCookies(request.scope)
+            refresh_token = read_token_cookie(cookies, settings.refresh_cookie_name)
+            if not refresh_token and client.session_store is not None:
+                session_id = cookies.get(settings.session_cookie_name)
+                try:
+                    session = await client.session_store.get(session_id) if session_id else None
+                except BACKEND_ERRORS as e:
+                    raise _store_unavailable(e) from e
+                refresh_token = session.refresh_token if session else None
 
         if not refresh_token:
             raise HTTPException(
@@ -250,10 +294,29 @@ def create_auth_router(
         if auth_events.has_handlers(AuthEvent.REFRESH):
             await auth_events.emit(AuthEvent.REFRESH, RefreshEventData(tokens=tokens))
 
-        return {
+        if session_id:
+            try:
+                user = await client.verify_token(tokens.access_token)
+            except JWTError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Failed to verify token",
+                ) from e
+            try:
+                await client.session_store.save(session_id, tokens, user)
+            except BACKEND_ERRORS as e:
+                raise _store_unavailable(e) from e
+            response = JSONResponse({"expires_in": tokens.expires_in})
+            set_session_cookie(response, session_id, settings)
+            return response
+
+        response = JSONResponse({
             "access_token": tokens.access_token,
             "expires_in": tokens.expires_in,
-        }
+        })
+        if from_cookie:
+            set_token_cookies(response, tokens, settings)
+        return response
 
     @router.get("/me", response_model=User)
     async def get_me(user: TokenPayload = Depends(get_current_user)):
@@ -276,6 +339,19 @@ def create_auth_router(
             return AuthStatus(authenticated=True, user=User.from_token(user))
         return AuthStatus(authenticated=False, user=None)
 
+    @router.get("/ready")
+    async def get_ready():
+        """
+        Readiness probe.
+
+        Returns 200 once the discovery document and signing keys are loaded,
+        503 otherwise.
+        """
+        client = get_keycloak_client()
+        if not client.is_ready:
+            return JSONResponse({"ready": False}, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+        return {"ready": True}
+
     return router
 
 
@@ -0,0 +1,123 @@
+"""
+Server-side sessions.
+
+With a session store configured, the callback keeps the tokens and the
+verified payload server-side and only sets a short, opaque session ID
+cookie instead of the multi-kilobyte access and refresh token cookies.
+A request with the cookie is authenticated with one store lookup (no
+signature check); an access token close to expiry is refreshed
+server-side without touching the cookie. Sessions expire together with
+the refresh token.
+
+Usage:
+    KEYCLOAK_SESSION_STORE_URL=memory://
+    KEYCLOAK_SESSION_STORE_URL=file:///var/lib/keycloak-sessions
+    KEYCLOAK_SESSION_STORE_URL=redis://localhost:6379/1
+"""
+
+import json
+import secrets
+import time
+from dataclasses import dataclass
+
+from pydantic import ValidationError
+
+from .cache import token_hash
+from .cache_backends import CacheBackend
+from .models import TokenPayload, TokenResponse
+
+
+@dataclass
+class Session:
+    """Tokens and verified payload of one login."""
+    access_token: str
+    refresh_token: str | None
+    # Wall-clock expiry of the access token
+    expires_at: float
+    user: TokenPayload
+
+    def expires_within(self, seconds: float) -> bool:
+        """Check whether the access token expires within ``seconds``."""
+        return self.expires_at - time.time() <= seconds
+
+    def to_bytes(self) -> bytes:
+        return json.dumps({
+            "access_token": self.access_token,
+            "refresh_token": self.refresh_token,
+            "expires_at": self.expires_at,
+            "user": self.user.model_dump(mode="json"),
+        }).encode()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Session":
+        """
+        Raises:
+            ValueError: If the data is not a serialized session
+        """
+        try:
+            raw = json.loads(data)
+            return cls(
+                access_token=raw["access_token"],
+                refresh_token=raw["refresh_token"],
+                expires_at=float(raw["expires_at"]),
+                user=TokenPayload.model_validate(raw["user"]),
+            )
+        except (KeyError, TypeError, ValidationError) as e:
+            raise ValueError(f"Malformed session: {e}") from e
+
+
+class SessionStore:
+    """
+    Sessions kept in a cache backend under ``session:<hash of the ID>``.
+
+    Only the hash of a session ID is stored, so reading the store does
+    not reveal usable session cookies. Each save sets the TTL to the
+    refresh token's lifetime (``refresh_expires_in``), or ``default_ttl``
+    if Keycloak does not report it.
+    """
+
+    def __init__(self, backend: CacheBackend, default_ttl: float = 1800.0):
+        self.backend = backend
+        self.default_ttl = default_ttl
+
+    @staticmethod
+    def _key(session_id: str) -> str:
+        return f"session:{token_hash(session_id)}"
+
+    def ttl_for(self, tokens: TokenResponse) -> float:
+        """Return how long a session with these tokens is kept."""
+        return float(tokens.refresh_expires_in or self.default_ttl)
+
+    async def create(self, tokens: TokenResponse, user: TokenPayload) -> str:
+        """Store a new session and return its ID."""
+        session_id = secrets.token_urlsafe(32)
+        await self.save(session_id, tokens, user)
+        return session_id
+
+    async def save(self, session_id: str, tokens: TokenResponse, user: TokenPayload) -> Session:
+        """Store (or replace) the tokens of a session."""
+        session = Session(
+            access_token=tokens.access_token,
+            refresh_token=tokens.refresh_token,
+            expires_at=time.time() + tokens.expires_in,
+            user=user,
+        )
+        await self.backend.set(self._key(session_id), session.to_bytes(), self.ttl_for(tokens))
+        return session
+
+    async def get(self, session_id: str) -> Session | None:
+        """Return a session, or None if unknown, expired or unreadable."""
+        data = await self.backend.get(self._key(session_id))
+        if data is None:
+            return None
+        try:
+            return Session.from_bytes(data)
+        except ValueError:
+            return None
+
+    async def delete(self, session_id: str) -> None:
+        """End a session."""
+        await self.backend.delete(self._key(session_id))
+
+    async def aclose(self) -> None:
+        await self.backend.aclose()
@@ -0,0 +1,257 @@
+"""
+Cache shared between the worker processes of one host.
+
+Verified tokens and the JWKS document are stored in a memory-mapped file,
+so a token verified by one uvicorn/gunicorn worker is a cache hit in every
+other worker, and a JWKS refetched by one worker after a key rotation is
+picked up by the others without another request to Keycloak.
+
+Put the file on a tmpfs (e.g. /dev/shm) so it is never written to disk.
+The file is created with mode 0600 and refused if other users can access
+it, since anyone who can write to it can inject verified tokens. Its
+header records a namespace (the client's validator fingerprint), so apps
+with another realm, audience or claim rules cannot share the file.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from pydantic import ValidationError
+
+from .cache import CacheStats, check_private
+from .models import TokenPayload
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+MAGIC = b"KCAUTH02"
+
+# magic, number of slots, slot size, JWKS region size, namespace digest
+_HEADER = struct.Struct("<8sIII16s")
+_LAYOUT_SIZE = struct.calcsize("<8sIII")
+# updated_at, length, checksum
+_JWKS_HEADER = struct.Struct("<dI16s")
+# token digest, expires_at, length, checksum
+_SLOT_HEADER = struct.Struct("<32sdI16s")
+
+_EMPTY_KEY = bytes(32)
+
+
+def _checksum(*parts: bytes) -> bytes:
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part)
+    return digest.digest()
+
+
+class SharedCache:
+    """
+    Fixed-size, direct-mapped cache in a memory-mapped file.
+
+    Each token hashes to one slot; a new token for an occupied slot replaces
+    the old entry. Readers do not take a lock: every entry carries a
+    checksum, and a torn or corrupt entry is treated as a miss. Writers are
+    serialized with ``flock`` where available.
+
+    Implements the same ``get``/``set``/``stats`` interface as TokenCache.
+    Counters in ``stats`` are per process; ``size`` covers all workers.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        slots: int = 4096,
+        slot_size: int = 4096,
+        max_ttl: float = 60.0,
+        jwks_size: int = 256 * 1024,
+        namespace: str = "",
+    ):
+        if slot_size <= _SLOT_HEADER.size:
+            raise ValueError(f"slot_size must be larger than {_SLOT_HEADER.size} bytes")
+
+        self.path = path
+        self.slots = slots
+        self.slot_size = slot_size
+        self.max_ttl = max_ttl
+        self.jwks_size = jwks_size
+        self.namespace = namespace
+        self._jwks_offset = _HEADER.size
+        self._slots_offset = self._jwks_offset + jwks_size
+        self._stats = CacheStats()
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            check_private(path, os.fstat(self._fd))
+            size = self._slots_offset + slots * slot_size
+            with self._lock():
+                self._init_file(size)
+            self._mm = mmap.mmap(self._fd, size)
+        except BaseException:
+            os.close(self._fd)
+            raise
+
+    def _init_file(self, size: int) -> None:
+        namespace = hashlib.blake2b(self.namespace.encode(), digest_size=16).digest()
+        header = _HEADER.pack(MAGIC, self.slots, self.slot_size, self.jwks_size, namespace)
+        if os.fstat(self._fd).st_size == 0:
+            os.ftruncate(self._fd, size)
+            os.pwrite(self._fd, header, 0)
+            return
+        stored = os.pread(self._fd, _HEADER.size, 0)
+        if stored[:_LAYOUT_SIZE] != header[:_LAYOUT_SIZE]:
+            raise ValueError(
+                f"Shared cache file {self.path} was created with a different layout; "
+                "delete it or use matching settings in all workers"
+            )
+        if stored != header:
+            raise ValueError(
+                f"Shared cache file {self.path} belongs to an app with a different realm, "
+                "audience or claim rules; give each app its own path"
+            )
+
+    @contextmanager
+    def _lock(self) -> Iterator[None]:
+        if fcntl is None:
+            yield
+            return
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _slot_offset(self, key: bytes) -> int:
+        index = int.from_bytes(key[:8], "little") % self.slots
+        return self._slots_offset + index * self.slot_size
+
+    # -------------------------------------------------------------------------
+    # Verified tokens
+    # -------------------------------------------------------------------------
+
+    def get(self, token: str) -> TokenPayload | None:
+        """Return the cached payload for a token, or None on a miss."""
+        key = hashlib.sha256(token.encode()).digest()
+        offset = self._slot_offset(key)
+        stored_key, expires_at, length, checksum = _SLOT_HEADER.unpack_from(self._mm, offset)
+
+        if stored_key != key or length > self.slot_size - _SLOT_HEADER.size:
+            self._stats.misses += 1
+            return None
+        if expires_at <= time.time():
+            self._stats.expirations += 1
+            self._stats.misses += 1
+            return None
+
+        start = offset + _SLOT_HEADER.size
+        data = self._mm[start:start + length]
+        if _checksum(key, struct.pack("<d", expires_at), data) != checksum:
+            self._stats.misses += 1
+            return None
+
+        try:
+            payload = TokenPayload.model_validate_json(data)
+        except ValidationError:
+            self._stats.misses += 1
+            return None
+        self._stats.hits += 1
+        return payload
+
+    def set(self, token: str, payload: TokenPayload, exp: float | None = None) -> None:
+        """
+        Cache a verified payload until ``exp`` or ``max_ttl``, whichever is first.
+
+        Payloads larger than a slot are not cached.
+        """
+        expires_at = time.time() + self.max_ttl
+        if exp is not None:
+            expires_at = min(expires_at, exp)
+
+        data = payload.model_dump_json().encode()
+        if len(data) > self.slot_size - _SLOT_HEADER.size:
+            return
+
+        key = hashlib.sha256(token.encode()).digest()
+        offset = self._slot_offset(key)
+        checksum = _checksum(key, struct.pack("<d", expires_at), data)
+
+        with self._lock():
+            stored_key, stored_expires_at, _, _ = _SLOT_HEADER.unpack_from(self._mm, offset)
+            if stored_key not in (key, _EMPTY_KEY) and stored_expires_at > time.time():
+                self._stats.evictions += 1
+            self._mm[offset + _SLOT_HEADER.size:offset + _SLOT_HEADER.size + len(data)] = data
+            _SLOT_HEADER.pack_into(self._mm, offset, key, expires_at, len(data), checksum)
+
+    def clear(self) -> None:
+        """Remove all token entries for every worker (counters are kept)."""
+        with self._lock():
+            self._mm[self._slots_offset:] = bytes(self.slots * self.slot_size)
+
+    @property
+    def stats(self) -> CacheStats:
+        """Return a snapshot of this process's counters and the shared size."""
+        return CacheStats(
+            hits=self._stats.hits,
+            misses=self._stats.misses,
+            evictions=self._stats.evictions,
+            expirations=self._stats.expirations,
+            size=len(self),
+        )
+
+    def __len__(self) -> int:
+        now = time.time()
+        count = 0
+        for index in range(self.slots):
+            key, expires_at, _, _ = _SLOT_HEADER.unpack_from(self._mm, self._slots_offset + index * self.slot_size)
+            if key != _EMPTY_KEY and expires_at > now:
+                count += 1
+        return count
+
+    # -------------------------------------------------------------------------
+    # JWKS
+    # -------------------------------------------------------------------------
+
+    def get_jwks(self, newer_than: float = 0.0) -> tuple[dict, float] | None:
+        """
+        Return the shared JWKS and the wall-clock time it was stored.
+
+        Returns None without reading the document if it was stored at or
+        before ``newer_than``.
+        """
+        updated_at, length, checksum = _JWKS_HEADER.unpack_from(self._mm, self._jwks_offset)
+        if length == 0 or length > self.jwks_size - _JWKS_HEADER.size or updated_at <= newer_than:
+            return None
+
+        start = self._jwks_offset + _JWKS_HEADER.size
+        data = self._mm[start:start + length]
+        if _checksum(struct.pack("<d", updated_at), data) != checksum:
+            return None
+        try:
+            return json.loads(data), updated_at
+        except ValueError:
+            return None
+
+    def set_jwks(self, jwks: dict, updated_at: float | None = None) -> None:
+        """Store a JWKS for all workers. Documents larger than the region are skipped."""
+        data = json.dumps(jwks, separators=(",", ":")).encode()
+        if len(data) > self.jwks_size - _JWKS_HEADER.size:
+            return
+
+        updated_at = updated_at or time.time()
+        checksum = _checksum(struct.pack("<d", updated_at), data)
+        start = self._jwks_offset + _JWKS_HEADER.size
+        with self._lock():
+            self._mm[start:start + len(data)] = data
+            _JWKS_HEADER.pack_into(self._mm, self._jwks_offset, updated_at, len(data), checksum)
+
+    def close(self) -> None:
+        """Unmap and close the file."""
+        self._mm.close()
+        os.close(self._fd)
@@ -0,0 +1,47 @@
+"""
+Coalescing of concurrent async calls.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Run at most one call per key at a time.
+
+    Callers that arrive while a call for the same key is in flight wait for
+    that call and receive its result (or exception) instead of starting
+    their own. The call runs in its own task, so a cancelled waiter does
+    not cancel the call for everyone else.
+
+    Usage:
+        flights = SingleFlight()
+        jwks = await flights.do("jwks", fetch_jwks)
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Await ``fn()``, joining an in-flight call for ``key`` if there is one."""
+        task = self._calls.get(key)
+        if task is None or task.done():
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        return await asyncio.shield(task)
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Check if a call for ``key`` is currently running."""
+        task = self._calls.get(key)
+        return task is not None and not task.done()
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception as retrieved in case every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
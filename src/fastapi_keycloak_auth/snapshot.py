@@ -0,0 +1,140 @@
+"""
+File-backed snapshot of the discovery document and JWKS.
+
+Lets freshly started workers verify tokens without a round trip to
+Keycloak. The snapshot is written atomically after every successful JWKS
+fetch and read by KeycloakClient.warmup().
+"""
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from base64 import urlsafe_b64encode
+from dataclasses import dataclass
+
+from pydantic import ValidationError
+
+from .cache import check_private
+from .models import OpenIdConfiguration
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+# Required members per key type for RFC 7638 thumbprints
+_THUMBPRINT_MEMBERS = {
+    "RSA": ("e", "kty", "n"),
+    "EC": ("crv", "kty", "x", "y"),
+    "OKP": ("crv", "kty", "x"),
+}
+
+
+def jwk_thumbprint(key: dict) -> str:
+    """
+    Return the RFC 7638 SHA-256 thumbprint of a public JWK.
+
+    Raises:
+        ValueError: If the key type is unsupported or members are missing
+    """
+    members = _THUMBPRINT_MEMBERS.get(key.get("kty"))
+    if members is None:
+        raise ValueError(f"Unsupported key type: {key.get('kty')}")
+    canonical = json.dumps({m: key[m] for m in members}, separators=(",", ":"), sort_keys=True)
+    digest = hashlib.sha256(canonical.encode()).digest()
+    return urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+def jwks_fingerprints(jwks: dict) -> dict[str, str]:
+    """Return ``kid -> thumbprint`` for all keys with a supported key type."""
+    fingerprints = {}
+    for key in jwks.get("keys", []):
+        try:
+            fingerprints[key.get("kid", "")] = jwk_thumbprint(key)
+        except (KeyError, ValueError):
+            continue
+    return fingerprints
+
+
+@dataclass
+class Snapshot:
+    """Discovery document and JWKS loaded from disk."""
+    openid_configuration: OpenIdConfiguration
+    jwks: dict
+    created_at: float
+
+
+class SnapshotStore:
+    """
+    Read and write snapshots at a file path.
+
+    A snapshot is only loaded if it is younger than ``ttl`` seconds, was
+    written for the same issuer and its key fingerprints still match the
+    stored keys. Anything else is treated as a missing snapshot.
+    """
+
+    def __init__(self, path: str, ttl: float = 3600.0):
+        self.path = path
+        self.ttl = ttl
+
+    def load(self, issuer: str) -> Snapshot | None:
+        """Return the snapshot for ``issuer``, or None if missing, stale or invalid."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                check_private(self.path, os.fstat(f.fileno()))
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable snapshot {self.path}: {e}")
+            return None
+
+        try:
+            if data["version"] != SNAPSHOT_VERSION or data["issuer"] != issuer:
+                return None
+            if time.time() - data["created_at"] > self.ttl:
+                return None
+            if jwks_fingerprints(data["jwks"]) != data["fingerprints"]:
+                logger.warning(f"Ignoring snapshot {self.path}: key fingerprints do not match")
+                return None
+            return Snapshot(
+                openid_configuration=OpenIdConfiguration(**data["openid_configuration"]),
+                jwks=data["jwks"],
+                created_at=data["created_at"],
+            )
+        except (KeyError, TypeError, ValidationError) as e:
+            logger.warning(f"Ignoring malformed snapshot {self.path}: {e}")
+            return None
+
+    def save(self, issuer: str, openid_configuration: OpenIdConfiguration, jwks: dict) -> None:
+        """
+        Write a snapshot atomically.
+
+        The data is written to a temporary file in the same directory and
+        moved into place, so concurrent readers never see a partial file.
+        """
+        data = {
+            "version": SNAPSHOT_VERSION,
+            "issuer": issuer,
+            "created_at": time.time(),
+            "openid_configuration": openid_configuration.model_dump(),
+            "jwks": jwks,
+            "fingerprints": jwks_fingerprints(jwks),
+        }
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".keycloak-snapshot-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+            raise
+
@@ -0,0 +1,210 @@
+"""
+In-process stand-in for a Keycloak realm, for tests and load tests.
+
+FakeKeycloak is an ASGI app serving the discovery document, JWKS,
+authorization, token, userinfo and end-session endpoints of one realm.
+Tokens are real RS256 JWTs signed with a key generated at startup, so
+KeycloakClient verifies them exactly like tokens from Keycloak.
+Requires the ``cryptography`` package.
+
+Usage:
+    fake = FakeKeycloak(settings)
+    client = KeycloakClient(settings, transport=httpx.ASGITransport(app=fake))
+
+    # Log in without a browser: returns a code for /auth/callback
+    code = fake.issue_code("alice")
+"""
+
+import secrets
+import time
+from base64 import urlsafe_b64encode
+from collections import Counter
+from urllib.parse import parse_qs, urlencode
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, RedirectResponse, Response
+from starlette.routing import Route
+
+from .config import KeycloakSettings
+
+
+def _b64(value: int) -> str:
+    data = value.to_bytes((value.bit_length() + 7) // 8, "big")
+    return urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+class FakeKeycloak:
+    """
+    ASGI app imitating the OpenID Connect endpoints of a Keycloak realm.
+
+    Users are logged in without a login form: the authorization endpoint
+    immediately redirects back with a code for the user given in
+    ``login_hint`` (or the first user). Requests per endpoint are counted
+    in ``calls``.
+    """
+
+    def __init__(
+        self,
+        settings: KeycloakSettings,
+        users: dict[str, dict] | None = None,
+        access_token_lifespan: int = 300,
+        refresh_token_lifespan: int = 1800,
+        kid: str = "fake-keycloak-key",
+    ):
+        self.settings = settings
+        self.users = users or {"test-user": {"email": "test-user@example.local", "roles": ["user"]}}
+        self.access_token_lifespan = access_token_lifespan
+        self.refresh_token_lifespan = refresh_token_lifespan
+        self.kid = kid
+        self.calls: Counter[str] = Counter()
+
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        numbers = private_key.public_key().public_numbers()
+        private_pem = private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        )
+        self._signing_key = jwk.construct(private_pem, "RS256")
+        self.jwks = {
+            "keys": [{"kty": "RSA", "use": "sig", "alg": "RS256", "kid": kid, "n": _b64(numbers.n), "e": _b64(numbers.e)}],
+        }
+
+        # code -> username, refresh token -> username, access token -> claims
+        self._codes: dict[str, str] = {}
+        self._refresh_tokens: dict[str, str] = {}
+        self._access_tokens: dict[str, dict] = {}
+
+        base = f"/realms/{settings.realm}/protocol/openid-connect"
+        self._app = Starlette(routes=[
+            Route(f"/realms/{settings.realm}/.well-known/openid-configuration", self._discovery),
+            Route(f"{base}/certs", self._certs),
+            Route(f"{base}/auth", self._authorize),
+            Route(f"{base}/token", self._token, methods=["POST"]),
+            Route(f"{base}/userinfo", self._userinfo, methods=["GET", "POST"]),
+            Route(f"{base}/logout", self._logout),
+        ])
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self._app(scope, receive, send)
+
+    @property
+    def openid_configuration(self) -> dict:
+        """The discovery document served by this realm."""
+        base = f"{self.settings.issuer}/protocol/openid-connect"
+        return {
+            "issuer": self.settings.issuer,
+            "authorization_endpoint": f"{base}/auth",
+            "token_endpoint": f"{base}/token",
+            "userinfo_endpoint": f"{base}/userinfo",
+            "jwks_uri": f"{base}/certs",
+            "end_session_endpoint": f"{base}/logout",
+        }
+
+    def issue_code(self, username: str | None = None) -> str:
+        """Return a single-use authorization code for a user."""
+        username = username or next(iter(self.users))
+        if username not in self.users:
+            raise KeyError(f"Unknown user: {username}")
+        code = secrets.token_urlsafe(16)
+        self._codes[code] = username
+        return code
+
+    def issue_access_token(self, username: str | None = None) -> str:
+        """Return a signed access token for a user."""
+        username = username or next(iter(self.users))
+        user = self.users[username]
+        now = int(time.time())
+        claims = {
+            "sub": user.get("sub", f"{username}-id"),
+            "preferred_username": username,
+            "email": user.get("email"),
+            "email_verified": True,
+            "iss": self.settings.issuer,
+            "aud": self.settings.audience,
+            "azp": self.settings.client_id,
+            "iat": now,
+            "exp": now + self.access_token_lifespan,
+            "realm_access": {"roles": list(user.get("roles", []))},
+        }
+        token = jwt.encode(claims, self._signing_key, algorithm="RS256", headers={"kid": self.kid})
+        self._access_tokens[token] = claims
+        return token
+
+    def _token_response(self, username: str) -> dict:
+        refresh_token = secrets.token_urlsafe(32)
+        self._refresh_tokens[refresh_token] = username
+        return {
+            "access_token": self.issue_access_token(username),
+            "refresh_token": refresh_token,
+            "token_type": "Bearer",
+            "expires_in": self.access_token_lifespan,
+            "refresh_expires_in": self.refresh_token_lifespan,
+        }
+
+    # -------------------------------------------------------------------------
+    # Endpoints
+    # -------------------------------------------------------------------------
+
+    async def _discovery(self, request: Request) -> Response:
+        self.calls["discovery"] += 1
+        return JSONResponse(self.openid_configuration)
+
+    async def _certs(self, request: Request) -> Response:
+        self.calls["jwks"] += 1
+        return JSONResponse(self.jwks)
+
+    async def _authorize(self, request: Request) -> Response:
+        self.calls["authorize"] += 1
+        params = request.query_params
+        if params.get("client_id") != self.settings.client_id or "redirect_uri" not in params:
+            return JSONResponse({"error": "invalid_request"}, status_code=400)
+        try:
+            code = self.issue_code(params.get("login_hint"))
+        except KeyError:
+            return JSONResponse({"error": "access_denied"}, status_code=400)
+
+        query = {"code": code}
+        if "state" in params:
+            query["state"] = params["state"]
+        return RedirectResponse(f"{params['redirect_uri']}?{urlencode(query)}", status_code=302)
+
+    async def _token(self, request: Request) -> Response:
+        self.calls["token"] += 1
+        form = {key: values[0] for key, values in parse_qs((await request.body()).decode()).items()}
+        if form.get("client_id") != self.settings.client_id or form.get("client_secret") != self.settings.client_secret:
+            return JSONResponse({"error": "unauthorized_client"}, status_code=401)
+
+        grant_type = form.get("grant_type")
+        if grant_type == "authorization_code":
+            username = self._codes.pop(form.get("code", ""), None)
+        elif grant_type == "refresh_token":
+            # Refresh tokens are rotated: each one can be used once
+            username = self._refresh_tokens.pop(form.get("refresh_token", ""), None)
+        else:
+            return JSONResponse({"error": "unsupported_grant_type"}, status_code=400)
+
+        if username is None:
+            return JSONResponse({"error": "invalid_grant"}, status_code=400)
+        return JSONResponse(self._token_response(username))
+
+    async def _userinfo(self, request: Request) -> Response:
+        self.calls["userinfo"] += 1
+        token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        claims = self._access_tokens.get(token)
+        if claims is None or claims["exp"] <= time.time():
+            return JSONResponse({"error": "invalid_token"}, status_code=401)
+        return JSONResponse({
+            key: claims[key] for key in ("sub", "preferred_username", "email", "email_verified")
+        })
+
+    async def _logout(self, request: Request) -> Response:
+        self.calls["end_session"] += 1
+        redirect_uri = request.query_params.get("post_logout_redirect_uri")
+        if redirect_uri is None:
+            return Response(status_code=204)
+        return RedirectResponse(redirect_uri, status_code=302)
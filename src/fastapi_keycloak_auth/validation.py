@@ -0,0 +1,148 @@
+"""
+Token header and claim validation.
+
+TokenValidator is built once per KeycloakClient from the settings: the
+issuer, audiences, authorized parties (azp), allowed algorithms and
+required claims are parsed into frozen sets up front, so each token is
+checked with set lookups instead of re-parsing the settings. A required
+claim written as ``name=value`` must also have that exact value.
+
+Usage:
+    KEYCLOAK_AUDIENCE=account,my-api
+    KEYCLOAK_AUTHORIZED_PARTIES=my-frontend
+    KEYCLOAK_REQUIRED_CLAIMS=azp typ=Bearer
+    KEYCLOAK_TOKEN_LEEWAY=5
+"""
+
+import hashlib
+import json
+from collections.abc import Iterable, Mapping
+
+from jose.exceptions import JWTClaimsError, JWTError
+
+from .config import KeycloakSettings
+from .jwt_backends import validate_claims
+
+
+def _split(value: str | None) -> frozenset[str]:
+    """Split a comma or space separated setting into a set."""
+    return frozenset((value or "").replace(",", " ").split())
+
+
+def _split_claims(value: str | None) -> tuple[frozenset[str], dict[str, str]]:
+    """Split the required claims setting into claim names and expected ``name=value`` values."""
+    names = set()
+    values = {}
+    for entry in _split(value):
+        name, sep, expected = entry.partition("=")
+        names.add(name)
+        if sep:
+            values[name] = expected
+    return frozenset(names), values
+
+
+class TokenValidator:
+    """
+    Compiled header and claim checks for one realm and client.
+
+    A token's ``aud`` must contain one of ``audiences`` (tokens without
+    ``aud`` are accepted, as Keycloak omits it for some clients). If
+    ``authorized_parties`` is set, ``azp`` must be one of them. Claims in
+    ``claim_values`` must be present with exactly the given string value.
+    """
+
+    def __init__(
+        self,
+        issuer: str,
+        audiences: Iterable[str],
+        algorithms: Iterable[str],
+        authorized_parties: Iterable[str] = (),
+        required_claims: Iterable[str] = (),
+        leeway: float = 0.0,
+        claim_values: Mapping[str, str] | None = None,
+    ):
+        self.issuer = issuer
+        self.audiences = frozenset(audiences)
+        self.algorithms = frozenset(algorithms)
+        self.authorized_parties = frozenset(authorized_parties)
+        self.claim_values = dict(claim_values or {})
+        self.required_claims = frozenset(required_claims) | self.claim_values.keys()
+        self.leeway = leeway
+        self.fingerprint = self._fingerprint()
+
+    def _fingerprint(self) -> str:
+        """
+        Short hash of every check that decides whether a token is accepted.
+
+        Cached verification results are namespaced by it, so clients with
+        a different issuer, audience or claim rules never share them.
+        """
+        checks = [
+            self.issuer,
+            sorted(self.audiences),
+            sorted(self.algorithms),
+            sorted(self.authorized_parties),
+            sorted(self.required_claims),
+            sorted(self.claim_values.items()),
+        ]
+        return hashlib.sha256(json.dumps(checks).encode()).hexdigest()[:16]
+
+    @classmethod
+    def from_settings(cls, settings: KeycloakSettings) -> "TokenValidator":
+        """Build a validator from the client settings."""
+        # The full audience setting is accepted as well as each comma separated part
+        audiences = {settings.audience, *(a.strip() for a in settings.audience.split(","))}
+        required_claims, claim_values = _split_claims(settings.required_claims)
+        return cls(
+            issuer=settings.issuer,
+            audiences=audiences,
+            algorithms=settings.allowed_algorithms,
+            authorized_parties=_split(settings.authorized_parties),
+            required_claims=required_claims,
+            leeway=settings.token_leeway,
+            claim_values=claim_values,
+        )
+
+    def check_header(self, header: dict) -> None:
+        """
+        Check the JOSE header of a token.
+
+        Raises:
+            JWTError: If the key ID is not a string or the algorithm is not allowed
+        """
+        kid = header.get("kid")
+        if kid is not None and not isinstance(kid, str):
+            raise JWTError("Invalid key ID in token header")
+        alg = header.get("alg")
+        if not isinstance(alg, str) or alg not in self.algorithms:
+            raise JWTError(f"Token algorithm {alg} is not allowed")
+
+    def validate(self, claims: dict) -> None:
+        """
+        Check the claims of a token.
+
+        Raises:
+            JWTError: If a claim is missing or invalid (ExpiredSignatureError
+                if expired)
+        """
+        missing = self.required_claims.difference(claims)
+        if missing:
+            raise JWTClaimsError(f"Missing required claims: {', '.join(sorted(missing))}")
+        for name, expected in self.claim_values.items():
+            value = claims[name]
+            if not isinstance(value, str) or value != expected:
+                raise JWTClaimsError(f"Invalid {name} claim: {value}")
+
+        validate_claims(claims, self.issuer, self.leeway)
+
+        aud = claims.get("aud")
+        if aud:
+            if isinstance(aud, str):
+                aud = [aud]
+            if not isinstance(aud, list) or self.audiences.isdisjoint(a for a in aud if isinstance(a, str)):
+                raise JWTError(f"Invalid audience: {aud}")
+
+        if self.authorized_parties:
+            azp = claims.get("azp")
+            if not isinstance(azp, str) or azp not in self.authorized_parties:
+                raise JWTClaimsError(f"Invalid authorized party: {azp}")
@@ -0,0 +1,95 @@
+"""Smoke tests for the verification benchmark."""
+
+import json
+
+from benchmarks import bench_auth
+
+
+def _report(*results: tuple[str, float]) -> dict:
+    return {"results": [{"scenario": name, "ops_per_sec": ops} for name, ops in results]}
+
+
+class TestRun:
+
+    def test_writes_json_report_for_each_scenario(self, tmp_path):
+        # Arrange
+        output = tmp_path / "results.json"
+
+        # Act
+        exit_code = bench_auth.main([
+            "--algorithms", "RS256",
+            "--token-sizes", "small",
+            "--roles", "1",
+            "--concurrency", "1", "4",
+            "--iterations", "20",
+            "--warmup", "2",
+            "--distinct-tokens", "5",
+            "--output", str(output),
+            "--quiet",
+        ])
+
+        # Assert
+        report = json.loads(output.read_text())
+        assert exit_code == 0
+        assert report["version"] == bench_auth.RESULTS_VERSION
+        assert len(report["results"]) == len(bench_auth.TARGETS) * len(bench_auth.JWT_BACKENDS) * 2 * 2
+        assert len(report["speedups"]) == len(report["results"]) // 2
+        for result in report["results"]:
+            assert result["iterations"] == 20
+            assert result["ops_per_sec"] > 0
+            assert result["p50_us"] <= result["p99_us"] <= result["max_us"]
+
+
+class TestSpeedups:
+
+    def test_compares_backend_with_matching_jose_scenario(self):
+        # Arrange
+        common = {"target": "verify_token", "algorithm": "RS256", "token_size": "small", "roles": 1, "cache": False, "concurrency": 1}
+        results = [
+            {**common, "scenario": "jose", "jwt_backend": "jose", "ops_per_sec": 1000.0, "p50_us": 100.0},
+            {**common, "scenario": "crypto", "jwt_backend": "cryptography", "ops_per_sec": 3000.0, "p50_us": 25.0},
+        ]
+
+        # Act
+        comparisons = bench_auth.speedups(results)
+
+        # Assert
+        assert comparisons == [{"scenario": "crypto", "baseline": "jose", "speedup": 3.0, "p50_speedup": 4.0}]
+
+
+class TestCompare:
+
+    def test_reports_throughput_drop_above_threshold(self):
+        # Arrange
+        baseline = _report(("a", 1000.0), ("b", 1000.0))
+        report = _report(("a", 850.0), ("b", 950.0))
+
+        # Act
+        regressions = bench_auth.compare(report, baseline, max_regression=0.1)
+
+        # Assert
+        assert len(regressions) == 1
+        assert regressions[0].startswith("a:")
+
+    def test_ignores_scenarios_missing_from_baseline(self):
+        # Act
+        regressions = bench_auth.compare(_report(("new", 1.0)), _report(), max_regression=0.1)
+
+        # Assert
+        assert regressions == []
+
+
+class TestScenarios:
+
+    def test_skips_eddsa_for_jose_backend(self):
+        # Arrange
+        args = bench_auth.parse_args(["--targets", "verify_token", "--roles", "1", "--token-sizes", "small", "--cache", "off", "--concurrency", "1"])
+
+        # Act
+        scenarios = bench_auth.build_scenarios(args)
+
+        # Assert
+        combinations = {(s.jwt_backend, s.algorithm) for s in scenarios}
+        assert ("jose", "EdDSA") not in combinations
+        assert ("cryptography", "EdDSA") in combinations
+        assert ("jose", "ES256") in combinations
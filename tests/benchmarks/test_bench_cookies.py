@@ -0,0 +1,44 @@
+"""Smoke tests for the cookie size benchmark."""
+
+import json
+
+from benchmarks import bench_cookies
+
+
+class TestRun:
+
+    def test_writes_json_report_for_each_token(self, tmp_path):
+        # Arrange
+        output = tmp_path / "cookies.json"
+
+        # Act
+        exit_code = bench_cookies.main([
+            "--roles", "1", "400",
+            "--groups", "0",
+            "--iterations", "5",
+            "--output", str(output),
+            "--quiet",
+        ])
+
+        # Assert
+        report = json.loads(output.read_text())
+        assert exit_code == 0
+        assert report["version"] == bench_cookies.RESULTS_VERSION
+        small, large = report["results"]
+        assert large["plain_over_limit"]
+        assert large["compressed_cookies"] == 1
+        assert 0 < small["saving"] < large["saving"]
+
+    def test_chunks_when_compressed_token_exceeds_chunk_size(self, tmp_path):
+        # Arrange
+        output = tmp_path / "cookies.json"
+
+        # Act
+        bench_cookies.main([
+            "--roles", "400", "--groups", "0", "--chunk-size", "500",
+            "--iterations", "1", "--output", str(output), "--quiet",
+        ])
+
+        # Assert
+        (result,) = json.loads(output.read_text())["results"]
+        assert result["compressed_cookies"] > 2
@@ -0,0 +1,34 @@
+"""Smoke tests for the end-to-end load driver."""
+
+import json
+
+from benchmarks import load_auth
+
+
+class TestRun:
+
+    def test_runs_full_cycle_without_errors(self, tmp_path):
+        # Arrange
+        output = tmp_path / "load.json"
+
+        # Act
+        load_auth.main(["--users", "2", "--cycles", "3", "--warmup", "1", "--output", str(output), "--quiet"])
+
+        # Assert
+        level = json.loads(output.read_text())["levels"][0]
+        assert level["errors"] == {}
+        assert level["cycles"] == 6
+        assert all(level["steps"][step]["count"] == 6 for step in load_auth.STEPS)
+        assert level["upstream_calls"]["token"] == 12
+
+
+class TestHistogram:
+
+    def test_assigns_values_to_first_matching_bucket(self):
+        # Act
+        histogram = load_auth._histogram([0.1, 0.7, 5000.0])
+
+        # Assert
+        assert histogram["le_0.5ms"] == 1
+        assert histogram["le_1ms"] == 1
+        assert histogram["inf"] == 1
@@ -0,0 +1,121 @@
+"""Tests for FileCacheBackend."""
+
+import os
+import time
+
+import pytest
+
+from fastapi_keycloak_auth.cache_backends import (
+    CacheBackend,
+    FileCacheBackend,
+    _EXPIRY,
+    create_cache_backend,
+)
+
+
+@pytest.fixture
+def backend(tmp_path) -> FileCacheBackend:
+    return FileCacheBackend(str(tmp_path / "cache"))
+
+
+class TestFileCacheBackend:
+
+    def test_implements_protocol(self, backend):
+        # Assert
+        assert isinstance(backend, CacheBackend)
+
+    @pytest.mark.asyncio
+    async def test_set_and_get(self, backend):
+        # Arrange
+        await backend.set("key", b"value", ttl=60)
+
+        # Act
+        result = await backend.get("key")
+
+        # Assert
+        assert result == b"value"
+
+    @pytest.mark.asyncio
+    async def test_file_names_do_not_contain_keys(self, backend):
+        # Act
+        await backend.set("session:secret", b"value", ttl=60)
+
+        # Assert
+        assert all("secret" not in name for name in os.listdir(backend.directory))
+
+    @pytest.mark.asyncio
+    async def test_expired_key_returns_none_and_is_removed(self, backend):
+        # Arrange
+        await backend.set("key", b"value", ttl=60)
+        with open(backend._path("key"), "r+b") as f:
+            f.write(_EXPIRY.pack(time.time() - 1))
+
+        # Act & Assert
+        assert await backend.get("key") is None
+        assert not os.path.exists(backend._path("key"))
+
+    @pytest.mark.asyncio
+    async def test_non_positive_ttl_is_not_stored(self, backend):
+        # Act
+        await backend.set("key", b"value", ttl=0)
+
+        # Assert
+        assert await backend.get("key") is None
+
+    @pytest.mark.asyncio
+    async def test_get_many_and_delete(self, backend):
+        # Arrange
+        await backend.set("a", b"1", ttl=60)
+        await backend.set("b", b"2", ttl=60)
+
+        # Act
+        await backend.delete("a")
+
+        # Assert
+        assert await backend.get_many(["a", "b", "c"]) == [None, b"2", None]
+
+    @pytest.mark.asyncio
+    async def test_sweep_removes_expired_files(self, backend):
+        # Arrange
+        await backend.set("live", b"1", ttl=60)
+        await backend.set("dead", b"2", ttl=60)
+        with open(backend._path("dead"), "r+b") as f:
+            f.write(_EXPIRY.pack(time.time() - 1))
+
+        # Act
+        removed = backend.sweep()
+
+        # Assert
+        assert removed == 1
+        assert await backend.get("live") == b"1"
+
+    @pytest.mark.asyncio
+    async def test_shared_between_instances(self, tmp_path):
+        # Arrange
+        writer = FileCacheBackend(str(tmp_path), key_prefix="app:")
+        reader = FileCacheBackend(str(tmp_path), key_prefix="app:")
+
+        # Act
+        await writer.set("key", b"value", ttl=60)
+
+        # Assert
+        assert await reader.get("key") == b"value"
+
+    @pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+    def test_shared_directory_is_refused(self, tmp_path):
+        # Arrange
+        directory = tmp_path / "cache"
+        directory.mkdir(mode=0o755)
+        directory.chmod(0o755)
+
+        # Act & Assert
+        with pytest.raises(PermissionError):
+            FileCacheBackend(str(directory))
+
+    def test_created_from_url(self, tmp_path):
+        # Act
+        backend = create_cache_backend(f"file://{tmp_path}/sessions")
+
+        # Assert
+        assert isinstance(backend, FileCacheBackend)
+        assert backend.directory == f"{tmp_path}/sessions"
@@ -0,0 +1,81 @@
+"""Tests for MemoryCacheBackend."""
+
+import pytest
+
+from fastapi_keycloak_auth.cache_backends import CacheBackend, MemoryCacheBackend
+
+
+class TestMemoryCacheBackend:
+
+    def test_implements_protocol(self):
+        # Assert
+        assert isinstance(MemoryCacheBackend(), CacheBackend)
+
+    @pytest.mark.asyncio
+    async def test_set_and_get(self):
+        # Arrange
+        backend = MemoryCacheBackend()
+        await backend.set("key", b"value", ttl=60)
+
+        # Act
+        result = await backend.get("key")
+
+        # Assert
+        assert result == b"value"
+
+    @pytest.mark.asyncio
+    async def test_expired_key_returns_none(self):
+        # Arrange
+        backend = MemoryCacheBackend()
+        backend._entries["key"] = (b"value", 0.0)
+
+        # Act & Assert
+        assert await backend.get("key") is None
+
+    @pytest.mark.asyncio
+    async def test_non_positive_ttl_is_not_stored(self):
+        # Arrange
+        backend = MemoryCacheBackend()
+
+        # Act
+        await backend.set("key", b"value", ttl=0)
+
+        # Assert
+        assert await backend.get("key") is None
+
+    @pytest.mark.asyncio
+    async def test_get_many_keeps_order(self):
+        # Arrange
+        backend = MemoryCacheBackend()
+        await backend.set("a", b"1", ttl=60)
+        await backend.set("c", b"3", ttl=60)
+
+        # Act
+        result = await backend.get_many(["a", "b", "c"])
+
+        # Assert
+        assert result == [b"1", None, b"3"]
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used(self):
+        # Arrange
+        backend = MemoryCacheBackend(max_size=1)
+        await backend.set("a", b"1", ttl=60)
+
+        # Act
+        await backend.set("b", b"2", ttl=60)
+
+        # Assert
+        assert await backend.get("a") is None
+
+    @pytest.mark.asyncio
+    async def test_delete(self):
+        # Arrange
+        backend = MemoryCacheBackend()
+        await backend.set("key", b"value", ttl=60)
+
+        # Act
+        await backend.delete("key")
+
+        # Assert
+        assert await backend.get("key") is None
@@ -0,0 +1,175 @@
+"""Tests for RedisCacheBackend against a local fake server."""
+
+import pytest
+
+from fastapi_keycloak_auth.cache_backends import (
+    CacheBackend,
+    CacheBackendError,
+    MemoryCacheBackend,
+    RedisCacheBackend,
+    create_cache_backend,
+)
+from tests.fake_redis import FakeRedisServer
+
+
+class TestUrlParsing:
+
+    def test_parses_host_port_db_and_password(self):
+        # Act
+        backend = RedisCacheBackend("redis://:s%40cret@cache.local:6380/2")
+
+        # Assert
+        assert (backend.host, backend.port, backend.db, backend.password) == ("cache.local", 6380, 2, "s@cret")
+
+    def test_rejects_unknown_scheme(self):
+        # Act & Assert
+        with pytest.raises(ValueError):
+            RedisCacheBackend("http://cache.local")
+
+    def test_create_cache_backend_selects_implementation(self):
+        # Assert
+        assert isinstance(create_cache_backend("memory://"), MemoryCacheBackend)
+        assert isinstance(create_cache_backend("redis://localhost"), RedisCacheBackend)
+        assert isinstance(RedisCacheBackend(), CacheBackend)
+
+
+class TestCommands:
+
+    @pytest.mark.asyncio
+    async def test_set_and_get(self, fake_redis):
+        # Arrange
+        backend = RedisCacheBackend(fake_redis.url)
+        await backend.set("key", b"value", ttl=60)
+
+        # Act
+        result = await backend.get("key")
+
+        # Assert
+        assert result == b"value"
+        await backend.aclose()
+
+    @pytest.mark.asyncio
+    async def test_ttl_sent_in_milliseconds(self, fake_redis):
+        # Arrange
+        backend = RedisCacheBackend(fake_redis.url)
+
+        # Act
+        await backend.set("key", b"value", ttl=1.5)
+
+        # Assert
+        assert fake_redis.commands[-1] == [b"SET", b"key", b"value", b"PX", b"1500"]
+        await backend.aclose()
+
+    @pytest.mark.asyncio
+    async def test_missing_key_returns_none(self, fake_redis):
+        # Arrange
+        backend = RedisCacheBackend(fake_redis.url)
+
+        # Act & Assert
+        assert await backend.get("missing") is None
+        await backend.aclose()
+
+    @pytest.mark.asyncio
+    async def test_key_prefix_is_applied(self, fake_redis):
+        # Arrange
+        backend = RedisCacheBackend(fake_redis.url, key_prefix="app:")
+
+        # Act
+        await backend.set("key", b"value", ttl=60)
+
+        # Assert
+        assert b"app:key" in fake_redis.data
+        await backend.aclose()
+
+    @pytest.mark.asyncio
+    async def test_delete(self, fake_redis):
+        # Arrange
+        backend = RedisCacheBackend(fake_redis.url)
+        await backend.set("key", b"value", ttl=60)
+
+        # Act
+        await backend.delete("key")
+
+        # Assert
+        assert await backend.get("key") is None
+        await backend.aclose()
+
+    @pytest.mark.asyncio
+    async def test_connection_is_reused(self, fake_redis):
+        # Arrange
+        backend = RedisCacheBackend(fake_redis.url)
+
+        # Act
+        await backend.get("a")
+        await backend.get("b")
+
+        # Assert
+        assert len(backend._idle) == 1
+        await backend.aclose()
+
+
+class TestBatchGet:
+
+    @pytest.mark.asyncio
+    async def test_get_many_returns_values_in_order(self, fake_redis):
+        # Arrange
+        backend = RedisCacheBackend(fake_redis.url)
+        await backend.set("a", b"1", ttl=60)
+        await backend.set("c", b"3", ttl=60)
+
+        # Act
+        result = await backend.get_many(["a", "b", "c"])
+
+        # Assert
+        assert result == [b"1", None, b"3"]
+        await backend.aclose()
+
+    @pytest.mark.asyncio
+    async def test_get_many_is_pipelined(self, fake_redis):
+        # Arrange
+        backend = RedisCacheBackend(fake_redis.url)
+
+        # Act
+        await backend.get_many([f"key-{i}" for i in range(50)])
+
+        # Assert
+        assert fake_redis.pipelined_batches >= 1
+        await backend.aclose()
+
+    @pytest.mark.asyncio
+    async def test_get_many_with_no_keys(self, fake_redis):
+        # Arrange
+        backend = RedisCacheBackend(fake_redis.url)
+
+        # Act & Assert
+        assert await backend.get_many([]) == []
+
+
+class TestAuthentication:
+
+    @pytest.mark.asyncio
+    async def test_authenticates_with_password(self):
+        # Arrange
+        server = FakeRedisServer(password="secret")
+        await server.start()
+        backend = RedisCacheBackend(server.url)
+
+        # Act
+        await backend.set("key", b"value", ttl=60)
+
+        # Assert
+        assert await backend.get("key") == b"value"
+        await backend.aclose()
+        await server.stop()
+
+    @pytest.mark.asyncio
+    async def test_wrong_password_raises(self):
+        # Arrange
+        server = FakeRedisServer(password="secret")
+        await server.start()
+        backend = RedisCacheBackend(f"redis://:wrong@127.0.0.1:{server.port}/0")
+
+        # Act & Assert
+        with pytest.raises(CacheBackendError):
+            await backend.get("key")
+        await server.stop()
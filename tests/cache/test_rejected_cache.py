@@ -0,0 +1,74 @@
+"""Tests for RejectedTokenCache."""
+
+from unittest.mock import patch
+
+from jose import JWTError
+from jose.exceptions import ExpiredSignatureError
+
+from fastapi_keycloak_auth.cache import RejectedTokenCache
+
+
+class TestRejectedTokenCache:
+
+    def test_miss_returns_none(self):
+        # Arrange
+        cache = RejectedTokenCache()
+
+        # Act & Assert
+        assert cache.get("token") is None
+        assert cache.stats.misses == 1
+
+    def test_returns_copy_of_error(self):
+        # Arrange
+        cache = RejectedTokenCache()
+        error = ExpiredSignatureError("Signature has expired.")
+        cache.add("token", error)
+
+        # Act
+        result = cache.get("token")
+
+        # Assert
+        assert isinstance(result, ExpiredSignatureError)
+        assert result is not error
+        assert str(result) == "Signature has expired."
+        assert cache.stats.hits == 1
+
+    def test_entry_expires_after_ttl(self):
+        # Arrange
+        cache = RejectedTokenCache(ttl=10)
+        with patch("fastapi_keycloak_auth.cache.time.monotonic", return_value=100.0):
+            cache.add("token", JWTError("bad"))
+
+        # Act
+        with patch("fastapi_keycloak_auth.cache.time.monotonic", return_value=111.0):
+            result = cache.get("token")
+
+        # Assert
+        assert result is None
+        assert cache.stats.expirations == 1
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used(self):
+        # Arrange
+        cache = RejectedTokenCache(max_size=2)
+        cache.add("a", JWTError("a"))
+        cache.add("b", JWTError("b"))
+        cache.get("a")
+
+        # Act
+        cache.add("c", JWTError("c"))
+
+        # Assert
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.stats.evictions == 1
+
+    def test_raw_token_is_not_stored(self):
+        # Arrange
+        cache = RejectedTokenCache()
+
+        # Act
+        cache.add("secret-token", JWTError("bad"))
+
+        # Assert
+        assert "secret-token" not in cache._entries
@@ -0,0 +1,181 @@
+"""Tests for SharedCache."""
+
+import hashlib
+import os
+import subprocess
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+
+from fastapi_keycloak_auth.shared_cache import SharedCache
+
+
+@pytest.fixture
+def cache_path(tmp_path) -> str:
+    return str(tmp_path / "shared-cache")
+
+
+@pytest.fixture
+def shared_cache(cache_path):
+    cache = SharedCache(cache_path, slots=16, slot_size=1024)
+    yield cache
+    cache.close()
+
+
+class TestTokens:
+
+    def test_roundtrip(self, shared_cache, sample_token_payload):
+        # Arrange
+        shared_cache.set("token", sample_token_payload)
+
+        # Act
+        result = shared_cache.get("token")
+
+        # Assert
+        assert result == sample_token_payload
+        assert shared_cache.stats.hits == 1
+
+    def test_miss_returns_none(self, shared_cache):
+        # Act & Assert
+        assert shared_cache.get("unknown") is None
+        assert shared_cache.stats.misses == 1
+
+    def test_expired_entry_is_miss(self, shared_cache, sample_token_payload):
+        # Arrange
+        shared_cache.set("token", sample_token_payload, exp=time.time() - 1)
+
+        # Act & Assert
+        assert shared_cache.get("token") is None
+        assert shared_cache.stats.expirations == 1
+
+    def test_oversized_payload_is_not_cached(self, cache_path, sample_token_payload):
+        # Arrange
+        cache = SharedCache(cache_path, slots=4, slot_size=128)
+
+        # Act
+        cache.set("token", sample_token_payload)
+
+        # Assert
+        assert cache.get("token") is None
+        cache.close()
+
+    def test_corrupt_entry_is_miss(self, shared_cache, sample_token_payload):
+        # Arrange
+        shared_cache.set("token", sample_token_payload)
+        offset = shared_cache._slot_offset(hashlib.sha256(b"token").digest())
+        shared_cache._mm[offset + 100] ^= 0xFF
+
+        # Act & Assert
+        assert shared_cache.get("token") is None
+
+    def test_colliding_token_evicts_live_entry(self, cache_path, sample_token_payload):
+        # Arrange — a single slot forces a collision
+        cache = SharedCache(cache_path, slots=1, slot_size=1024)
+        cache.set("first", sample_token_payload)
+
+        # Act
+        cache.set("second", sample_token_payload)
+
+        # Assert
+        assert cache.get("first") is None
+        assert cache.get("second") == sample_token_payload
+        assert cache.stats.evictions == 1
+        cache.close()
+
+    def test_clear_removes_entries(self, shared_cache, sample_token_payload):
+        # Arrange
+        shared_cache.set("token", sample_token_payload)
+
+        # Act
+        shared_cache.clear()
+
+        # Assert
+        assert len(shared_cache) == 0
+
+
+class TestSharing:
+
+    def test_entry_visible_to_second_mapping(self, cache_path, shared_cache, sample_token_payload):
+        # Arrange
+        other = SharedCache(cache_path, slots=16, slot_size=1024)
+
+        # Act
+        shared_cache.set("token", sample_token_payload)
+
+        # Assert
+        assert other.get("token") == sample_token_payload
+        other.close()
+
+    def test_entry_visible_to_other_process(self, cache_path, shared_cache, sample_token_payload):
+        # Arrange
+        shared_cache.set("token", sample_token_payload)
+        script = (
+            "import sys; from fastapi_keycloak_auth.shared_cache import SharedCache; "
+            f"cache = SharedCache({cache_path!r}, slots=16, slot_size=1024); "
+            "payload = cache.get('token'); print(payload.sub if payload else '')"
+        )
+
+        # Act
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+
+        # Assert
+        assert result.stdout.strip() == sample_token_payload.sub
+
+    def test_layout_mismatch_raises(self, cache_path, shared_cache):
+        # Act & Assert
+        with pytest.raises(ValueError, match="different layout"):
+            SharedCache(cache_path, slots=32, slot_size=1024)
+
+    def test_namespace_mismatch_raises(self, cache_path, shared_cache):
+        # Act & Assert
+        with pytest.raises(ValueError, match="different realm"):
+            SharedCache(cache_path, slots=16, slot_size=1024, namespace="other-app")
+
+
+class TestPermissions:
+
+    @pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions only")
+    def test_file_created_with_mode_0600(self, cache_path, shared_cache):
+        # Assert
+        assert os.stat(cache_path).st_mode & 0o777 == 0o600
+
+    @pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions only")
+    def test_world_readable_file_is_refused(self, cache_path):
+        # Arrange
+        with open(cache_path, "wb"):
+            pass
+        os.chmod(cache_path, 0o644)
+
+        # Act & Assert
+        with pytest.raises(PermissionError):
+            SharedCache(cache_path)
+
+
+class TestJwks:
+
+    def test_jwks_roundtrip(self, shared_cache, jwks_response):
+        # Arrange
+        shared_cache.set_jwks(jwks_response, updated_at=1234.0)
+
+        # Act
+        jwks, updated_at = shared_cache.get_jwks()
+
+        # Assert
+        assert jwks == jwks_response
+        assert updated_at == 1234.0
+
+    def test_jwks_not_newer_is_not_read(self, shared_cache, jwks_response):
+        # Arrange
+        shared_cache.set_jwks(jwks_response, updated_at=1234.0)
+
+        # Act & Assert
+        with patch("fastapi_keycloak_auth.shared_cache.json.loads") as loads:
+            assert shared_cache.get_jwks(newer_than=1234.0) is None
+        loads.assert_not_called()
+        assert shared_cache.get_jwks(newer_than=1000.0)[1] == 1234.0
+
+    def test_empty_jwks_region_returns_none(self, shared_cache):
+        # Act & Assert
+        assert shared_cache.get_jwks() is None
@@ -0,0 +1,134 @@
+"""Tests for TokenCache."""
+
+import os
+import time
+
+import pytest
+
+from fastapi_keycloak_auth.cache import TokenCache, check_private, token_hash
+
+
+class TestGetSet:
+
+    def test_miss_returns_none(self, sample_token_payload):
+        # Arrange
+        cache = TokenCache()
+
+        # Act
+        result = cache.get("unknown-token")
+
+        # Assert
+        assert result is None
+        assert cache.stats.misses == 1
+
+    def test_hit_returns_cached_payload(self, sample_token_payload):
+        # Arrange
+        cache = TokenCache()
+        cache.set("token", sample_token_payload)
+
+        # Act
+        result = cache.get("token")
+
+        # Assert
+        assert result is sample_token_payload
+        assert cache.stats.hits == 1
+
+    def test_raw_token_is_not_stored(self, sample_token_payload):
+        # Arrange
+        cache = TokenCache()
+
+        # Act
+        cache.set("secret-token", sample_token_payload)
+
+        # Assert
+        assert "secret-token" not in cache._entries
+        assert token_hash("secret-token") in cache._entries
+
+
+class TestExpiry:
+
+    def test_entry_expires_at_token_exp(self, sample_token_payload):
+        # Arrange
+        cache = TokenCache(max_ttl=60)
+        cache.set("token", sample_token_payload, exp=time.time() - 1)
+
+        # Act
+        result = cache.get("token")
+
+        # Assert
+        assert result is None
+        assert cache.stats.expirations == 1
+
+    def test_entry_expires_after_max_ttl(self, sample_token_payload):
+        # Arrange
+        cache = TokenCache(max_ttl=0)
+        cache.set("token", sample_token_payload, exp=time.time() + 300)
+
+        # Act
+        result = cache.get("token")
+
+        # Assert
+        assert result is None
+
+
+class TestEviction:
+
+    def test_evicts_least_recently_used(self, sample_token_payload):
+        # Arrange
+        cache = TokenCache(max_size=2)
+        cache.set("a", sample_token_payload)
+        cache.set("b", sample_token_payload)
+        cache.get("a")
+
+        # Act
+        cache.set("c", sample_token_payload)
+
+        # Assert
+        assert cache.get("b") is None
+        assert cache.get("a") is sample_token_payload
+        assert cache.stats.evictions == 1
+        assert cache.stats.size == 2
+
+    def test_clear_removes_entries(self, sample_token_payload):
+        # Arrange
+        cache = TokenCache()
+        cache.set("token", sample_token_payload)
+
+        # Act
+        cache.clear()
+
+        # Assert
+        assert len(cache) == 0
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+class TestCheckPrivate:
+
+    def test_private_file_and_directory_pass(self, tmp_path):
+        # Arrange
+        path = tmp_path / "cache.bin"
+        path.touch(mode=0o600)
+        path.chmod(0o600)
+        tmp_path.chmod(0o700)
+
+        # Act & Assert
+        check_private(str(path), os.stat(path))
+        check_private(str(tmp_path), os.stat(tmp_path))
+
+    def test_group_readable_file_is_refused(self, tmp_path):
+        # Arrange
+        path = tmp_path / "cache.bin"
+        path.touch()
+        path.chmod(0o640)
+
+        # Act & Assert
+        with pytest.raises(PermissionError, match="mode 0600"):
+            check_private(str(path), os.stat(path))
+
+    def test_shared_directory_is_refused(self, tmp_path):
+        # Arrange
+        tmp_path.chmod(0o755)
+
+        # Act & Assert
+        with pytest.raises(PermissionError, match="mode 0700"):
+            check_private(str(tmp_path), os.stat(tmp_path))
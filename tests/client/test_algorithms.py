@@ -0,0 +1,130 @@
+"""Tests for per-key algorithm binding in KeycloakClient.verify_token()."""
+
+import time
+
+import pytest
+from jose import JWTError, jwt
+
+from fastapi_keycloak_auth.client import KeycloakClient
+from fastapi_keycloak_auth.validation import TokenValidator
+
+
+@pytest.fixture
+def mixed_realm_client(keycloak_settings, rsa_keypair, ec_keypair, ed25519_keypair, openid_configuration):
+    """Client for a realm with RSA, EC and Ed25519 keys, using the cryptography backend."""
+    keycloak_settings.jwt_backend = "cryptography"
+    client = KeycloakClient(keycloak_settings)
+    client._jwks = {"keys": [rsa_keypair["jwk"], ec_keypair["jwk"], ed25519_keypair["jwk"]]}
+    client._jwks_fetched_at = time.monotonic()
+    client._openid_configuration = openid_configuration
+    return client
+
+
+class TestMultiAlgorithmRealm:
+
+    @pytest.mark.asyncio
+    async def test_rs256_token_verifies(self, mixed_realm_client, make_token):
+        # Act
+        result = await mixed_realm_client.verify_token(make_token())
+
+        # Assert
+        assert result.sub == "test-user-id"
+
+    @pytest.mark.asyncio
+    async def test_es256_token_verifies(self, mixed_realm_client, ec_keypair, sign_token):
+        # Arrange
+        token = sign_token(ec_keypair["private_key"], "ES256", "ec-key-id", {"sub": "ec-user"})
+
+        # Act
+        result = await mixed_realm_client.verify_token(token)
+
+        # Assert
+        assert result.sub == "ec-user"
+
+    @pytest.mark.asyncio
+    async def test_eddsa_token_verifies(self, mixed_realm_client, ed25519_keypair, sign_token):
+        # Arrange
+        token = sign_token(ed25519_keypair["private_key"], "EdDSA", "ed-key-id", {"sub": "ed-user"})
+
+        # Act
+        result = await mixed_realm_client.verify_token(token)
+
+        # Assert
+        assert result.sub == "ed-user"
+
+    @pytest.mark.asyncio
+    async def test_es256_token_verifies_with_jose_backend(self, keycloak_settings, ec_keypair, sign_token):
+        # Arrange
+        client = KeycloakClient(keycloak_settings)
+        client._jwks = {"keys": [ec_keypair["jwk"]]}
+        token = sign_token(ec_keypair["private_key"], "ES256", "ec-key-id")
+
+        # Act
+        result = await client.verify_token(token)
+
+        # Assert
+        assert result.sub == "test-user-id"
+
+
+class TestAlgorithmConfusion:
+
+    @pytest.mark.asyncio
+    async def test_token_alg_must_match_key_alg(self, mixed_realm_client, ec_keypair, sign_token):
+        # Arrange - valid ES256 signature, but naming the RSA key
+        token = sign_token(ec_keypair["private_key"], "ES256", "test-key-id")
+
+        # Act & Assert
+        with pytest.raises(JWTError, match="does not match signing key"):
+            await mixed_realm_client.verify_token(token)
+
+    @pytest.mark.asyncio
+    async def test_hmac_token_keyed_with_public_key_is_rejected(self, mixed_realm_client, rsa_keypair, keycloak_settings):
+        # Arrange
+        token = jwt.encode(
+            {"sub": "admin", "iss": keycloak_settings.issuer, "exp": int(time.time()) + 300},
+            rsa_keypair["jwk"]["n"],
+            algorithm="HS256",
+            headers={"kid": "test-key-id"},
+        )
+
+        # Act & Assert
+        with pytest.raises(JWTError):
+            await mixed_realm_client.verify_token(token)
+
+    @pytest.mark.asyncio
+    async def test_none_algorithm_is_rejected(self, mixed_realm_client, make_token):
+        # Arrange
+        _, payload, _ = make_token().split(".")
+        header = "eyJhbGciOiJub25lIiwia2lkIjoidGVzdC1rZXktaWQifQ"  # {"alg":"none","kid":"test-key-id"}
+
+        # Act & Assert
+        with pytest.raises(JWTError):
+            await mixed_realm_client.verify_token(f"{header}.{payload}.")
+
+
+class TestAllowlist:
+
+    @pytest.mark.asyncio
+    async def test_disallowed_algorithm_is_rejected(self, mixed_realm_client, make_token):
+        # Arrange
+        mixed_realm_client.settings.jwt_algorithms = "ES256,EdDSA"
+        mixed_realm_client.validator = TokenValidator.from_settings(mixed_realm_client.settings)
+        mixed_realm_client._signing_keys = None
+
+        # Act & Assert
+        with pytest.raises(JWTError, match="is not allowed"):
+            await mixed_realm_client.verify_token(make_token())
+
+    @pytest.mark.asyncio
+    async def test_allowed_algorithm_still_verifies(self, mixed_realm_client, ec_keypair, sign_token):
+        # Arrange
+        mixed_realm_client.settings.jwt_algorithms = "ES256"
+        mixed_realm_client.validator = TokenValidator.from_settings(mixed_realm_client.settings)
+        mixed_realm_client._signing_keys = None
+        token = sign_token(ec_keypair["private_key"], "ES256", "ec-key-id")
+
+        # Act
+        result = await mixed_realm_client.verify_token(token)
+
+        # Assert
+        assert result.sub == "test-user-id"
@@ -0,0 +1,221 @@
+"""Tests for KeycloakClient with a cache backend."""
+
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from jose import JWTError
+
+from fastapi_keycloak_auth.cache_backends import MemoryCacheBackend, RedisCacheBackend
+from fastapi_keycloak_auth.client import KeycloakClient
+
+
+@pytest.fixture
+def backend() -> MemoryCacheBackend:
+    return MemoryCacheBackend()
+
+
+@pytest.fixture
+def backend_client(keycloak_settings, backend, jwks_response, openid_configuration) -> KeycloakClient:
+    client = KeycloakClient(keycloak_settings, cache_backend=backend)
+    client._jwks = jwks_response
+    client._jwks_fetched_at = time.monotonic()
+    client._openid_configuration = openid_configuration
+    client._http_client = AsyncMock(is_closed=False)
+    return client
+
+
+class TestBackendSelection:
+
+    def test_no_backend_by_default(self, keycloak_client):
+        # Assert
+        assert keycloak_client.cache_backend is None
+
+    def test_backend_created_from_url(self, keycloak_settings):
+        # Arrange
+        keycloak_settings.cache_backend_url = "redis://localhost:6379/0"
+
+        # Act
+        client = KeycloakClient(keycloak_settings)
+
+        # Assert
+        assert isinstance(client.cache_backend, RedisCacheBackend)
+        assert client.cache_backend.key_prefix == "fastapi-keycloak-auth:"
+
+
+class TestVerifiedTokens:
+
+    @pytest.mark.asyncio
+    async def test_verified_token_is_stored_in_backend(self, backend_client, backend, make_token):
+        # Arrange
+        token = make_token()
+
+        # Act
+        await backend_client.verify_token(token)
+
+        # Assert
+        assert await backend.get(backend_client._token_key(token)) is not None
+
+    @pytest.mark.asyncio
+    async def test_token_verified_by_other_pod_skips_signature_check(self, backend_client, backend, keycloak_settings, make_token):
+        # Arrange
+        token = make_token()
+        other_pod = KeycloakClient(keycloak_settings, cache_backend=backend)
+        other_pod._jwks = backend_client._jwks
+        await other_pod.verify_token(token)
+
+        with patch.object(backend_client.jwt_backend, "verify") as decode:
+            # Act
+            result = await backend_client.verify_token(token)
+
+        # Assert
+        decode.assert_not_called()
+        assert result.sub == "test-user-id"
+
+    @pytest.mark.asyncio
+    async def test_ttl_derived_from_token_exp(self, backend_client, backend, make_token):
+        # Arrange
+        backend_client.settings.token_cache_ttl = 3600
+        token = make_token(expires_in=30)
+
+        # Act
+        await backend_client.verify_token(token)
+
+        # Assert
+        _, expires_at = backend._entries[backend_client._token_key(token)]
+        assert expires_at - time.monotonic() <= 31
+
+    @pytest.mark.asyncio
+    async def test_backend_failure_falls_back_to_verification(self, backend_client, make_token):
+        # Arrange
+        backend_client.cache_backend = AsyncMock()
+        backend_client.cache_backend.get.side_effect = ConnectionRefusedError()
+        backend_client.cache_backend.set.side_effect = ConnectionRefusedError()
+
+        # Act
+        result = await backend_client.verify_token(make_token())
+
+        # Assert
+        assert result.sub == "test-user-id"
+
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("error", [asyncio.IncompleteReadError(b"", 10), ValueError("Unexpected reply")])
+    async def test_broken_reply_falls_back_to_verification(self, backend_client, make_token, error):
+        # Arrange
+        backend_client.cache_backend = AsyncMock()
+        backend_client.cache_backend.get.side_effect = error
+        backend_client.cache_backend.set.side_effect = error
+
+        # Act
+        result = await backend_client.verify_token(make_token())
+
+        # Assert
+        assert result.sub == "test-user-id"
+
+
+    @pytest.mark.asyncio
+    async def test_token_cached_for_other_audience_is_rechecked(self, keycloak_settings, backend, jwks_response, openid_configuration, make_token):
+        # Arrange: two services with different audiences share one backend
+        def service(audience: str) -> KeycloakClient:
+            client = KeycloakClient(keycloak_settings.model_copy(update={"audience": audience}), cache_backend=backend)
+            client._jwks = jwks_response
+            client._jwks_fetched_at = time.monotonic()
+            client._openid_configuration = openid_configuration
+            return client
+
+        service_a, service_b = service("api-a"), service("api-b")
+        token = make_token(audience="api-a")
+        await service_a.verify_token(token)
+
+        # Act & Assert
+        with pytest.raises(JWTError, match="Invalid audience"):
+            await service_b.verify_token(token)
+
+class TestUserinfo:
+
+    @pytest.mark.asyncio
+    async def test_userinfo_is_cached_per_token(self, backend_client, make_token):
+        # Arrange
+        token = make_token()
+        backend_client._http_client.get.return_value = httpx.Response(
+            200, json={"sub": "test-user-id"}, request=httpx.Request("GET", "https://fake"),
+        )
+
+        # Act
+        first = await backend_client.get_userinfo(token)
+        second = await backend_client.get_userinfo(token)
+
+        # Assert
+        assert first == second == {"sub": "test-user-id"}
+        assert backend_client._http_client.get.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_userinfo_for_opaque_token_is_not_cached(self, backend_client, backend):
+        # Arrange
+        backend_client._http_client.get.return_value = httpx.Response(
+            200, json={"sub": "user"}, request=httpx.Request("GET", "https://fake"),
+        )
+
+        # Act
+        await backend_client.get_userinfo("opaque-token")
+
+        # Assert
+        assert backend._entries == {}
+
+
+class TestJwks:
+
+    @pytest.mark.asyncio
+    async def test_fetched_jwks_is_stored_in_backend(self, backend_client, backend, jwks_response):
+        # Arrange
+        backend_client._http_client.get.return_value = httpx.Response(
+            200, json=jwks_response, request=httpx.Request("GET", "https://fake"),
+        )
+
+        # Act
+        await backend_client.refresh_jwks()
+
+        # Assert
+        assert json.loads(await backend.get(backend_client._jwks_key)) == jwks_response
+
+    @pytest.mark.asyncio
+    async def test_cold_client_loads_jwks_from_backend(self, keycloak_settings, backend, jwks_response, openid_configuration):
+        # Arrange
+        client = KeycloakClient(keycloak_settings, cache_backend=backend)
+        await backend.set(client._jwks_key, json.dumps(jwks_response).encode(), ttl=60)
+        client._openid_configuration = openid_configuration
+        client._http_client = AsyncMock(is_closed=False)
+
+        # Act
+        result = await client.get_jwks()
+
+        # Assert
+        assert result == jwks_response
+        client._http_client.get.assert_not_called()
+
+
+class TestRedisIntegration:
+
+    @pytest.mark.asyncio
+    async def test_verified_token_shared_through_redis(self, fake_redis, keycloak_settings, jwks_response, make_token):
+        # Arrange
+        keycloak_settings.cache_backend_url = fake_redis.url
+        pod_a = KeycloakClient(keycloak_settings)
+        pod_a._jwks = jwks_response
+        pod_b = KeycloakClient(keycloak_settings)
+        token = make_token()
+        await pod_a.verify_token(token)
+
+        with patch.object(pod_b.jwt_backend, "verify") as decode:
+            # Act
+            result = await pod_b.verify_token(token)
+
+        # Assert
+        decode.assert_not_called()
+        assert result.sub == "test-user-id"
+        await pod_a.aclose()
+        await pod_b.aclose()
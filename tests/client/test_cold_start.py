@@ -0,0 +1,82 @@
+"""Tests for coalesced discovery and JWKS fetches on a cold client."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from fastapi_keycloak_auth.client import KeycloakClient
+
+
+@pytest.fixture
+def cold_client(keycloak_settings, openid_configuration, jwks_response) -> KeycloakClient:
+    """KeycloakClient with empty caches and a slow mocked HTTP client."""
+    responses = {
+        keycloak_settings.configuration_url: openid_configuration.model_dump(),
+        openid_configuration.jwks_uri: jwks_response,
+    }
+
+    async def get(url, **kwargs):
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json=responses[url], request=httpx.Request("GET", url))
+
+    mock_http = AsyncMock()
+    mock_http.is_closed = False
+    mock_http.get.side_effect = get
+
+    client = KeycloakClient(keycloak_settings)
+    client._http_client = mock_http
+    return client
+
+
+def _urls(client: KeycloakClient) -> list[str]:
+    return [call.args[0] for call in client._http_client.get.call_args_list]
+
+
+class TestColdStartCoalescing:
+
+    @pytest.mark.asyncio
+    async def test_concurrent_discovery_fetches_once(self, cold_client, keycloak_settings):
+        # Act
+        results = await asyncio.gather(*(cold_client.get_openid_configuration() for _ in range(10)))
+
+        # Assert
+        assert _urls(cold_client) == [keycloak_settings.configuration_url]
+        assert all(r is results[0] for r in results)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_jwks_fetches_once(self, cold_client, keycloak_settings, openid_configuration):
+        # Act
+        results = await asyncio.gather(*(cold_client.get_jwks() for _ in range(10)))
+
+        # Assert
+        assert _urls(cold_client) == [keycloak_settings.configuration_url, openid_configuration.jwks_uri]
+        assert all(r is results[0] for r in results)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_verifications_fetch_once(self, cold_client, make_token):
+        # Arrange
+        token = make_token()
+
+        # Act
+        results = await asyncio.gather(*(cold_client.verify_token(token) for _ in range(10)))
+
+        # Assert
+        assert cold_client._http_client.get.call_count == 2
+        assert all(r.sub == "test-user-id" for r in results)
+
+    @pytest.mark.asyncio
+    async def test_failed_fetch_is_retried_on_next_call(self, cold_client, keycloak_settings, openid_configuration):
+        # Arrange
+        get = cold_client._http_client.get.side_effect
+        cold_client._http_client.get.side_effect = httpx.ConnectError("connection refused")
+        with pytest.raises(httpx.ConnectError):
+            await cold_client.get_openid_configuration()
+        cold_client._http_client.get.side_effect = get
+
+        # Act
+        result = await cold_client.get_openid_configuration()
+
+        # Assert
+        assert result.issuer == openid_configuration.issuer
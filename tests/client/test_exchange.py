@@ -1,5 +1,7 @@
 """Tests for KeycloakClient.exchange_code() and refresh_tokens()."""
 
+import asyncio
+import time
 from unittest.mock import AsyncMock, patch
 
 import httpx
@@ -123,3 +125,96 @@ class TestRefreshTokens:
             # Act & Assert
             with pytest.raises(httpx.HTTPStatusError):
                 await keycloak_client.refresh_tokens("expired-token")
+
+
+class TestRefreshCoalescing:
+
+    @pytest.fixture
+    def slow_token_endpoint(self, keycloak_client, openid_configuration):
+        """Token endpoint that rotates refresh tokens and answers after a short delay."""
+        calls = []
+
+        async def post(url, data):
+            calls.append(data["refresh_token"])
+            await asyncio.sleep(0.01)
+            return httpx.Response(
+                200,
+                json={**TOKEN_RESPONSE_DATA, "access_token": f"access-{len(calls)}"},
+                request=httpx.Request("POST", url),
+            )
+
+        keycloak_client._openid_configuration = openid_configuration
+        keycloak_client._http_client = AsyncMock(is_closed=False)
+        keycloak_client._http_client.post.side_effect = post
+        return calls
+
+    @pytest.mark.asyncio
+    async def test_concurrent_refreshes_share_one_call(self, keycloak_client, slow_token_endpoint):
+        # Act
+        results = await asyncio.gather(*(keycloak_client.refresh_tokens("refresh-token") for _ in range(5)))
+
+        # Assert
+        assert slow_token_endpoint == ["refresh-token"]
+        assert {result.access_token for result in results} == {"access-1"}
+
+    @pytest.mark.asyncio
+    async def test_result_reused_within_grace_period(self, keycloak_client, slow_token_endpoint):
+        # Arrange
+        first = await keycloak_client.refresh_tokens("refresh-token")
+
+        # Act
+        second = await keycloak_client.refresh_tokens("refresh-token")
+
+        # Assert
+        assert second is first
+        assert len(slow_token_endpoint) == 1
+
+    @pytest.mark.asyncio
+    async def test_refreshes_again_after_grace_period(self, keycloak_client, slow_token_endpoint):
+        # Arrange
+        first = await keycloak_client.refresh_tokens("refresh-token")
+        for key in keycloak_client._recent_refreshes:
+            keycloak_client._recent_refreshes[key] = (first, time.monotonic() - 1)
+
+        # Act
+        result = await keycloak_client.refresh_tokens("refresh-token")
+
+        # Assert
+        assert result.access_token == "access-2"
+        assert len(keycloak_client._recent_refreshes) == 1
+
+    @pytest.mark.asyncio
+    async def test_grace_period_disabled(self, keycloak_client, slow_token_endpoint):
+        # Arrange
+        keycloak_client.settings.refresh_grace_period = 0
+
+        # Act
+        await keycloak_client.refresh_tokens("refresh-token")
+        await keycloak_client.refresh_tokens("refresh-token")
+
+        # Assert
+        assert len(slow_token_endpoint) == 2
+        assert keycloak_client._recent_refreshes == {}
+
+    @pytest.mark.asyncio
+    async def test_different_refresh_tokens_are_not_coalesced(self, keycloak_client, slow_token_endpoint):
+        # Act
+        await asyncio.gather(keycloak_client.refresh_tokens("token-a"), keycloak_client.refresh_tokens("token-b"))
+
+        # Assert
+        assert sorted(slow_token_endpoint) == ["token-a", "token-b"]
+
+    @pytest.mark.asyncio
+    async def test_failure_is_not_remembered(self, keycloak_client, openid_configuration):
+        # Arrange
+        keycloak_client._openid_configuration = openid_configuration
+        keycloak_client._http_client = AsyncMock(is_closed=False)
+        keycloak_client._http_client.post.return_value = httpx.Response(
+            400, json={"error": "invalid_grant"}, request=httpx.Request("POST", "https://fake"),
+        )
+
+        # Act & Assert
+        for _ in range(2):
+            with pytest.raises(httpx.HTTPStatusError):
+                await keycloak_client.refresh_tokens("refresh-token")
+        assert keycloak_client._http_client.post.await_count == 2
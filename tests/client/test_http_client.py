@@ -0,0 +1,87 @@
+"""Tests for the shared KeycloakClient HTTP client."""
+
+import httpx
+import pytest
+
+from fastapi_keycloak_auth.client import KeycloakClient
+
+
+class TestSharedHttpClient:
+
+    @pytest.mark.asyncio
+    async def test_http_client_is_reused(self, keycloak_settings):
+        # Arrange
+        client = KeycloakClient(keycloak_settings)
+
+        # Act
+        first = client.http_client
+        second = client.http_client
+
+        # Assert
+        assert first is second
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_http_client_uses_configured_timeouts(self, keycloak_settings):
+        # Arrange
+        keycloak_settings.http_timeout = 3.0
+        keycloak_settings.http_connect_timeout = 1.0
+        client = KeycloakClient(keycloak_settings)
+
+        # Act
+        timeout = client.http_client.timeout
+
+        # Assert
+        assert timeout.read == 3.0
+        assert timeout.connect == 1.0
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_aclose_closes_http_client(self, keycloak_settings):
+        # Arrange
+        client = KeycloakClient(keycloak_settings)
+        http_client = client.http_client
+
+        # Act
+        await client.aclose()
+
+        # Assert
+        assert http_client.is_closed
+
+    @pytest.mark.asyncio
+    async def test_http_client_recreated_after_aclose(self, keycloak_settings):
+        # Arrange
+        client = KeycloakClient(keycloak_settings)
+        first = client.http_client
+        await client.aclose()
+
+        # Act
+        second = client.http_client
+
+        # Assert
+        assert second is not first
+        assert not second.is_closed
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_async_context_manager_closes_client(self, keycloak_settings):
+        # Arrange
+        async with KeycloakClient(keycloak_settings) as client:
+            http_client = client.http_client
+
+        # Assert
+        assert isinstance(http_client, httpx.AsyncClient)
+        assert http_client.is_closed
+
+    @pytest.mark.asyncio
+    async def test_http_client_uses_custom_transport(self, keycloak_settings):
+        # Arrange
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json={"ok": True}))
+        client = KeycloakClient(keycloak_settings, transport=transport)
+
+        # Act
+        response = await client.http_client.get("https://keycloak.example.local/anything")
+
+        # Assert
+        assert response.json() == {"ok": True}
+        await client.aclose()
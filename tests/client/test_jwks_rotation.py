@@ -0,0 +1,173 @@
+"""Tests for JWKS refetching on key rotation."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+from jose import JWTError, jwt
+
+from fastapi_keycloak_auth.models import TokenPayload
+
+
+def _mock_http_client(jwks, delay: float = 0) -> AsyncMock:
+    """Mock shared HTTP client that serves the given JWKS (a str is sent as the raw body)."""
+
+    async def get(url, **kwargs):
+        await asyncio.sleep(delay)
+        request = httpx.Request("GET", url)
+        if isinstance(jwks, str):
+            return httpx.Response(200, text=jwks, request=request)
+        return httpx.Response(200, json=jwks, request=request)
+
+    mock_http = AsyncMock()
+    mock_http.is_closed = False
+    mock_http.get.side_effect = get
+    return mock_http
+
+
+@pytest.fixture
+def rotated_token(rotated_rsa_keypair, keycloak_settings):
+    """Token signed with the rotated key."""
+    now = int(time.time())
+    return jwt.encode(
+        {"sub": "rotated-user", "iss": keycloak_settings.issuer, "iat": now, "exp": now + 300},
+        rotated_rsa_keypair["private_pem"],
+        algorithm="RS256",
+        headers={"kid": "rotated-key-id"},
+    )
+
+
+@pytest.fixture
+def rotated_jwks(rsa_keypair, rotated_rsa_keypair) -> dict:
+    return {"keys": [rsa_keypair["jwk"], rotated_rsa_keypair["jwk"]]}
+
+
+class TestUnknownKidRefetch:
+
+    @pytest.mark.asyncio
+    async def test_unknown_kid_triggers_refetch(self, keycloak_client, rotated_token, rotated_jwks):
+        # Arrange
+        keycloak_client._jwks_fetched_at = None
+        keycloak_client._http_client = _mock_http_client(rotated_jwks)
+
+        # Act
+        result = await keycloak_client.verify_token(rotated_token)
+
+        # Assert
+        assert isinstance(result, TokenPayload)
+        assert result.sub == "rotated-user"
+
+    @pytest.mark.asyncio
+    async def test_refetch_is_rate_limited(self, keycloak_client, rotated_token, rotated_jwks):
+        # Arrange — JWKS was just fetched
+        keycloak_client._jwks_fetched_at = time.monotonic()
+        keycloak_client._http_client = _mock_http_client(rotated_jwks)
+
+        # Act & Assert
+        with pytest.raises(JWTError, match="Unknown signing key"):
+            await keycloak_client.verify_token(rotated_token)
+        keycloak_client._http_client.get.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_refetch_allowed_after_min_interval(self, keycloak_client, keycloak_settings, rotated_token, rotated_jwks):
+        # Arrange
+        keycloak_settings.jwks_min_refresh_interval = 10
+        keycloak_client._jwks_fetched_at = time.monotonic() - 11
+        keycloak_client._http_client = _mock_http_client(rotated_jwks)
+
+        # Act
+        result = await keycloak_client.verify_token(rotated_token)
+
+        # Assert
+        assert result.sub == "rotated-user"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_unknown_kids_share_one_fetch(self, keycloak_client, rotated_token, rotated_jwks):
+        # Arrange
+        keycloak_client._jwks_fetched_at = None
+        keycloak_client._http_client = _mock_http_client(rotated_jwks, delay=0.01)
+
+        # Act
+        results = await asyncio.gather(*(keycloak_client.verify_token(rotated_token) for _ in range(20)))
+
+        # Assert
+        assert all(r.sub == "rotated-user" for r in results)
+        assert keycloak_client._http_client.get.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_refetch_raises_jwt_error(self, keycloak_client, rotated_token):
+        # Arrange
+        keycloak_client._jwks_fetched_at = None
+        mock_http = AsyncMock()
+        mock_http.is_closed = False
+        mock_http.get.side_effect = httpx.ConnectError("connection refused")
+        keycloak_client._http_client = mock_http
+
+        # Act & Assert
+        with pytest.raises(JWTError, match="Unknown signing key"):
+            await keycloak_client.verify_token(rotated_token)
+
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("body", ["<html>Bad Gateway</html>", ["not", "a", "jwks"], {"keys": "none"}])
+    async def test_malformed_jwks_raises_jwt_error(self, keycloak_client, rotated_token, body):
+        # Arrange
+        keycloak_client._jwks_fetched_at = None
+        keycloak_client._http_client = _mock_http_client(body)
+
+        # Act & Assert
+        with pytest.raises(JWTError, match="Unknown signing key"):
+            await keycloak_client.verify_token(rotated_token)
+
+
+class TestBackgroundRefresh:
+
+    @pytest.mark.asyncio
+    async def test_background_refresh_picks_up_new_keys(self, keycloak_client, rotated_jwks):
+        # Arrange
+        keycloak_client._http_client = _mock_http_client(rotated_jwks)
+
+        # Act
+        keycloak_client.start_jwks_refresh(interval=0.01)
+        await asyncio.sleep(0.05)
+        await keycloak_client.stop_jwks_refresh()
+
+        # Assert
+        assert "rotated-key-id" in keycloak_client._signing_keys
+
+    @pytest.mark.asyncio
+    async def test_background_refresh_survives_malformed_jwks(self, keycloak_client):
+        # Arrange
+        keycloak_client._http_client = _mock_http_client("<html>Bad Gateway</html>")
+
+        # Act
+        keycloak_client.start_jwks_refresh(interval=0.01)
+        await asyncio.sleep(0.05)
+        task = keycloak_client._jwks_refresh_task
+
+        # Assert
+        assert not task.done()
+        await keycloak_client.stop_jwks_refresh()
+
+    @pytest.mark.asyncio
+    async def test_not_started_without_interval(self, keycloak_client):
+        # Act
+        keycloak_client.start_jwks_refresh()
+
+        # Assert
+        assert keycloak_client._jwks_refresh_task is None
+
+    @pytest.mark.asyncio
+    async def test_aclose_stops_background_refresh(self, keycloak_client, rotated_jwks):
+        # Arrange
+        keycloak_client._http_client = _mock_http_client(rotated_jwks)
+        keycloak_client.start_jwks_refresh(interval=10)
+        task = keycloak_client._jwks_refresh_task
+
+        # Act
+        await keycloak_client.aclose()
+
+        # Assert
+        assert task.cancelled()
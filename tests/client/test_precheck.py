@@ -0,0 +1,151 @@
+"""Tests for rejecting tokens before signature verification."""
+
+import time
+from unittest.mock import patch
+
+import pytest
+from jose import JWTError
+from jose.exceptions import ExpiredSignatureError, JWTClaimsError
+
+from fastapi_keycloak_auth.cache import RejectedTokenCache
+from fastapi_keycloak_auth.client import KeycloakClient
+from fastapi_keycloak_auth.jwt_backends import TokenNotYetValidError
+
+
+class TestPrecheck:
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("claims", "error"),
+        [
+            ({"expires_in": -60}, ExpiredSignatureError),
+            ({"iss": "https://evil.example.local/realms/test-realm"}, JWTClaimsError),
+        ],
+    )
+    async def test_rejected_without_signature_check(self, keycloak_client, make_token, claims, error):
+        # Arrange
+        token = make_token(**claims)
+
+        # Act & Assert
+        with patch.object(keycloak_client.jwt_backend, "verify") as mock_verify, \
+                patch.object(keycloak_client, "get_signing_key") as mock_get_key:
+            with pytest.raises(error):
+                await keycloak_client.verify_token(token)
+        mock_verify.assert_not_called()
+        mock_get_key.assert_not_called()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("token", ["garbage", "a.b", "e30.e30.e30.e30", "eyJhbGciOiJSUzI1NiJ9.!!!.sig"])
+    async def test_malformed_token_rejected(self, keycloak_client, token):
+        # Act & Assert
+        with patch.object(keycloak_client, "get_signing_key") as mock_get_key:
+            with pytest.raises(JWTError):
+                await keycloak_client.verify_token(token)
+        mock_get_key.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_disallowed_algorithm_rejected(self, keycloak_client, make_token):
+        # Arrange
+        _, payload, _ = make_token().split(".")
+        header = "eyJhbGciOiJIUzI1NiIsImtpZCI6InRlc3Qta2V5LWlkIn0"  # {"alg":"HS256","kid":"test-key-id"}
+
+        # Act & Assert
+        with pytest.raises(JWTError, match="is not allowed"):
+            await keycloak_client.verify_token(f"{header}.{payload}.sig")
+
+
+class TestRejectedTokenCache:
+
+    @pytest.fixture
+    def rejecting_client(self, keycloak_client) -> KeycloakClient:
+        keycloak_client.rejected_tokens = RejectedTokenCache()
+        return keycloak_client
+
+    def test_disabled_by_default(self, keycloak_client):
+        # Assert
+        assert keycloak_client.rejected_tokens is None
+
+    def test_enabled_from_settings(self, keycloak_settings):
+        # Arrange
+        keycloak_settings.rejected_cache_enabled = True
+        keycloak_settings.rejected_cache_max_size = 10
+
+        # Act
+        client = KeycloakClient(keycloak_settings)
+
+        # Assert
+        assert client.rejected_tokens.max_size == 10
+
+    @pytest.mark.asyncio
+    async def test_repeated_invalid_token_is_not_decoded_again(self, rejecting_client, make_token):
+        # Arrange
+        token = make_token(expires_in=-60)
+        with pytest.raises(ExpiredSignatureError):
+            await rejecting_client.verify_token(token)
+
+        # Act & Assert
+        with patch("fastapi_keycloak_auth.client.unverified_token") as mock_decode:
+            with pytest.raises(ExpiredSignatureError):
+                await rejecting_client.verify_token(token)
+        mock_decode.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_bad_signature_is_remembered(self, rejecting_client, make_token):
+        # Arrange
+        header, payload, signature = make_token().split(".")
+        token = f"{header}.{payload}.{signature[::-1]}"
+        with pytest.raises(JWTError):
+            await rejecting_client.verify_token(token)
+
+        # Act & Assert
+        with patch.object(rejecting_client.jwt_backend, "verify") as mock_verify:
+            with pytest.raises(JWTError):
+                await rejecting_client.verify_token(token)
+        mock_verify.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_unknown_kid_is_not_remembered(self, rejecting_client, make_token):
+        # Arrange
+        token = make_token()
+
+        # Act
+        with patch.object(rejecting_client, "get_signing_key", side_effect=JWTError("Unknown signing key: x")):
+            with pytest.raises(JWTError):
+                await rejecting_client.verify_token(token)
+
+        # Assert: the key may appear after a JWKS rotation
+        assert len(rejecting_client.rejected_tokens) == 0
+        assert (await rejecting_client.verify_token(token)).sub == "test-user-id"
+
+    @pytest.mark.asyncio
+    async def test_not_yet_valid_token_is_not_remembered(self, rejecting_client, make_token):
+        # Arrange
+        token = make_token(nbf=int(time.time()) + 2)
+
+        # Act
+        with pytest.raises(TokenNotYetValidError):
+            await rejecting_client.verify_token(token)
+
+        # Assert: the token becomes valid once nbf has passed
+        assert len(rejecting_client.rejected_tokens) == 0
+
+    @pytest.mark.asyncio
+    async def test_valid_token_is_not_remembered(self, rejecting_client, make_token):
+        # Act
+        await rejecting_client.verify_token(make_token())
+
+        # Assert
+        assert len(rejecting_client.rejected_tokens) == 0
+
+    @pytest.mark.asyncio
+    async def test_batch_uses_rejected_cache(self, rejecting_client, make_token):
+        # Arrange
+        token = make_token(expires_in=-60)
+        await rejecting_client.verify_tokens([token])
+
+        # Act
+        results = await rejecting_client.verify_tokens([token])
+
+        # Assert
+        assert isinstance(results[token], ExpiredSignatureError)
+        assert rejecting_client.rejected_tokens.stats.hits == 1
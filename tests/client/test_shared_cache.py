@@ -0,0 +1,131 @@
+"""Tests for KeycloakClient with a cross-worker shared cache."""
+
+import time
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from jose import jwt
+
+from fastapi_keycloak_auth.client import KeycloakClient
+from fastapi_keycloak_auth.shared_cache import SharedCache
+
+
+@pytest.fixture
+def shared_settings(keycloak_settings, tmp_path):
+    keycloak_settings.shared_cache_path = str(tmp_path / "shared-cache")
+    keycloak_settings.shared_cache_slots = 16
+    return keycloak_settings
+
+
+def _worker(settings, openid_configuration, jwks=None) -> KeycloakClient:
+    """A KeycloakClient as it would exist in one worker process."""
+    client = KeycloakClient(settings)
+    client._openid_configuration = openid_configuration
+    if jwks is not None:
+        client._jwks = jwks
+        client._jwks_fetched_at = time.monotonic()
+    client._http_client = AsyncMock(is_closed=False)
+    return client
+
+
+class TestSharedTokens:
+
+    @pytest.mark.asyncio
+    async def test_token_verified_in_one_worker_hits_in_another(self, shared_settings, openid_configuration, jwks_response, make_token):
+        # Arrange
+        shared_settings.token_cache_enabled = True
+        worker_a = _worker(shared_settings, openid_configuration, jwks_response)
+        worker_b = _worker(shared_settings, openid_configuration, jwks_response)
+        token = make_token()
+        await worker_a.verify_token(token)
+
+        with patch.object(worker_b.jwt_backend, "verify") as decode:
+            # Act
+            result = await worker_b.verify_token(token)
+
+        # Assert
+        decode.assert_not_called()
+        assert result.sub == "test-user-id"
+
+    def test_token_cache_uses_shared_cache(self, shared_settings):
+        # Arrange
+        shared_settings.token_cache_enabled = True
+
+        # Act
+        client = KeycloakClient(shared_settings)
+
+        # Assert
+        assert isinstance(client.token_cache, SharedCache)
+        assert client.token_cache is client.shared_cache
+
+
+class TestSharedJwks:
+
+    @pytest.mark.asyncio
+    async def test_cold_worker_uses_jwks_from_other_worker(self, shared_settings, openid_configuration, jwks_response):
+        # Arrange
+        worker_a = _worker(shared_settings, openid_configuration)
+        worker_a._http_client.get.return_value = httpx.Response(200, json=jwks_response, request=httpx.Request("GET", "https://fake"))
+        await worker_a.get_jwks()
+        worker_b = _worker(shared_settings, openid_configuration)
+
+        # Act
+        result = await worker_b.get_jwks()
+
+        # Assert
+        assert result == jwks_response
+        worker_b._http_client.get.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_rotated_key_from_other_worker_is_adopted(self, shared_settings, openid_configuration, jwks_response, rsa_keypair, rotated_rsa_keypair):
+        # Arrange — worker B has the old JWKS, worker A refetched after rotation
+        worker_b = _worker(shared_settings, openid_configuration, jwks_response)
+        worker_b._jwks_updated_at = time.time() - 60
+        rotated_jwks = {"keys": [rsa_keypair["jwk"], rotated_rsa_keypair["jwk"]]}
+        worker_a = _worker(shared_settings, openid_configuration)
+        worker_a._http_client.get.return_value = httpx.Response(200, json=rotated_jwks, request=httpx.Request("GET", "https://fake"))
+        await worker_a.refresh_jwks()
+        token = jwt.encode(
+            {"sub": "rotated-user", "iss": shared_settings.issuer, "exp": int(time.time()) + 300},
+            rotated_rsa_keypair["private_pem"],
+            algorithm="RS256",
+            headers={"kid": "rotated-key-id"},
+        )
+
+        # Act
+        result = await worker_b.verify_token(token)
+
+        # Assert
+        assert result.sub == "rotated-user"
+        worker_b._http_client.get.assert_not_called()
+
+
+class TestNamespace:
+
+    def test_client_with_other_audience_refuses_file(self, shared_settings):
+        # Arrange
+        KeycloakClient(shared_settings)
+        other_settings = shared_settings.model_copy(update={"audience": "other-api"})
+
+        # Act & Assert
+        with pytest.raises(ValueError, match="different realm, audience or claim rules"):
+            KeycloakClient(other_settings)
+
+
+class TestClose:
+
+    @pytest.mark.asyncio
+    async def test_aclose_closes_shared_cache(self, shared_settings):
+        # Arrange
+        shared_settings.token_cache_enabled = True
+        client = KeycloakClient(shared_settings)
+        shared_cache = client.shared_cache
+
+        # Act
+        await client.aclose()
+
+        # Assert
+        assert shared_cache._mm.closed
+        assert client.shared_cache is None
+        assert client.token_cache is None
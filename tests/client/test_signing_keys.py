@@ -0,0 +1,137 @@
+"""Tests for the parsed JWKS signing key index."""
+
+from unittest.mock import patch
+
+import pytest
+from jose import JWTError, jwk, jwt
+from jose.backends.base import Key
+
+from fastapi_keycloak_auth.client import build_signing_keys
+
+
+class TestBuildSigningKeys:
+
+    def test_indexes_keys_by_kid(self, jwks_response):
+        # Act
+        keys = build_signing_keys(jwks_response)
+
+        # Assert
+        assert set(keys) == {"test-key-id"}
+        assert isinstance(keys["test-key-id"].key, Key)
+        assert keys["test-key-id"].algorithm == "RS256"
+
+    def test_skips_encryption_keys(self, rsa_keypair):
+        # Arrange
+        enc_key = {**rsa_keypair["jwk"], "kid": "enc-key", "use": "enc", "alg": "RSA-OAEP"}
+        jwks = {"keys": [rsa_keypair["jwk"], enc_key]}
+
+        # Act
+        keys = build_signing_keys(jwks)
+
+        # Assert
+        assert "enc-key" not in keys
+
+    def test_skips_unsupported_keys(self, rsa_keypair):
+        # Arrange
+        broken_key = {"kty": "RSA", "kid": "broken", "alg": "RS256", "n": "!!", "e": "AQAB"}
+        jwks = {"keys": [broken_key, rsa_keypair["jwk"]]}
+
+        # Act
+        keys = build_signing_keys(jwks)
+
+        # Assert
+        assert "test-key-id" in keys
+
+
+    def test_skips_keys_with_disallowed_algorithm(self, rsa_keypair):
+        # Act
+        keys = build_signing_keys({"keys": [rsa_keypair["jwk"]]}, algorithms={"ES256"})
+
+        # Assert
+        assert keys == {}
+
+    def test_skips_keys_whose_alg_does_not_match_key_type(self, rsa_keypair):
+        # Arrange
+        mismatched = {**rsa_keypair["jwk"], "kid": "mismatched", "alg": "ES256"}
+
+        # Act
+        keys = build_signing_keys({"keys": [mismatched]})
+
+        # Assert
+        assert keys == {}
+
+    def test_derives_algorithm_from_key_type(self, rsa_keypair):
+        # Arrange
+        without_alg = {k: v for k, v in rsa_keypair["jwk"].items() if k != "alg"}
+
+        # Act
+        keys = build_signing_keys({"keys": [without_alg]})
+
+        # Assert
+        assert keys["test-key-id"].algorithm == "RS256"
+
+
+class TestGetSigningKey:
+
+    @pytest.mark.asyncio
+    async def test_returns_key_for_known_kid(self, keycloak_client):
+        # Act
+        key = await keycloak_client.get_signing_key("test-key-id")
+
+        # Assert
+        assert isinstance(key.key, Key)
+
+    @pytest.mark.asyncio
+    async def test_unknown_kid_raises_jwt_error(self, keycloak_client):
+        # Act & Assert
+        with pytest.raises(JWTError, match="Unknown signing key"):
+            await keycloak_client.get_signing_key("other-key-id")
+
+    @pytest.mark.asyncio
+    async def test_missing_kid_uses_single_key(self, keycloak_client):
+        # Act
+        key = await keycloak_client.get_signing_key(None)
+
+        # Assert
+        assert key is await keycloak_client.get_signing_key("test-key-id")
+
+    @pytest.mark.asyncio
+    async def test_keys_are_parsed_once(self, keycloak_client, make_token):
+        # Arrange
+        token = make_token()
+
+        with patch("fastapi_keycloak_auth.jwt_backends.jwk.construct", wraps=jwk.construct) as construct:
+            # Act
+            await keycloak_client.verify_token(token)
+            await keycloak_client.verify_token(token)
+
+        # Assert
+        assert construct.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_clear_jwks_cache_drops_parsed_keys(self, keycloak_client):
+        # Arrange
+        await keycloak_client.get_signing_key("test-key-id")
+
+        # Act
+        keycloak_client.clear_jwks_cache()
+
+        # Assert
+        assert keycloak_client._signing_keys is None
+
+
+class TestVerifyTokenKeyLookup:
+
+    @pytest.mark.asyncio
+    async def test_token_with_unknown_kid_raises_jwt_error(self, keycloak_client, rsa_keypair, keycloak_settings):
+        # Arrange
+        token = jwt.encode(
+            {"sub": "user", "iss": keycloak_settings.issuer},
+            rsa_keypair["private_pem"],
+            algorithm="RS256",
+            headers={"kid": "rotated-key-id"},
+        )
+
+        # Act & Assert
+        with pytest.raises(JWTError, match="Unknown signing key"):
+            await keycloak_client.verify_token(token)
@@ -0,0 +1,134 @@
+"""Tests for KeycloakClient snapshot loading and saving."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from fastapi_keycloak_auth.client import KeycloakClient
+
+
+def _mock_http_client(responses: dict) -> AsyncMock:
+    async def get(url, **kwargs):
+        return httpx.Response(200, json=responses[url], request=httpx.Request("GET", url))
+
+    mock_http = AsyncMock()
+    mock_http.is_closed = False
+    mock_http.get.side_effect = get
+    return mock_http
+
+
+@pytest.fixture
+def snapshot_settings(keycloak_settings, tmp_path):
+    keycloak_settings.snapshot_path = str(tmp_path / "snapshot.json")
+    return keycloak_settings
+
+
+@pytest.fixture
+def responses(keycloak_settings, openid_configuration, jwks_response) -> dict:
+    return {
+        keycloak_settings.configuration_url: openid_configuration.model_dump(),
+        openid_configuration.jwks_uri: jwks_response,
+    }
+
+
+class TestSnapshotDisabled:
+
+    def test_no_snapshot_store_by_default(self, keycloak_client):
+        # Assert
+        assert keycloak_client.snapshot is None
+        assert keycloak_client.load_snapshot() is False
+
+
+class TestSnapshotSaving:
+
+    @pytest.mark.asyncio
+    async def test_jwks_fetch_writes_snapshot(self, snapshot_settings, responses, jwks_response):
+        # Arrange
+        client = KeycloakClient(snapshot_settings)
+        client._http_client = _mock_http_client(responses)
+
+        # Act
+        await client.get_jwks()
+
+        # Assert
+        snapshot = client.snapshot.load(snapshot_settings.issuer)
+        assert snapshot is not None
+        assert snapshot.jwks == jwks_response
+
+
+class TestSnapshotLoading:
+
+    @pytest.mark.asyncio
+    async def test_warmup_uses_snapshot_without_blocking_on_network(self, snapshot_settings, responses, make_token):
+        # Arrange — a previous worker wrote the snapshot
+        writer = KeycloakClient(snapshot_settings)
+        writer._http_client = _mock_http_client(responses)
+        await writer.get_jwks()
+
+        client = KeycloakClient(snapshot_settings)
+        client._http_client = _mock_http_client(responses)
+
+        # Act
+        ready = await client.warmup()
+        result = await client.verify_token(make_token())
+
+        # Assert
+        assert ready is True
+        assert result.sub == "test-user-id"
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_snapshot_is_revalidated_in_background(self, snapshot_settings, responses):
+        # Arrange
+        writer = KeycloakClient(snapshot_settings)
+        writer._http_client = _mock_http_client(responses)
+        await writer.get_jwks()
+
+        client = KeycloakClient(snapshot_settings)
+        client._http_client = _mock_http_client(responses)
+
+        # Act
+        await client.warmup()
+        await client._revalidate_task
+
+        # Assert
+        assert client._http_client.get.call_count == 2
+        assert client._jwks_fetched_at is not None
+
+    @pytest.mark.asyncio
+    async def test_warmup_falls_back_to_network_without_snapshot(self, snapshot_settings, responses):
+        # Arrange
+        client = KeycloakClient(snapshot_settings)
+        client._http_client = _mock_http_client(responses)
+
+        # Act
+        ready = await client.warmup()
+
+        # Assert
+        assert ready is True
+        assert client._revalidate_task is None
+        assert client._http_client.get.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_aclose_cancels_revalidation(self, snapshot_settings, responses):
+        # Arrange
+        writer = KeycloakClient(snapshot_settings)
+        writer._http_client = _mock_http_client(responses)
+        await writer.get_jwks()
+
+        async def slow_get(url, **kwargs):
+            await asyncio.sleep(10)
+
+        client = KeycloakClient(snapshot_settings)
+        client._http_client = AsyncMock(is_closed=False)
+        client._http_client.get.side_effect = slow_get
+        await client.warmup()
+        task = client._revalidate_task
+
+        # Act
+        await client.aclose()
+
+        # Assert
+        assert task.cancelled()
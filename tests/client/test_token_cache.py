@@ -0,0 +1,71 @@
+"""Tests for KeycloakClient verified-token caching."""
+
+import time
+from unittest.mock import patch
+
+import pytest
+from jose import JWTError, jwt
+
+from fastapi_keycloak_auth.client import KeycloakClient
+
+
+@pytest.fixture
+def cached_client(keycloak_settings, jwks_response, openid_configuration) -> KeycloakClient:
+    """KeycloakClient with the token cache enabled."""
+    keycloak_settings.token_cache_enabled = True
+    client = KeycloakClient(keycloak_settings)
+    client._jwks = jwks_response
+    client._jwks_fetched_at = time.monotonic()
+    client._openid_configuration = openid_configuration
+    return client
+
+
+class TestTokenCacheDisabled:
+
+    def test_cache_disabled_by_default(self, keycloak_client):
+        # Assert
+        assert keycloak_client.token_cache is None
+
+
+class TestTokenCacheEnabled:
+
+    @pytest.mark.asyncio
+    async def test_second_verification_is_cache_hit(self, cached_client, make_token):
+        # Arrange
+        token = make_token()
+        first = await cached_client.verify_token(token)
+
+        with patch.object(cached_client.jwt_backend, "verify") as decode:
+            # Act
+            second = await cached_client.verify_token(token)
+
+        # Assert
+        decode.assert_not_called()
+        assert second is first
+        assert cached_client.token_cache.stats.hits == 1
+        assert cached_client.token_cache.stats.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_invalid_token_is_not_cached(self, cached_client, make_token):
+        # Arrange
+        token = make_token(audience="wrong-audience")
+
+        # Act
+        with pytest.raises(JWTError):
+            await cached_client.verify_token(token)
+
+        # Assert
+        assert len(cached_client.token_cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_entry_expires_at_token_exp(self, cached_client, make_token):
+        # Arrange
+        cached_client.token_cache.max_ttl = 3600
+        token = make_token(expires_in=120)
+
+        # Act
+        await cached_client.verify_token(token)
+
+        # Assert
+        _, expires_at = next(iter(cached_client.token_cache._entries.values()))
+        assert expires_at == jwt.get_unverified_claims(token)["exp"]
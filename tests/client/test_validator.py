@@ -0,0 +1,40 @@
+"""Tests for the compiled TokenValidator in KeycloakClient."""
+
+import pytest
+from jose.exceptions import JWTClaimsError
+
+from fastapi_keycloak_auth.client import KeycloakClient
+from fastapi_keycloak_auth.validation import TokenValidator
+
+
+class TestClientValidator:
+
+    def test_validator_built_once_from_settings(self, keycloak_client, keycloak_settings):
+        # Assert
+        assert isinstance(keycloak_client.validator, TokenValidator)
+        assert keycloak_client.validator.issuer == keycloak_settings.issuer
+        assert keycloak_settings.audience in keycloak_client.validator.audiences
+
+    @pytest.mark.asyncio
+    async def test_required_claims_enforced(self, keycloak_settings, jwks_response, make_token):
+        # Arrange
+        keycloak_settings.required_claims = "azp"
+        client = KeycloakClient(keycloak_settings)
+        client._jwks = jwks_response
+
+        # Act & Assert
+        with pytest.raises(JWTClaimsError, match="Missing required claims: azp"):
+            await client.verify_token(make_token())
+        assert (await client.verify_token(make_token(azp="frontend"))).sub == "test-user-id"
+
+    @pytest.mark.asyncio
+    async def test_authorized_parties_enforced(self, keycloak_settings, jwks_response, make_token):
+        # Arrange
+        keycloak_settings.authorized_parties = "frontend"
+        client = KeycloakClient(keycloak_settings)
+        client._jwks = jwks_response
+
+        # Act & Assert
+        with pytest.raises(JWTClaimsError, match="Invalid authorized party"):
+            await client.verify_token(make_token(azp="other"))
+        assert (await client.verify_token(make_token(azp="frontend"))).sub == "test-user-id"
@@ -0,0 +1,55 @@
+"""Tests for KeycloakClient with a verify executor."""
+
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from fastapi_keycloak_auth.client import KeycloakClient
+from fastapi_keycloak_auth.executor import VerifyExecutor
+
+
+@pytest.fixture
+def executor_client(keycloak_settings, jwks_response, openid_configuration) -> KeycloakClient:
+    keycloak_settings.verify_executor = "thread"
+    keycloak_settings.verify_executor_workers = 2
+    client = KeycloakClient(keycloak_settings)
+    client._jwks = jwks_response
+    client._jwks_fetched_at = time.monotonic()
+    client._openid_configuration = openid_configuration
+    client._http_client = AsyncMock(is_closed=False)
+    return client
+
+
+class TestVerifyExecutor:
+
+    def test_no_executor_by_default(self, keycloak_client):
+        # Assert
+        assert keycloak_client.verify_executor is None
+
+    def test_executor_created_from_settings(self, executor_client):
+        # Assert
+        assert isinstance(executor_client.verify_executor, VerifyExecutor)
+        assert executor_client.verify_executor.kind == "thread"
+        assert executor_client.verify_executor.max_workers == 2
+
+    @pytest.mark.asyncio
+    async def test_verify_token_uses_executor(self, executor_client, make_token):
+        # Act
+        payload = await executor_client.verify_token(make_token(sub="pooled-user"))
+
+        # Assert
+        assert payload.sub == "pooled-user"
+        assert executor_client.verify_executor.stats.completed == 1
+        executor_client.verify_executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_aclose_shuts_down_executor(self, executor_client):
+        # Arrange
+        executor_client.verify_executor = MagicMock(spec=VerifyExecutor)
+
+        # Act
+        await executor_client.aclose()
+
+        # Assert
+        executor_client.verify_executor.shutdown.assert_called_once()
@@ -86,6 +86,28 @@ class TestVerifyInvalidToken:
         with pytest.raises(JWTError):
             await keycloak_client.verify_token(token)
 
+    @pytest.mark.asyncio
+    async def test_malformed_claim_raises_jwt_error(self, keycloak_client, make_token):
+        # Arrange
+        token = make_token(groups="not-a-list")
+
+        # Act & Assert
+        with pytest.raises(JWTError, match="Invalid token claims"):
+            await keycloak_client.verify_token(token)
+
+    @pytest.mark.asyncio
+    async def test_fractional_exp_is_accepted(self, keycloak_client, make_token):
+        # Arrange
+        exp = time.time() + 300.5
+        token = make_token(exp=exp)
+
+        # Act
+        result = await keycloak_client.verify_token(token)
+
+        # Assert
+        assert result.exp == exp
+
+
 
 class TestAudienceValidation:
 
@@ -130,3 +152,32 @@ class TestAudienceValidation:
 
         # Assert
         assert result.sub == "user"
+
+
+class TestCryptographyBackend:
+
+    @pytest.mark.asyncio
+    async def test_verifies_token_with_cryptography_backend(self, keycloak_settings, jwks_response, openid_configuration, make_token):
+        # Arrange
+        keycloak_settings.jwt_backend = "cryptography"
+        client = KeycloakClient(keycloak_settings)
+        client._jwks = jwks_response
+        client._openid_configuration = openid_configuration
+
+        # Act
+        result = await client.verify_token(make_token(sub="user-abc-123"))
+
+        # Assert
+        assert client.jwt_backend.name == "cryptography"
+        assert result.sub == "user-abc-123"
+
+    @pytest.mark.asyncio
+    async def test_expired_token_raises_with_cryptography_backend(self, keycloak_settings, jwks_response, make_token):
+        # Arrange
+        keycloak_settings.jwt_backend = "cryptography"
+        client = KeycloakClient(keycloak_settings)
+        client._jwks = jwks_response
+
+        # Act & Assert
+        with pytest.raises(JWTError):
+            await client.verify_token(make_token(expires_in=-10))
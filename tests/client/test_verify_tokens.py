@@ -0,0 +1,177 @@
+"""Tests for KeycloakClient.verify_tokens batch verification."""
+
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from jose import JWTError, jwt
+from jose.exceptions import ExpiredSignatureError
+
+from fastapi_keycloak_auth.cache import TokenCache
+from fastapi_keycloak_auth.cache_backends import MemoryCacheBackend
+from fastapi_keycloak_auth.executor import VerifyExecutor
+from fastapi_keycloak_auth.models import TokenPayload
+
+
+class TestVerifyTokens:
+
+    @pytest.mark.asyncio
+    async def test_returns_payload_per_token(self, keycloak_client, make_token):
+        # Arrange
+        tokens = [make_token(sub="user-1"), make_token(sub="user-2")]
+
+        # Act
+        results = await keycloak_client.verify_tokens(tokens)
+
+        # Assert
+        assert list(results) == tokens
+        assert [results[token].sub for token in tokens] == ["user-1", "user-2"]
+
+    @pytest.mark.asyncio
+    async def test_invalid_tokens_do_not_fail_batch(self, keycloak_client, make_token):
+        # Arrange
+        valid = make_token()
+        expired = make_token(expires_in=-60)
+        garbage = "not-a-token"
+
+        # Act
+        results = await keycloak_client.verify_tokens([valid, expired, garbage])
+
+        # Assert
+        assert isinstance(results[valid], TokenPayload)
+        assert isinstance(results[expired], ExpiredSignatureError)
+        assert isinstance(results[garbage], JWTError)
+
+    @pytest.mark.asyncio
+    async def test_duplicate_tokens_are_verified_once(self, keycloak_client, make_token):
+        # Arrange
+        token = make_token()
+        verify = keycloak_client.jwt_backend.verify
+
+        # Act
+        with patch.object(keycloak_client.jwt_backend, "verify", side_effect=verify) as mock_verify:
+            results = await keycloak_client.verify_tokens([token, token, token])
+
+        # Assert
+        assert list(results) == [token]
+        mock_verify.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_signing_key_looked_up_once_per_kid(self, keycloak_client, make_token):
+        # Arrange
+        tokens = [make_token(sub=f"user-{i}") for i in range(5)]
+        get_signing_key = keycloak_client.get_signing_key
+
+        # Act
+        with patch.object(keycloak_client, "get_signing_key", side_effect=get_signing_key) as mock_get:
+            await keycloak_client.verify_tokens(tokens)
+
+        # Assert
+        mock_get.assert_awaited_once_with("test-key-id")
+
+    @pytest.mark.asyncio
+    async def test_unknown_kid_fails_only_its_group(self, keycloak_client, make_token, rsa_keypair):
+        # Arrange
+        valid = make_token()
+        unknown = jwt.encode(
+            {"sub": "x", "iss": keycloak_client.settings.issuer},
+            rsa_keypair["private_pem"],
+            algorithm="RS256",
+            headers={"kid": "unknown-kid"},
+        )
+
+        # Act
+        with patch.object(keycloak_client, "_jwks_refetch_allowed", return_value=False):
+            results = await keycloak_client.verify_tokens([valid, unknown])
+
+        # Assert
+        assert isinstance(results[valid], TokenPayload)
+        assert isinstance(results[unknown], JWTError)
+        assert "Unknown signing key" in str(results[unknown])
+
+    @pytest.mark.asyncio
+    async def test_jwks_fetch_error_is_returned_per_token(self, keycloak_client, make_token):
+        # Arrange
+        token = make_token()
+        error = httpx.ConnectError("unreachable")
+
+        # Act
+        with patch.object(keycloak_client, "get_signing_key", side_effect=error):
+            results = await keycloak_client.verify_tokens([token])
+
+        # Assert
+        assert results[token] is error
+
+    @pytest.mark.asyncio
+    async def test_malformed_jwks_is_returned_per_token(self, keycloak_client, make_token):
+        # Arrange: one token is cached, the JWKS for the others is an HTML error page
+        keycloak_client.token_cache = TokenCache(max_size=10)
+        cached = make_token(sub="cached")
+        await keycloak_client.verify_token(cached)
+        keycloak_client._jwks = None
+        keycloak_client._signing_keys = {}
+        keycloak_client._jwks_fetched_at = None
+        keycloak_client._http_client = AsyncMock(is_closed=False)
+        keycloak_client._http_client.get.return_value = httpx.Response(
+            200, text="<html>Bad Gateway</html>", request=httpx.Request("GET", "https://fake"),
+        )
+        token = make_token(sub="new")
+
+        # Act
+        results = await keycloak_client.verify_tokens([cached, token])
+
+        # Assert
+        assert results[cached].sub == "cached"
+        assert isinstance(results[token], ValueError)
+
+    @pytest.mark.asyncio
+    async def test_cached_tokens_skip_verification(self, keycloak_client, make_token):
+        # Arrange
+        keycloak_client.token_cache = TokenCache(max_size=10)
+        token = make_token()
+        await keycloak_client.verify_token(token)
+
+        # Act
+        with patch.object(keycloak_client, "get_signing_key") as mock_get:
+            results = await keycloak_client.verify_tokens([token])
+
+        # Assert
+        assert isinstance(results[token], TokenPayload)
+        mock_get.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_backend_looked_up_in_one_call(self, keycloak_client, make_token):
+        # Arrange
+        keycloak_client.cache_backend = MemoryCacheBackend()
+        verified = make_token(sub="verified")
+        await keycloak_client.verify_token(verified)
+        tokens = [verified, make_token(sub="new-1"), make_token(sub="new-2")]
+
+        # Act
+        with patch.object(keycloak_client.cache_backend, "get_many", wraps=keycloak_client.cache_backend.get_many) as get_many:
+            results = await keycloak_client.verify_tokens(tokens)
+
+        # Assert
+        get_many.assert_called_once_with([keycloak_client._token_key(token) for token in tokens])
+        assert [results[token].sub for token in tokens] == ["verified", "new-1", "new-2"]
+
+    @pytest.mark.asyncio
+    async def test_runs_in_verify_executor(self, keycloak_client, make_token):
+        # Arrange
+        keycloak_client.verify_executor = VerifyExecutor("thread", max_workers=2)
+        tokens = [make_token(sub=f"user-{i}") for i in range(4)]
+
+        # Act
+        try:
+            results = await keycloak_client.verify_tokens(tokens)
+        finally:
+            keycloak_client.verify_executor.shutdown()
+
+        # Assert
+        assert all(isinstance(result, TokenPayload) for result in results.values())
+        assert keycloak_client.verify_executor.stats.completed == 4
+
+    @pytest.mark.asyncio
+    async def test_empty_batch(self, keycloak_client):
+        # Act & Assert
+        assert await keycloak_client.verify_tokens([]) == {}
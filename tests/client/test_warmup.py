@@ -0,0 +1,85 @@
+"""Tests for KeycloakClient.warmup() and is_ready."""
+
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from fastapi_keycloak_auth.client import KeycloakClient
+
+
+def _mock_http_client(responses: dict) -> AsyncMock:
+    async def get(url, **kwargs):
+        return httpx.Response(200, json=responses[url], request=httpx.Request("GET", url))
+
+    mock_http = AsyncMock()
+    mock_http.is_closed = False
+    mock_http.get.side_effect = get
+    return mock_http
+
+
+class TestWarmup:
+
+    @pytest.mark.asyncio
+    async def test_warmup_loads_configuration_and_keys(self, keycloak_settings, openid_configuration, jwks_response):
+        # Arrange
+        client = KeycloakClient(keycloak_settings)
+        client._http_client = _mock_http_client({
+            keycloak_settings.configuration_url: openid_configuration.model_dump(),
+            openid_configuration.jwks_uri: jwks_response,
+        })
+
+        # Act
+        result = await client.warmup()
+
+        # Assert
+        assert result is True
+        assert client.is_ready is True
+        assert "test-key-id" in client._signing_keys
+
+    @pytest.mark.asyncio
+    async def test_warmup_returns_false_on_http_error(self, keycloak_settings):
+        # Arrange
+        client = KeycloakClient(keycloak_settings)
+        mock_http = AsyncMock()
+        mock_http.is_closed = False
+        mock_http.get.side_effect = httpx.ConnectError("connection refused")
+        client._http_client = mock_http
+
+        # Act
+        result = await client.warmup()
+
+        # Assert
+        assert result is False
+        assert client.is_ready is False
+
+    @pytest.mark.asyncio
+    async def test_warmup_with_preloaded_caches_makes_no_requests(self, keycloak_client):
+        # Arrange
+        mock_http = AsyncMock()
+        mock_http.is_closed = False
+        keycloak_client._http_client = mock_http
+
+        # Act
+        result = await keycloak_client.warmup()
+
+        # Assert
+        assert result is True
+        mock_http.get.assert_not_called()
+
+
+class TestIsReady:
+
+    def test_not_ready_before_warmup(self, keycloak_settings):
+        # Arrange
+        client = KeycloakClient(keycloak_settings)
+
+        # Assert
+        assert client.is_ready is False
+
+    def test_not_ready_after_clearing_jwks(self, keycloak_client):
+        # Act
+        keycloak_client.clear_jwks_cache()
+
+        # Assert
+        assert keycloak_client.is_ready is False
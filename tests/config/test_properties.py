@@ -91,3 +91,21 @@ class TestSslContext:
 
         # Assert
         assert ctx == "/path/to/ca.pem"
+
+
+class TestAllowedAlgorithms:
+
+    def test_default_allows_asymmetric_algorithms_only(self, keycloak_settings):
+        # Act
+        algorithms = keycloak_settings.allowed_algorithms
+
+        # Assert
+        assert {"RS256", "ES256", "EdDSA"} <= algorithms
+        assert not any(alg.startswith("HS") or alg == "none" for alg in algorithms)
+
+    def test_accepts_comma_and_space_separated_values(self, keycloak_settings):
+        # Arrange
+        keycloak_settings.jwt_algorithms = "ES256, EdDSA RS256"
+
+        # Act & Assert
+        assert keycloak_settings.allowed_algorithms == {"ES256", "EdDSA", "RS256"}
@@ -38,6 +38,8 @@ class TestSettingsFromEnv:
         assert keycloak_settings.cookie_samesite == "lax"
         assert keycloak_settings.ssl_verify is True
         assert keycloak_settings.scopes == "openid email profile"
+        assert keycloak_settings.cookie_compression is False
+        assert keycloak_settings.cookie_chunk_size == 0
 
     def test_custom_cookie_settings(self, monkeypatch):
         # Arrange
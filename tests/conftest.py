@@ -17,8 +17,10 @@ os.environ.setdefault("KEYCLOAK_CLIENT_SECRET", TEST_CLIENT_SECRET)
 os.environ.setdefault("KEYCLOAK_AUDIENCE", TEST_AUDIENCE)
 
 import pytest
-from cryptography.hazmat.primitives.asymmetric import rsa
-from cryptography.hazmat.primitives import serialization
+import pytest_asyncio
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from cryptography.hazmat.primitives.asymmetric.utils import decode_dss_signature
+from cryptography.hazmat.primitives import hashes, serialization
 from jose import jwt
 
 from fastapi_keycloak_auth.config import KeycloakSettings
@@ -43,9 +45,8 @@ def keycloak_settings(monkeypatch) -> KeycloakSettings:
 # RSA Keys & JWT
 # =============================================================================
 
-@pytest.fixture(scope="session")
-def rsa_keypair():
-    """Generate RSA key pair for JWT signing (session-scoped for speed)."""
+def _generate_rsa_keypair(kid: str) -> dict:
+    """Generate an RSA key pair and the matching public JWK."""
     private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
     public_key = private_key.public_key()
 
@@ -67,7 +68,7 @@ def rsa_keypair():
         "kty": "RSA",
         "use": "sig",
         "alg": "RS256",
-        "kid": "test-key-id",
+        "kid": kid,
         "n": _int_to_base64url(public_numbers.n),
         "e": _int_to_base64url(public_numbers.e),
     }
@@ -75,6 +76,72 @@ def rsa_keypair():
     return {"private_pem": private_pem, "jwk": jwk}
 
 
+@pytest.fixture(scope="session")
+def rsa_keypair():
+    """Generate RSA key pair for JWT signing (session-scoped for speed)."""
+    return _generate_rsa_keypair("test-key-id")
+
+
+@pytest.fixture(scope="session")
+def rotated_rsa_keypair():
+    """Second RSA key pair, simulating a key rotated in by Keycloak."""
+    return _generate_rsa_keypair("rotated-key-id")
+
+
+def _base64url(data: bytes) -> str:
+    import base64
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+@pytest.fixture(scope="session")
+def ec_keypair():
+    """P-256 key pair and public JWK for ES256 tokens."""
+    private_key = ec.generate_private_key(ec.SECP256R1())
+    numbers = private_key.public_key().public_numbers()
+    jwk = {
+        "kty": "EC",
+        "use": "sig",
+        "alg": "ES256",
+        "crv": "P-256",
+        "kid": "ec-key-id",
+        "x": _base64url(numbers.x.to_bytes(32, "big")),
+        "y": _base64url(numbers.y.to_bytes(32, "big")),
+    }
+    return {"private_key": private_key, "jwk": jwk}
+
+
+@pytest.fixture(scope="session")
+def ed25519_keypair():
+    """Ed25519 key pair and public JWK for EdDSA tokens."""
+    private_key = ed25519.Ed25519PrivateKey.generate()
+    public_bytes = private_key.public_key().public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+    jwk = {"kty": "OKP", "use": "sig", "alg": "EdDSA", "crv": "Ed25519", "kid": "ed-key-id", "x": _base64url(public_bytes)}
+    return {"private_key": private_key, "jwk": jwk}
+
+
+@pytest.fixture
+def sign_token(keycloak_settings):
+    """Sign claims with an EC or Ed25519 private key (python-jose cannot sign EdDSA)."""
+    import json
+
+    def _sign(private_key, algorithm: str, kid: str | None, claims: dict | None = None, expires_in: int = 300) -> str:
+        now = int(time.time())
+        payload = {"sub": "test-user-id", "iss": keycloak_settings.issuer, "iat": now, "exp": now + expires_in}
+        payload.update(claims or {})
+        header = {"alg": algorithm, "typ": "JWT"}
+        if kid is not None:
+            header["kid"] = kid
+        signing_input = f"{_base64url(json.dumps(header).encode())}.{_base64url(json.dumps(payload).encode())}"
+        if isinstance(private_key, ec.EllipticCurvePrivateKey):
+            r, s = decode_dss_signature(private_key.sign(signing_input.encode(), ec.ECDSA(hashes.SHA256())))
+            signature = r.to_bytes(32, "big") + s.to_bytes(32, "big")
+        else:
+            signature = private_key.sign(signing_input.encode())
+        return f"{signing_input}.{_base64url(signature)}"
+
+    return _sign
+
+
 @pytest.fixture
 def jwks_response(rsa_keypair) -> dict:
     """JWKS JSON matching the RSA key pair."""
@@ -168,10 +235,26 @@ def keycloak_client(keycloak_settings, jwks_response, openid_configuration) -> K
     """KeycloakClient with pre-loaded JWKS and OpenID config (no HTTP calls)."""
     client = KeycloakClient(keycloak_settings)
     client._jwks = jwks_response
+    client._jwks_fetched_at = time.monotonic()
     client._openid_configuration = openid_configuration
     return client
 
 
+# =============================================================================
+# Cache backends
+# =============================================================================
+
+@pytest_asyncio.fixture
+async def fake_redis():
+    """Local server speaking the Redis protocol."""
+    from tests.fake_redis import FakeRedisServer
+
+    server = FakeRedisServer()
+    await server.start()
+    yield server
+    await server.stop()
+
+
 # =============================================================================
 # Autouse: reset singletons between tests
 # =============================================================================
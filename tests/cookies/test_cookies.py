@@ -0,0 +1,177 @@
+"""Tests for the token cookie helpers."""
+
+import base64
+import zlib
+
+import pytest
+from starlette.responses import Response
+
+from fastapi_keycloak_auth.cookies import (
+    COMPRESSED_PREFIX,
+    MAX_TOKEN_SIZE,
+    compress_token,
+    decompress_token,
+    delete_cookie_headers,
+    delete_token_cookies,
+    read_token_cookie,
+    set_token_cookies,
+    token_cookie_headers,
+    token_cookie_values,
+)
+from fastapi_keycloak_auth.models import TokenResponse
+
+
+def _tokens(refresh_token: str | None = "refresh") -> TokenResponse:
+    return TokenResponse(access_token="access", refresh_token=refresh_token, expires_in=120)
+
+
+class TestTokenCookies:
+
+    def test_sets_both_cookies_with_settings(self, keycloak_settings):
+        # Arrange
+        keycloak_settings.cookie_secure = True
+        response = Response()
+
+        # Act
+        set_token_cookies(response, _tokens(), keycloak_settings)
+
+        # Assert
+        access, refresh = response.headers.getlist("set-cookie")
+        assert access.startswith(f"{keycloak_settings.cookie_name}=access;")
+        assert "Max-Age=120" in access
+        assert "HttpOnly" in access and "Secure" in access and "SameSite=lax" in access
+        assert refresh.startswith(f"{keycloak_settings.refresh_cookie_name}=refresh;")
+
+    def test_skips_refresh_cookie_without_refresh_token(self, keycloak_settings):
+        # Arrange
+        response = Response()
+
+        # Act
+        set_token_cookies(response, _tokens(refresh_token=None), keycloak_settings)
+
+        # Assert
+        assert len(response.headers.getlist("set-cookie")) == 1
+
+    def test_deletes_both_cookies(self, keycloak_settings):
+        # Arrange
+        response = Response()
+
+        # Act
+        delete_token_cookies(response, keycloak_settings)
+
+        # Assert
+        assert all("Max-Age=0" in cookie for cookie in response.headers.getlist("set-cookie"))
+        assert len(response.headers.getlist("set-cookie")) == 2
+
+    def test_raw_headers_match_response_cookies(self, keycloak_settings):
+        # Arrange
+        response = Response()
+        set_token_cookies(response, _tokens(), keycloak_settings)
+
+        # Act
+        headers = token_cookie_headers(_tokens(), keycloak_settings)
+
+        # Assert
+        assert [value.decode() for _, value in headers] == response.headers.getlist("set-cookie")
+        assert {name for name, _ in headers} == {b"set-cookie"}
+        assert len(delete_cookie_headers(keycloak_settings)) == 2
+
+
+class TestCompression:
+
+    def test_round_trip_jwt(self, make_token):
+        # Arrange
+        token = make_token(realm_roles=[f"role-{i}" for i in range(100)])
+
+        # Act
+        value = compress_token(token)
+
+        # Assert
+        assert value.startswith(COMPRESSED_PREFIX)
+        assert len(value) < len(token) * 0.7
+        assert decompress_token(value) == token
+
+    @pytest.mark.parametrize("token", ["opaque-refresh-token", "a.b", "eyJ=.x.y", "a.b.c.d"])
+    def test_round_trip_non_jwt(self, token):
+        # Act & Assert
+        assert decompress_token(compress_token(token)) == token
+
+    def test_plain_value_is_returned_unchanged(self):
+        # Act & Assert
+        assert decompress_token("eyJhbGciOi.x.y") == "eyJhbGciOi.x.y"
+
+    @pytest.mark.parametrize("value", ["z.not-zlib", "z." + base64.urlsafe_b64encode(zlib.compress(b"\x05x")).decode()])
+    def test_malformed_value_raises(self, value):
+        # Act & Assert
+        with pytest.raises(ValueError):
+            decompress_token(value)
+
+    def test_oversized_value_raises(self):
+        # Arrange
+        bomb = zlib.compress(b"\x00" + b"a" * (MAX_TOKEN_SIZE * 4))
+        value = "z." + base64.urlsafe_b64encode(bomb).decode().rstrip("=")
+
+        # Act & Assert
+        with pytest.raises(ValueError, match="too large"):
+            decompress_token(value)
+
+
+class TestChunking:
+
+    def test_short_value_is_one_cookie(self, keycloak_settings):
+        # Act & Assert
+        assert token_cookie_values("access_token", "abc", keycloak_settings) == [("access_token", "abc")]
+
+    def test_long_value_is_split_and_reassembled(self, keycloak_settings):
+        # Arrange
+        keycloak_settings.cookie_chunk_size = 10
+        token = "x" * 25
+
+        # Act
+        cookies = dict(token_cookie_values("access_token", token, keycloak_settings))
+
+        # Assert
+        assert cookies == {
+            "access_token": "chunks-3",
+            "access_tokenC1": "x" * 10,
+            "access_tokenC2": "x" * 10,
+            "access_tokenC3": "x" * 5,
+        }
+        assert read_token_cookie(cookies, "access_token") == token
+
+    def test_compressed_and_chunked_round_trip(self, keycloak_settings, make_token):
+        # Arrange
+        keycloak_settings.cookie_compression = True
+        keycloak_settings.cookie_chunk_size = 100
+        token = make_token()
+
+        # Act
+        cookies = dict(token_cookie_values("access_token", token, keycloak_settings))
+
+        # Assert
+        assert len(cookies) > 2
+        assert read_token_cookie(cookies, "access_token") == token
+
+    @pytest.mark.parametrize("cookies", [
+        {},
+        {"access_token": ""},
+        {"access_token": "chunks-2", "access_tokenC1": "x"},
+        {"access_token": "chunks-x"},
+        {"access_token": "chunks-1000"},
+        {"access_token": "chunks-\u00b2", "access_tokenC1": "x", "access_tokenC2": "x"},
+        {"access_token": "z.garbage"},
+    ])
+    def test_missing_or_malformed_cookie_returns_none(self, cookies):
+        # Act & Assert
+        assert read_token_cookie(cookies, "access_token") is None
+
+    def test_delete_removes_present_chunks(self, keycloak_settings):
+        # Arrange
+        present = ["access_token", "access_tokenC1", "access_tokenC2", "refresh_tokenC1", "access_tokenCx", "other"]
+
+        # Act
+        headers = [value.decode() for _, value in delete_cookie_headers(keycloak_settings, present)]
+
+        # Assert
+        deleted = {header.split("=", 1)[0] for header in headers}
+        assert deleted == {"access_token", "refresh_token", "access_tokenC1", "access_tokenC2", "refresh_tokenC1"}
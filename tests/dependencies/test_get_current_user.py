@@ -1,22 +1,24 @@
 """Tests for get_current_user dependency."""
 
-from unittest.mock import AsyncMock, patch
+from unittest.mock import patch
 
 import pytest
 from fastapi import HTTPException
+from starlette.requests import Request
 from starlette.testclient import TestClient
 
+from fastapi_keycloak_auth.cookies import token_cookie_values
 from fastapi_keycloak_auth.dependencies import get_current_user, get_current_user_optional
 from fastapi_keycloak_auth.events import AuthEvent, auth_events
 from fastapi_keycloak_auth.models import TokenPayload
 
 
 def _make_request(cookies=None, headers=None):
-    """Create a mock Request with optional cookies and headers."""
-    request = AsyncMock()
-    request.cookies = cookies or {}
-    request.headers = headers or {}
-    return request
+    """Create a Request with optional cookies and headers."""
+    raw_headers = [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]
+    if cookies:
+        raw_headers.append((b"cookie", "; ".join(f"{k}={v}" for k, v in cookies.items()).encode()))
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw_headers})
 
 
 class TestTokenExtraction:
@@ -36,6 +38,22 @@ class TestTokenExtraction:
         assert isinstance(result, TokenPayload)
         assert result.sub == "test-user-id"
 
+    @pytest.mark.asyncio
+    async def test_extracts_compressed_chunked_cookie(self, keycloak_settings, keycloak_client, make_token):
+        # Arrange
+        keycloak_settings.cookie_compression = True
+        keycloak_settings.cookie_chunk_size = 200
+        token = make_token(sub="chunked-user")
+        request = _make_request(cookies=dict(token_cookie_values(keycloak_settings.cookie_name, token, keycloak_settings)))
+
+        with patch("fastapi_keycloak_auth.dependencies._settings", keycloak_settings), \
+             patch("fastapi_keycloak_auth.dependencies._client", keycloak_client):
+            # Act
+            result = await get_current_user(request)
+
+        # Assert
+        assert result.sub == "chunked-user"
+
     @pytest.mark.asyncio
     async def test_extracts_token_from_authorization_header(self, keycloak_settings, keycloak_client, make_token):
         # Arrange
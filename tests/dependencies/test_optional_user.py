@@ -1,8 +1,11 @@
 """Tests for get_current_user_optional dependency."""
 
-from unittest.mock import AsyncMock, patch
+import base64
+import json
+from unittest.mock import patch
 
 import pytest
+from starlette.requests import Request
 
 from fastapi_keycloak_auth.dependencies import get_current_user_optional
 from fastapi_keycloak_auth.events import AuthEvent, auth_events
@@ -10,10 +13,18 @@ from fastapi_keycloak_auth.models import TokenPayload
 
 
 def _make_request(cookies=None, headers=None):
-    request = AsyncMock()
-    request.cookies = cookies or {}
-    request.headers = headers or {}
-    return request
+    """Create a Request with optional cookies and headers."""
+    raw_headers = [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]
+    if cookies:
+        raw_headers.append((b"cookie", "; ".join(f"{k}={v}" for k, v in cookies.items()).encode()))
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw_headers})
+
+
+def _forged_token(header: str, payload: str) -> str:
+    """Unsigned token from raw JSON text, as an attacker could send it."""
+    def encode(text: str) -> str:
+        return base64.urlsafe_b64encode(text.encode()).rstrip(b"=").decode()
+    return f"{encode(header)}.{encode(payload)}.{encode('signature')}"
 
 
 class TestOptionalUserWithToken:
@@ -103,3 +114,55 @@ class TestOptionalUserEvents:
         # Assert
         assert len(received) == 1
         assert received[0].token == "bad-token"
+
+
+class TestOptionalUserForgedTokens:
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("header, payload", [
+        ('{"alg": ["RS256"], "kid": "test-key-id"}', '{"sub": "user"}'),
+        ('{"alg": "RS256", "kid": "test-key-id"}', '{"sub": "user", "exp": 1e999}'),
+        ('{"alg": "RS256", "kid": "test-key-id"}', '{"sub": "user", "nbf": 1e999}'),
+        ('{"alg": "RS256", "kid": "test-key-id"}', '{"sub": "user", "iat": -1e999}'),
+    ])
+    async def test_malformed_header_or_claims_return_none(self, keycloak_settings, keycloak_client, header, payload):
+        # Arrange
+        request = _make_request(cookies={keycloak_settings.cookie_name: _forged_token(header, payload)})
+
+        with patch("fastapi_keycloak_auth.dependencies._settings", keycloak_settings), \
+             patch("fastapi_keycloak_auth.dependencies._client", keycloak_client):
+            # Act
+            result = await get_current_user_optional(request)
+
+        # Assert
+        assert result is None
+
+    @pytest.mark.asyncio
+    async def test_list_azp_returns_none(self, keycloak_settings, keycloak_client):
+        # Arrange
+        keycloak_client.validator.authorized_parties = frozenset({"frontend"})
+        payload = json.dumps({"sub": "user", "iss": keycloak_settings.issuer, "azp": ["frontend"]})
+        token = _forged_token('{"alg": "RS256", "kid": "test-key-id"}', payload)
+        request = _make_request(cookies={keycloak_settings.cookie_name: token})
+
+        with patch("fastapi_keycloak_auth.dependencies._settings", keycloak_settings), \
+             patch("fastapi_keycloak_auth.dependencies._client", keycloak_client):
+            # Act
+            result = await get_current_user_optional(request)
+
+        # Assert
+        assert result is None
+
+    @pytest.mark.asyncio
+    async def test_non_ascii_chunk_count_returns_none(self, keycloak_settings, keycloak_client):
+        # Arrange: a latin-1 superscript two, which str.isdigit() accepts
+        cookie = keycloak_settings.cookie_name.encode() + b"=chunks-\xb2"
+        request = Request({"type": "http", "method": "GET", "path": "/", "headers": [(b"cookie", cookie)]})
+
+        with patch("fastapi_keycloak_auth.dependencies._settings", keycloak_settings), \
+             patch("fastapi_keycloak_auth.dependencies._client", keycloak_client):
+            # Act
+            result = await get_current_user_optional(request)
+
+        # Assert
+        assert result is None
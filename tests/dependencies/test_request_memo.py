@@ -0,0 +1,133 @@
+"""Tests for per-request memoization of authentication."""
+
+from unittest.mock import patch
+
+import pytest
+from fastapi import Depends, FastAPI
+from starlette.requests import Request
+from starlette.testclient import TestClient
+
+from fastapi_keycloak_auth.dependencies import (
+    CurrentUser,
+    OptionalUser,
+    RequestAuth,
+    authenticate_request,
+    get_current_user,
+    require_policy,
+    require_role,
+)
+from fastapi_keycloak_auth.events import AuthEvent, auth_events
+from fastapi_keycloak_auth.policy import all_of
+
+
+@pytest.fixture
+def stacked_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/stacked")
+    async def stacked(
+        user: CurrentUser,
+        optional: OptionalUser,
+        admin=Depends(require_role("admin")),
+        editor=Depends(require_policy(all_of("client:my-api:editor"))),
+    ):
+        return {"sub": user.sub, "same": user is optional is admin is editor}
+
+    return app
+
+
+def _make_request(cookies=None, headers=None):
+    """Create a Request with optional cookies and headers."""
+    raw_headers = [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]
+    if cookies:
+        raw_headers.append((b"cookie", "; ".join(f"{k}={v}" for k, v in cookies.items()).encode()))
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw_headers})
+
+
+class TestRequestMemoization:
+
+    def test_stacked_dependencies_verify_once(self, stacked_app, keycloak_settings, keycloak_client, make_token):
+        # Arrange
+        token = make_token(realm_roles=["admin"], resource_access={"my-api": {"roles": ["editor"]}})
+        received = []
+
+        @auth_events.on(AuthEvent.TOKEN_VERIFIED)
+        async def handler(data):
+            received.append(data)
+
+        with patch("fastapi_keycloak_auth.dependencies._settings", keycloak_settings), \
+             patch("fastapi_keycloak_auth.dependencies._client", keycloak_client), \
+             patch.object(keycloak_client, "verify_token", wraps=keycloak_client.verify_token) as mock_verify:
+            # Act
+            response = TestClient(stacked_app).get("/stacked", headers={"Authorization": f"Bearer {token}"})
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json() == {"sub": "test-user-id", "same": True}
+        mock_verify.assert_awaited_once_with(token)
+        assert len(received) == 1
+
+    def test_invalid_token_verified_once(self, stacked_app, keycloak_settings, keycloak_client):
+        # Arrange
+        received = []
+
+        @auth_events.on(AuthEvent.TOKEN_INVALID)
+        async def handler(data):
+            received.append(data)
+
+        with patch("fastapi_keycloak_auth.dependencies._settings", keycloak_settings), \
+             patch("fastapi_keycloak_auth.dependencies._client", keycloak_client), \
+             patch.object(keycloak_client, "verify_token", wraps=keycloak_client.verify_token) as mock_verify:
+            # Act
+            response = TestClient(stacked_app).get("/stacked", headers={"Authorization": "Bearer invalid"})
+
+        # Assert
+        assert response.status_code == 401
+        mock_verify.assert_awaited_once()
+        assert len(received) == 1
+
+    def test_each_request_is_verified(self, stacked_app, keycloak_settings, keycloak_client, make_token):
+        # Arrange
+        token = make_token(realm_roles=["admin"], resource_access={"my-api": {"roles": ["editor"]}})
+
+        with patch("fastapi_keycloak_auth.dependencies._settings", keycloak_settings), \
+             patch("fastapi_keycloak_auth.dependencies._client", keycloak_client), \
+             patch.object(keycloak_client, "verify_token", wraps=keycloak_client.verify_token) as mock_verify:
+            # Act
+            client = TestClient(stacked_app)
+            client.get("/stacked", headers={"Authorization": f"Bearer {token}"})
+            client.get("/stacked", headers={"Authorization": f"Bearer {token}"})
+
+        # Assert
+        assert mock_verify.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_result_stored_on_request_state(self, keycloak_settings, keycloak_client, make_token):
+        # Arrange
+        token = make_token()
+        request = _make_request(cookies={keycloak_settings.cookie_name: token})
+
+        with patch("fastapi_keycloak_auth.dependencies._settings", keycloak_settings), \
+             patch("fastapi_keycloak_auth.dependencies._client", keycloak_client):
+            # Act
+            user = await get_current_user(request)
+            auth = await authenticate_request(request)
+
+        # Assert
+        assert isinstance(request.state.keycloak_auth, RequestAuth)
+        assert auth.user is user
+        assert auth.token == token
+
+    @pytest.mark.asyncio
+    async def test_memo_ignored_for_different_token(self, keycloak_settings, keycloak_client, make_token):
+        # Arrange
+        request = _make_request(cookies={keycloak_settings.cookie_name: make_token(sub="new-user")})
+        request.state.keycloak_auth = RequestAuth(token="other-token", user=None)
+
+        with patch("fastapi_keycloak_auth.dependencies._settings", keycloak_settings), \
+             patch("fastapi_keycloak_auth.dependencies._client", keycloak_client):
+            # Act
+            user = await get_current_user(request)
+
+        # Assert
+        assert user.sub == "new-user"
@@ -1,18 +1,21 @@
-"""Tests for require_role and require_any_role dependencies."""
+"""Tests for require_role, require_any_role and require_policy dependencies."""
 
-from unittest.mock import AsyncMock, patch
+from unittest.mock import patch
 
 import pytest
 from fastapi import HTTPException
+from starlette.requests import Request
 
-from fastapi_keycloak_auth.dependencies import require_role, require_any_role
+from fastapi_keycloak_auth.dependencies import require_role, require_any_role, require_policy
+from fastapi_keycloak_auth.policy import all_of, any_of, none_of
 
 
 def _make_request(cookies=None, headers=None):
-    request = AsyncMock()
-    request.cookies = cookies or {}
-    request.headers = headers or {}
-    return request
+    """Create a Request with optional cookies and headers."""
+    raw_headers = [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]
+    if cookies:
+        raw_headers.append((b"cookie", "; ".join(f"{k}={v}" for k, v in cookies.items()).encode()))
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw_headers})
 
 
 class TestRequireRole:
@@ -90,3 +93,48 @@ class TestRequireAnyRole:
             with pytest.raises(HTTPException) as exc_info:
                 await checker(request)
             assert exc_info.value.status_code == 403
+
+
+class TestRequirePolicy:
+
+    @pytest.mark.asyncio
+    async def test_allows_user_matching_policy(self, keycloak_settings, keycloak_client, make_token):
+        # Arrange
+        token = make_token(
+            realm_roles=["user"],
+            resource_access={"my-api": {"roles": ["editor"]}},
+            groups=["/staff"],
+            scope="openid orders:write",
+        )
+        request = _make_request(cookies={keycloak_settings.cookie_name: token})
+        checker = require_policy(
+            all_of("client:my-api:editor", "scope:orders:write") & any_of("group:/staff", "admin") & none_of("suspended")
+        )
+
+        with patch("fastapi_keycloak_auth.dependencies._settings", keycloak_settings), \
+             patch("fastapi_keycloak_auth.dependencies._client", keycloak_client):
+            # Act
+            result = await checker(request)
+
+        # Assert
+        assert result.groups == ["/staff"]
+        assert "scope:orders:write" in result.grants
+
+    @pytest.mark.asyncio
+    async def test_raises_403_for_forbidden_role(self, keycloak_settings, keycloak_client, make_token):
+        # Arrange
+        token = make_token(realm_roles=["user", "suspended"])
+        request = _make_request(cookies={keycloak_settings.cookie_name: token})
+        checker = require_policy(all_of("user") & none_of("suspended"))
+
+        with patch("fastapi_keycloak_auth.dependencies._settings", keycloak_settings), \
+             patch("fastapi_keycloak_auth.dependencies._client", keycloak_client):
+            # Act & Assert
+            with pytest.raises(HTTPException) as exc_info:
+                await checker(request)
+            assert exc_info.value.status_code == 403
+
+    def test_invalid_term_fails_at_definition(self):
+        # Act & Assert
+        with pytest.raises(ValueError):
+            require_policy(all_of("team:x"))
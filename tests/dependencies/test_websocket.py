@@ -0,0 +1,84 @@
+"""Tests for the auth dependencies on WebSocket routes."""
+
+from unittest.mock import patch
+
+import pytest
+from fastapi import Depends, FastAPI, WebSocket
+from starlette.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from fastapi_keycloak_auth.dependencies import CurrentUser, OptionalUser, require_role
+from fastapi_keycloak_auth.extractors import TokenExtractor
+
+
+@pytest.fixture
+def app(keycloak_settings, keycloak_client):
+    keycloak_settings.token_sources = "bearer query"
+    keycloak_client.token_extractor = TokenExtractor.from_settings(keycloak_settings)
+    application = FastAPI()
+
+    @application.websocket("/ws")
+    async def ws(websocket: WebSocket, user: CurrentUser):
+        await websocket.accept()
+        await websocket.send_json({"sub": user.sub})
+        await websocket.close()
+
+    @application.websocket("/ws/optional")
+    async def ws_optional(websocket: WebSocket, user: OptionalUser):
+        await websocket.accept()
+        await websocket.send_json({"sub": user.sub if user else None})
+        await websocket.close()
+
+    @application.websocket("/ws/admin")
+    async def ws_admin(websocket: WebSocket, user=Depends(require_role("admin"))):
+        await websocket.accept()
+        await websocket.close()
+
+    with patch("fastapi_keycloak_auth.dependencies._settings", keycloak_settings), \
+         patch("fastapi_keycloak_auth.dependencies._client", keycloak_client):
+        yield application
+
+
+class TestWebSocketDependencies:
+
+    def test_current_user_from_query_param(self, app, make_token):
+        # Act
+        with TestClient(app).websocket_connect(f"/ws?access_token={make_token(sub='ws-user')}") as websocket:
+            message = websocket.receive_json()
+
+        # Assert
+        assert message == {"sub": "ws-user"}
+
+    def test_current_user_from_bearer_header(self, app, make_token):
+        # Act
+        headers = {"Authorization": f"Bearer {make_token(sub='ws-user')}"}
+        with TestClient(app).websocket_connect("/ws", headers=headers) as websocket:
+            message = websocket.receive_json()
+
+        # Assert
+        assert message == {"sub": "ws-user"}
+
+    def test_optional_user_without_token(self, app):
+        # Act
+        with TestClient(app).websocket_connect("/ws/optional") as websocket:
+            message = websocket.receive_json()
+
+        # Assert
+        assert message == {"sub": None}
+
+    def test_missing_token_rejects_connection(self, app):
+        # Act & Assert
+        with pytest.raises(WebSocketDisconnect):
+            with TestClient(app).websocket_connect("/ws"):
+                pass
+
+    def test_role_checker_on_websocket(self, app, make_token):
+        # Arrange
+        client = TestClient(app)
+
+        # Act & Assert
+        with client.websocket_connect(f"/ws/admin?access_token={make_token(realm_roles=['admin'])}"):
+            pass
+        with pytest.raises(WebSocketDisconnect):
+            with client.websocket_connect(f"/ws/admin?access_token={make_token(realm_roles=['user'])}"):
+                pass
@@ -0,0 +1,138 @@
+"""Tests for VerifyExecutor."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from jose import JWTError
+
+from fastapi_keycloak_auth.executor import VerifyExecutor
+from fastapi_keycloak_auth.jwt_backends import JoseBackend, SigningKey
+
+
+class SlowBackend:
+    """Backend that records the threads it runs on and how many calls overlap."""
+
+    name = "slow"
+
+    def __init__(self, delay: float = 0.02):
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self.threads: set[str] = set()
+        self._lock = threading.Lock()
+
+    def load_key(self, key_data, algorithm):
+        return key_data
+
+    def verify(self, token, key, algorithms):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        if token == "bad":
+            raise JWTError("Signature verification failed.")
+        return {"token": token}
+
+
+@pytest.fixture
+def signing_key() -> SigningKey:
+    return SigningKey("kid", "RS256", object())
+
+
+class TestThreadExecutor:
+
+    @pytest.mark.asyncio
+    async def test_verify_runs_in_worker_thread(self, signing_key):
+        # Arrange
+        backend = SlowBackend(delay=0)
+        executor = VerifyExecutor("thread", max_workers=2)
+
+        # Act
+        claims = await executor.verify(backend, "token", signing_key)
+
+        # Assert
+        assert claims == {"token": "token"}
+        assert all(name.startswith("keycloak-verify") for name in backend.threads)
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_capped(self, signing_key):
+        # Arrange
+        backend = SlowBackend()
+        executor = VerifyExecutor("thread", max_workers=4, max_concurrency=2)
+
+        # Act
+        await asyncio.gather(*(executor.verify(backend, f"t{i}", signing_key) for i in range(8)))
+
+        # Assert
+        assert backend.max_active == 2
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_stats_report_queue_and_wait_time(self, signing_key):
+        # Arrange
+        backend = SlowBackend()
+        executor = VerifyExecutor("thread", max_workers=1, max_concurrency=1)
+
+        # Act
+        await asyncio.gather(*(executor.verify(backend, f"t{i}", signing_key) for i in range(4)))
+        stats = executor.stats
+
+        # Assert
+        assert stats.completed == 4
+        assert stats.in_flight == 0
+        assert stats.queue_depth == 0
+        assert stats.max_queue_depth == 3
+        assert stats.wait_time_max >= backend.delay
+        assert 0 < stats.wait_time_mean <= stats.wait_time_max
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate(self, signing_key):
+        # Arrange
+        executor = VerifyExecutor("thread", max_workers=1)
+
+        # Act & Assert
+        with pytest.raises(JWTError):
+            await executor.verify(SlowBackend(delay=0), "bad", signing_key)
+        assert executor.stats.in_flight == 0
+        executor.shutdown()
+
+    def test_defaults(self):
+        # Act
+        executor = VerifyExecutor()
+
+        # Assert
+        assert executor.kind == "thread"
+        assert executor.max_workers >= 1
+        assert executor.max_concurrency == 4 * executor.max_workers
+
+    def test_unknown_kind_raises(self):
+        # Act & Assert
+        with pytest.raises(ValueError, match="Unknown executor kind"):
+            VerifyExecutor("fiber")  # type: ignore[arg-type]
+
+
+class TestProcessExecutor:
+
+    @pytest.mark.asyncio
+    async def test_verify_rebuilds_key_from_jwk(self, rsa_keypair, make_token):
+        # Arrange
+        backend = JoseBackend()
+        key_data = rsa_keypair["jwk"]
+        signing_key = SigningKey(key_data["kid"], "RS256", backend.load_key(key_data, "RS256"), jwk=key_data)
+        executor = VerifyExecutor("process", max_workers=1)
+
+        # Act
+        try:
+            claims = await executor.verify(backend, make_token(sub="process-user"), signing_key)
+        finally:
+            executor.shutdown()
+
+        # Assert
+        assert claims["sub"] == "process-user"
@@ -0,0 +1,141 @@
+"""Tests for the token extractor chain."""
+
+import pytest
+from starlette.requests import Request
+
+from fastapi_keycloak_auth.extractors import (
+    BearerSource,
+    CookieSource,
+    HeaderSource,
+    QuerySource,
+    ScopeCookies,
+    SessionSource,
+    TokenExtractor,
+    scope_header,
+)
+
+
+def _scope(headers: list[tuple[str, str]] = (), query: str = "", type: str = "http") -> dict:
+    return {
+        "type": type,
+        "path": "/",
+        "headers": [(name.encode(), value.encode()) for name, value in headers],
+        "query_string": query.encode(),
+    }
+
+
+class TestScopeCookies:
+
+    @pytest.mark.parametrize("header, expected", [
+        ("access_token=abc", "abc"),
+        ("a=1; access_token=abc; b=2", "abc"),
+        ("a=1;access_token=abc", "abc"),
+        ('access_token="abc"', "abc"),
+        ("my_access_token=x; access_token=abc", "abc"),
+        ("a=access_token=x; access_token=abc", "abc"),
+    ])
+    def test_finds_one_cookie(self, header, expected):
+        # Act & Assert
+        assert ScopeCookies(_scope([("cookie", header)]))["access_token"] == expected
+
+    @pytest.mark.parametrize("header", ["", "my_access_token=x", "a=access_token=x"])
+    def test_missing_cookie(self, header):
+        # Act & Assert
+        assert ScopeCookies(_scope([("cookie", header)])).get("access_token") is None
+
+    def test_searches_every_cookie_header(self):
+        # Act & Assert
+        assert ScopeCookies(_scope([("cookie", "a=1"), ("cookie", "b=2")]))["b"] == "2"
+
+    def test_iteration_matches_starlette(self):
+        # Arrange
+        scope = _scope([("cookie", "a=1; b=two; c=")])
+
+        # Act & Assert
+        assert dict(ScopeCookies(scope)) == dict(Request(scope).cookies)
+
+
+class TestSources:
+
+    def test_scope_header(self):
+        # Act & Assert
+        assert scope_header(_scope([("x-a", "1")]), "x-a") == "1"
+        assert scope_header(_scope(), "x-a") is None
+
+    @pytest.mark.parametrize("value, expected", [("Bearer tok", "tok"), ("Basic abc", None), ("Bearer ", None)])
+    def test_bearer(self, value, expected):
+        # Act & Assert
+        scope = _scope([("authorization", value)])
+        assert BearerSource().extract(scope, ScopeCookies(scope)) == expected
+
+    def test_custom_header(self):
+        # Arrange
+        scope = _scope([("x-access-token", " tok ")])
+
+        # Act & Assert
+        assert HeaderSource("X-Access-Token").extract(scope, ScopeCookies(scope)) == "tok"
+
+    def test_query_param_only_for_websockets(self):
+        # Arrange
+        websocket = _scope(query="a=1&access_token=t%2Bk", type="websocket")
+        http = _scope(query="access_token=tok")
+        source = QuerySource("access_token")
+
+        # Act & Assert
+        assert source.extract(websocket, ScopeCookies(websocket)) == "t+k"
+        assert source.extract(http, ScopeCookies(http)) is None
+        assert QuerySource("access_token", websocket_only=False).extract(http, ScopeCookies(http)) == "tok"
+
+
+class TestTokenExtractor:
+
+    def test_first_source_wins(self):
+        # Arrange
+        extractor = TokenExtractor([CookieSource("access_token"), BearerSource()])
+        scope = _scope([("cookie", "access_token=cookie-token"), ("authorization", "Bearer header-token")])
+
+        # Act & Assert
+        assert extractor.extract(scope) == ("cookie-token", None)
+
+    def test_falls_through_to_later_sources(self):
+        # Arrange
+        extractor = TokenExtractor([CookieSource("access_token"), BearerSource()])
+
+        # Act & Assert
+        assert extractor.extract(_scope([("authorization", "Bearer header-token")])) == ("header-token", None)
+        assert extractor.extract(_scope()) == (None, None)
+
+    def test_session_source_returns_session_id(self):
+        # Arrange
+        extractor = TokenExtractor([BearerSource(), SessionSource("session_id")])
+
+        # Act & Assert
+        assert extractor.extract(_scope([("cookie", "session_id=sid")])) == (None, "sid")
+
+    def test_from_settings(self, keycloak_settings):
+        # Arrange
+        keycloak_settings.token_sources = "header, query cookie bearer session"
+
+        # Act
+        extractor = TokenExtractor.from_settings(keycloak_settings)
+
+        # Assert
+        assert [type(s) for s in extractor.sources] == [HeaderSource, QuerySource, CookieSource, BearerSource]
+
+    def test_from_settings_with_session_store(self, keycloak_settings):
+        # Arrange
+        keycloak_settings.session_store_url = "memory://"
+
+        # Act
+        extractor = TokenExtractor.from_settings(keycloak_settings)
+
+        # Assert
+        assert [type(s) for s in extractor.sources] == [CookieSource, BearerSource, SessionSource]
+
+    def test_unknown_source_raises(self, keycloak_settings):
+        # Arrange
+        keycloak_settings.token_sources = "cookie magic"
+
+        # Act & Assert
+        with pytest.raises(ValueError, match="magic"):
+            TokenExtractor.from_settings(keycloak_settings)
@@ -0,0 +1,86 @@
+"""Minimal in-process server speaking the Redis protocol, for tests."""
+
+import asyncio
+import time
+
+
+class FakeRedisServer:
+    """Supports AUTH, SELECT, PING, GET, SET (with PX/EX) and DEL."""
+
+    def __init__(self, password: str | None = None):
+        self.password = password
+        self.data: dict[bytes, tuple[bytes, float | None]] = {}
+        self.commands: list[list[bytes]] = []
+        # Number of reads that returned more than one command at once
+        self.pipelined_batches = 0
+        self._server: asyncio.AbstractServer | None = None
+        self.port = 0
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    @property
+    def url(self) -> str:
+        auth = f":{self.password}@" if self.password else ""
+        return f"redis://{auth}127.0.0.1:{self.port}/0"
+
+    async def _read_command(self, reader: asyncio.StreamReader) -> list[bytes] | None:
+        line = await reader.readline()
+        if not line:
+            return None
+        count = int(line[1:-2])
+        args = []
+        for _ in range(count):
+            length = int((await reader.readline())[1:-2])
+            args.append((await reader.readexactly(length + 2))[:-2])
+        return args
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        authenticated = self.password is None
+        try:
+            while True:
+                command = await self._read_command(reader)
+                if command is None:
+                    break
+                batch = 1
+                replies = [self._execute(command, authenticated)]
+                authenticated = authenticated or (command[0].upper() == b"AUTH" and replies[0] == b"+OK\r\n")
+                while reader._buffer:  # further commands already received in the same pipeline
+                    command = await self._read_command(reader)
+                    replies.append(self._execute(command, authenticated))
+                    batch += 1
+                if batch > 1:
+                    self.pipelined_batches += 1
+                writer.write(b"".join(replies))
+                await writer.drain()
+        finally:
+            writer.close()
+
+    def _execute(self, command: list[bytes], authenticated: bool) -> bytes:
+        self.commands.append(command)
+        name = command[0].upper()
+        if name == b"AUTH":
+            return b"+OK\r\n" if command[-1].decode() == self.password else b"-WRONGPASS invalid password\r\n"
+        if not authenticated:
+            return b"-NOAUTH Authentication required.\r\n"
+        if name in (b"SELECT", b"PING"):
+            return b"+OK\r\n"
+        if name == b"GET":
+            entry = self.data.get(command[1])
+            if entry is None or (entry[1] is not None and entry[1] <= time.monotonic()):
+                return b"$-1\r\n"
+            return b"$%d\r\n%s\r\n" % (len(entry[0]), entry[0])
+        if name == b"SET":
+            expires_at = None
+            if len(command) >= 5 and command[3].upper() == b"PX":
+                expires_at = time.monotonic() + int(command[4]) / 1000
+            self.data[command[1]] = (command[2], expires_at)
+            return b"+OK\r\n"
+        if name == b"DEL":
+            return b":%d\r\n" % int(self.data.pop(command[1], None) is not None)
+        return b"-ERR unknown command\r\n"
@@ -0,0 +1,288 @@
+"""Tests for the JWT signature verification backends."""
+
+import time
+
+import pytest
+from jose import jwt
+from jose.exceptions import ExpiredSignatureError, JWTClaimsError, JWTError
+
+from fastapi_keycloak_auth.jwt_backends import (
+    CryptographyBackend,
+    JoseBackend,
+    JWTBackend,
+    create_jwt_backend,
+    key_algorithm,
+    unverified_header,
+    unverified_token,
+    validate_claims,
+)
+
+ISSUER = "https://keycloak.example.local/realms/test-realm"
+
+
+@pytest.fixture(params=["jose", "cryptography"])
+def backend(request) -> JWTBackend:
+    return create_jwt_backend(request.param)
+
+
+@pytest.fixture
+def signed_token(rsa_keypair):
+    def _sign(claims: dict | None = None, algorithm: str = "RS256") -> str:
+        return jwt.encode(claims or {"sub": "user"}, rsa_keypair["private_pem"], algorithm=algorithm)
+
+    return _sign
+
+
+class TestCreateJwtBackend:
+
+    def test_creates_backend_by_name(self):
+        # Assert
+        assert isinstance(create_jwt_backend("jose"), JoseBackend)
+        assert isinstance(create_jwt_backend("cryptography"), CryptographyBackend)
+
+    def test_unknown_name_raises(self):
+        # Act & Assert
+        with pytest.raises(ValueError, match="Unknown JWT backend"):
+            create_jwt_backend("nope")
+
+    def test_backends_implement_protocol(self, backend):
+        # Assert
+        assert isinstance(backend, JWTBackend)
+
+
+class TestVerify:
+
+    def test_valid_signature_returns_claims(self, backend, rsa_keypair, signed_token):
+        # Arrange
+        key = backend.load_key(rsa_keypair["jwk"], "RS256")
+
+        # Act
+        claims = backend.verify(signed_token({"sub": "user", "n": 1}), key, ["RS256"])
+
+        # Assert
+        assert claims == {"sub": "user", "n": 1}
+
+    def test_tampered_payload_raises(self, backend, rsa_keypair, signed_token):
+        # Arrange
+        key = backend.load_key(rsa_keypair["jwk"], "RS256")
+        header, _, signature = signed_token().split(".")
+        other_payload = signed_token({"sub": "admin"}).split(".")[1]
+
+        # Act & Assert
+        with pytest.raises(JWTError):
+            backend.verify(f"{header}.{other_payload}.{signature}", key, ["RS256"])
+
+    def test_key_from_other_realm_raises(self, backend, rotated_rsa_keypair, signed_token):
+        # Arrange
+        key = backend.load_key(rotated_rsa_keypair["jwk"], "RS256")
+
+        # Act & Assert
+        with pytest.raises(JWTError):
+            backend.verify(signed_token(), key, ["RS256"])
+
+    def test_algorithm_not_allowed_raises(self, backend, rsa_keypair, signed_token):
+        # Arrange
+        key = backend.load_key(rsa_keypair["jwk"], "RS256")
+
+        # Act & Assert
+        with pytest.raises(JWTError):
+            backend.verify(signed_token(algorithm="RS512"), key, ["RS256"])
+
+    def test_hmac_token_signed_with_public_key_raises(self, backend, rsa_keypair):
+        # Arrange - classic algorithm confusion: HS256 keyed with the public JWK
+        key = backend.load_key(rsa_keypair["jwk"], "RS256")
+        token = jwt.encode({"sub": "admin"}, rsa_keypair["jwk"]["n"], algorithm="HS256")
+
+        # Act & Assert
+        with pytest.raises(JWTError):
+            backend.verify(token, key, ["RS256", "HS256"])
+
+    @pytest.mark.parametrize("token", ["not-a-token", "a.b.c", "", "e30.e30"])
+    def test_malformed_token_raises(self, backend, rsa_keypair, token):
+        # Arrange
+        key = backend.load_key(rsa_keypair["jwk"], "RS256")
+
+        # Act & Assert
+        with pytest.raises(JWTError):
+            backend.verify(token, key, ["RS256"])
+
+
+class TestKeyAlgorithm:
+
+    @pytest.mark.parametrize(("key_data", "expected"), [
+        ({"kty": "RSA"}, "RS256"),
+        ({"kty": "RSA", "alg": "RS512"}, "RS512"),
+        ({"kty": "EC", "crv": "P-256"}, "ES256"),
+        ({"kty": "EC", "crv": "P-521"}, "ES512"),
+        ({"kty": "OKP", "crv": "Ed25519"}, "EdDSA"),
+    ])
+    def test_uses_alg_or_derives_it_from_key_type(self, key_data, expected):
+        # Act & Assert
+        assert key_algorithm(key_data) == expected
+
+    @pytest.mark.parametrize("key_data", [
+        {"kty": "RSA", "alg": "HS256"},
+        {"kty": "RSA", "alg": "none"},
+        {"kty": "RSA", "alg": "ES256"},
+        {"kty": "EC", "crv": "P-384", "alg": "ES256"},
+        {"kty": "OKP", "crv": "X25519"},
+        {"kty": "oct"},
+    ])
+    def test_rejects_unsupported_or_mismatched_algorithms(self, key_data):
+        # Act & Assert
+        with pytest.raises(ValueError):
+            key_algorithm(key_data)
+
+
+class TestEllipticCurveKeys:
+
+    @pytest.mark.parametrize("name", ["jose", "cryptography"])
+    def test_es256_token_verifies(self, name, ec_keypair, sign_token):
+        # Arrange
+        backend = create_jwt_backend(name)
+        key = backend.load_key(ec_keypair["jwk"], "ES256")
+        token = sign_token(ec_keypair["private_key"], "ES256", "ec-key-id", {"sub": "ec-user"})
+
+        # Act
+        claims = backend.verify(token, key, ["ES256"])
+
+        # Assert
+        assert claims["sub"] == "ec-user"
+
+    def test_eddsa_token_verifies(self, ed25519_keypair, sign_token):
+        # Arrange
+        backend = CryptographyBackend()
+        key = backend.load_key(ed25519_keypair["jwk"], "EdDSA")
+        token = sign_token(ed25519_keypair["private_key"], "EdDSA", "ed-key-id", {"sub": "ed-user"})
+
+        # Act
+        claims = backend.verify(token, key, ["EdDSA"])
+
+        # Assert
+        assert claims["sub"] == "ed-user"
+
+    def test_tampered_eddsa_token_raises(self, ed25519_keypair, sign_token):
+        # Arrange
+        backend = CryptographyBackend()
+        key = backend.load_key(ed25519_keypair["jwk"], "EdDSA")
+        header, payload, signature = sign_token(ed25519_keypair["private_key"], "EdDSA", None).split(".")
+
+        # Act & Assert
+        with pytest.raises(JWTError):
+            backend.verify(f"{header}.{payload}x.{signature}", key, ["EdDSA"])
+
+    def test_ec_signature_with_wrong_length_raises(self, ec_keypair, sign_token):
+        # Arrange
+        backend = CryptographyBackend()
+        key = backend.load_key(ec_keypair["jwk"], "ES256")
+        token = sign_token(ec_keypair["private_key"], "ES256", None)
+
+        # Act & Assert
+        with pytest.raises(JWTError):
+            backend.verify(token[:-4], key, ["ES256"])
+
+    def test_key_of_other_type_is_rejected(self, ec_keypair, rsa_keypair, signed_token):
+        # Arrange - RS256 token checked against an EC key
+        backend = CryptographyBackend()
+        key = backend.load_key(ec_keypair["jwk"], "ES256")
+
+        # Act & Assert
+        with pytest.raises(JWTError, match="does not match"):
+            backend.verify(signed_token(), key, ["RS256"])
+
+
+class TestCryptographyBackend:
+
+    def test_load_key_rejects_unsupported_key_type(self):
+        # Act & Assert
+        with pytest.raises(ValueError, match="Unsupported key type"):
+            CryptographyBackend().load_key({"kty": "oct", "k": "c2VjcmV0"}, "HS256")
+
+    def test_non_object_payload_raises(self, rsa_keypair):
+        # Arrange
+        backend = CryptographyBackend()
+        key = backend.load_key(rsa_keypair["jwk"], "RS256")
+        token = jwt.encode({"sub": "user"}, rsa_keypair["private_pem"], algorithm="RS256")
+        header = token.split(".")[0]
+
+        # Act & Assert
+        with pytest.raises(JWTError):
+            backend.verify(f"{header}.WzFd.sig", key, ["RS256"])
+
+
+class TestValidateClaims:
+
+    def test_valid_claims_pass(self):
+        # Arrange
+        now = int(time.time())
+
+        # Act & Assert
+        validate_claims({"iss": ISSUER, "iat": now, "nbf": now, "exp": now + 60}, ISSUER)
+
+    def test_expired_token_raises(self):
+        # Act & Assert
+        with pytest.raises(ExpiredSignatureError):
+            validate_claims({"iss": ISSUER, "exp": int(time.time()) - 10}, ISSUER)
+
+    def test_leeway_allows_recently_expired_token(self):
+        # Act & Assert
+        validate_claims({"iss": ISSUER, "exp": int(time.time()) - 10}, ISSUER, leeway=30)
+
+    def test_token_not_yet_valid_raises(self):
+        # Act & Assert
+        with pytest.raises(JWTClaimsError, match="nbf"):
+            validate_claims({"iss": ISSUER, "nbf": int(time.time()) + 60}, ISSUER)
+
+    def test_wrong_issuer_raises(self):
+        # Act & Assert
+        with pytest.raises(JWTClaimsError, match="Invalid issuer"):
+            validate_claims({"iss": "https://evil.example"}, ISSUER)
+
+    def test_missing_issuer_raises(self):
+        # Act & Assert
+        with pytest.raises(JWTClaimsError):
+            validate_claims({}, ISSUER)
+
+    @pytest.mark.parametrize("claim", ["iat", "nbf", "exp"])
+    def test_non_numeric_time_claim_raises(self, claim):
+        # Act & Assert
+        with pytest.raises(JWTClaimsError):
+            validate_claims({"iss": ISSUER, claim: "soon"}, ISSUER)
+
+    def test_non_string_subject_raises(self):
+        # Act & Assert
+        with pytest.raises(JWTClaimsError):
+            validate_claims({"iss": ISSUER, "sub": 42}, ISSUER)
+
+
+class TestUnverifiedHeader:
+
+    def test_decodes_header(self, signed_token):
+        # Act
+        header = unverified_header(signed_token())
+
+        # Assert
+        assert header == {"alg": "RS256", "typ": "JWT"}
+
+    @pytest.mark.parametrize("token", ["no-dots", "!!!.e30.", "WzFd.e30.sig"])
+    def test_invalid_header_raises(self, token):
+        # Act & Assert
+        with pytest.raises(JWTError):
+            unverified_header(token)
+
+
+class TestUnverifiedToken:
+
+    def test_decodes_header_and_claims(self, signed_token):
+        # Act
+        header, claims = unverified_token(signed_token({"sub": "user", "iss": ISSUER}))
+
+        # Assert
+        assert header["alg"] == "RS256"
+        assert claims == {"sub": "user", "iss": ISSUER}
+
+    @pytest.mark.parametrize("token", ["e30.e30", "e30.e30.sig.extra", "e30.!!!.sig", "e30.WzFd.sig", "e30.bm90LWpzb24.sig"])
+    def test_malformed_token_raises(self, token):
+        # Act & Assert
+        with pytest.raises(JWTError):
+            unverified_token(token)
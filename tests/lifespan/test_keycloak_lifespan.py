@@ -0,0 +1,98 @@
+"""Tests for keycloak_lifespan."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from fastapi_keycloak_auth.lifespan import keycloak_lifespan
+
+
+class TestKeycloakLifespan:
+
+    def test_opens_http_client_on_startup(self, keycloak_settings, keycloak_client):
+        # Arrange
+        app = FastAPI(lifespan=keycloak_lifespan)
+
+        with patch("fastapi_keycloak_auth.lifespan.get_settings", return_value=keycloak_settings), \
+             patch("fastapi_keycloak_auth.lifespan.get_keycloak_client", return_value=keycloak_client):
+            # Act
+            with TestClient(app):
+                # Assert
+                assert keycloak_client._http_client is not None
+                assert not keycloak_client._http_client.is_closed
+
+    def test_closes_http_client_on_shutdown(self, keycloak_settings, keycloak_client):
+        # Arrange
+        app = FastAPI(lifespan=keycloak_lifespan)
+
+        with patch("fastapi_keycloak_auth.lifespan.get_settings", return_value=keycloak_settings), \
+             patch("fastapi_keycloak_auth.lifespan.get_keycloak_client", return_value=keycloak_client):
+            # Act
+            with TestClient(app):
+                http_client = keycloak_client.http_client
+
+        # Assert
+        assert http_client.is_closed
+        assert keycloak_client._http_client is None
+
+
+class TestLifespanWarmup:
+
+    def test_warms_up_client_on_startup(self, keycloak_settings, keycloak_client):
+        # Arrange
+        app = FastAPI(lifespan=keycloak_lifespan)
+        keycloak_client.warmup = AsyncMock(return_value=True)
+
+        with patch("fastapi_keycloak_auth.lifespan.get_settings", return_value=keycloak_settings), \
+             patch("fastapi_keycloak_auth.lifespan.get_keycloak_client", return_value=keycloak_client):
+            # Act
+            with TestClient(app):
+                pass
+
+        # Assert
+        keycloak_client.warmup.assert_awaited_once()
+
+    def test_skips_warmup_when_disabled(self, keycloak_settings, keycloak_client):
+        # Arrange
+        keycloak_settings.warmup_on_startup = False
+        app = FastAPI(lifespan=keycloak_lifespan)
+        keycloak_client.warmup = AsyncMock(return_value=True)
+
+        with patch("fastapi_keycloak_auth.lifespan.get_settings", return_value=keycloak_settings), \
+             patch("fastapi_keycloak_auth.lifespan.get_keycloak_client", return_value=keycloak_client):
+            # Act
+            with TestClient(app):
+                pass
+
+        # Assert
+        keycloak_client.warmup.assert_not_awaited()
+
+    def test_failed_warmup_does_not_block_startup(self, keycloak_settings, keycloak_client):
+        # Arrange
+        app = FastAPI(lifespan=keycloak_lifespan)
+        keycloak_client.warmup = AsyncMock(return_value=False)
+
+        with patch("fastapi_keycloak_auth.lifespan.get_settings", return_value=keycloak_settings), \
+             patch("fastapi_keycloak_auth.lifespan.get_keycloak_client", return_value=keycloak_client):
+            # Act
+            with TestClient(app) as client:
+                response = client.get("/docs")
+
+        # Assert
+        assert response.status_code == 200
+
+    def test_failed_warmup_raises_when_required(self, keycloak_settings, keycloak_client):
+        # Arrange
+        keycloak_settings.warmup_required = True
+        app = FastAPI(lifespan=keycloak_lifespan)
+        keycloak_client.warmup = AsyncMock(return_value=False)
+
+        with patch("fastapi_keycloak_auth.lifespan.get_settings", return_value=keycloak_settings), \
+             patch("fastapi_keycloak_auth.lifespan.get_keycloak_client", return_value=keycloak_client):
+            # Act & Assert
+            with pytest.raises(RuntimeError, match="warm-up failed"):
+                with TestClient(app):
+                    pass
@@ -0,0 +1,308 @@
+"""Tests for KeycloakAuthMiddleware."""
+
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI, WebSocket
+from starlette.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from fastapi_keycloak_auth.dependencies import CurrentUser, OptionalUser, require_role
+from fastapi_keycloak_auth.events import AuthEvent, auth_events
+from fastapi_keycloak_auth.extractors import TokenExtractor
+from fastapi_keycloak_auth.middleware import KeycloakAuthMiddleware
+from fastapi_keycloak_auth.models import TokenResponse
+
+
+def _build_app(keycloak_client, **options) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(KeycloakAuthMiddleware, client=keycloak_client, **options)
+
+    @app.get("/me")
+    async def me(user: CurrentUser, admin=Depends(require_role("admin"))):
+        return {"sub": user.sub}
+
+    @app.get("/optional")
+    async def optional(user: OptionalUser):
+        return {"sub": user.sub if user else None}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    @app.websocket("/ws")
+    async def ws(websocket: WebSocket):
+        await websocket.accept()
+        await websocket.send_json({"sub": websocket.state.keycloak_auth.user.sub})
+        await websocket.close()
+
+    return app
+
+
+@pytest.fixture
+def patched_dependencies(keycloak_settings, keycloak_client):
+    with patch("fastapi_keycloak_auth.dependencies._settings", keycloak_settings), \
+         patch("fastapi_keycloak_auth.dependencies._client", keycloak_client):
+        yield
+
+
+@pytest.mark.usefixtures("patched_dependencies")
+class TestKeycloakAuthMiddleware:
+
+    def test_dependencies_reuse_middleware_result(self, keycloak_client, make_token):
+        # Arrange
+        app = _build_app(keycloak_client)
+        token = make_token(realm_roles=["admin"])
+        received = []
+
+        @auth_events.on(AuthEvent.TOKEN_VERIFIED)
+        async def handler(data):
+            received.append(data)
+
+        # Act
+        with patch.object(keycloak_client, "verify_token", wraps=keycloak_client.verify_token) as mock_verify:
+            response = TestClient(app).get("/me", headers={"Authorization": f"Bearer {token}"})
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json() == {"sub": "test-user-id"}
+        mock_verify.assert_awaited_once_with(token)
+        assert len(received) == 1
+
+    def test_unauthenticated_request_left_to_dependencies(self, keycloak_client):
+        # Arrange
+        app = _build_app(keycloak_client)
+
+        # Act
+        client = TestClient(app)
+
+        # Assert
+        assert client.get("/optional").json() == {"sub": None}
+        assert client.get("/me").status_code == 401
+
+    def test_bypassed_path_skips_verification(self, keycloak_client, make_token):
+        # Arrange
+        app = _build_app(keycloak_client, bypass_paths=["/health"], require_auth=True)
+
+        # Act
+        with patch.object(keycloak_client, "verify_token", wraps=keycloak_client.verify_token) as mock_verify:
+            response = TestClient(app).get("/health", headers={"Authorization": f"Bearer {make_token()}"})
+
+        # Assert
+        assert response.status_code == 200
+        mock_verify.assert_not_called()
+
+    def test_require_auth_rejects_before_routing(self, keycloak_client):
+        # Arrange
+        app = _build_app(keycloak_client, require_auth=True)
+
+        # Act
+        response = TestClient(app).get("/optional", headers={"Authorization": "Bearer invalid"})
+
+        # Assert
+        assert response.status_code == 401
+        assert response.headers["WWW-Authenticate"] == "Bearer"
+
+    def test_require_auth_allows_valid_token(self, keycloak_client, make_token):
+        # Arrange
+        app = _build_app(keycloak_client, require_auth=True)
+
+        # Act
+        response = TestClient(app).get("/optional", headers={"Authorization": f"Bearer {make_token()}"})
+
+        # Assert
+        assert response.json() == {"sub": "test-user-id"}
+
+    def test_websocket_gets_principal(self, keycloak_client, make_token):
+        # Arrange
+        app = _build_app(keycloak_client, require_auth=True)
+
+        # Act
+        with TestClient(app).websocket_connect("/ws", headers={"Authorization": f"Bearer {make_token()}"}) as ws:
+            message = ws.receive_json()
+
+        # Assert
+        assert message == {"sub": "test-user-id"}
+
+    def test_websocket_token_from_query_param(self, keycloak_client, keycloak_settings, make_token):
+        # Arrange
+        keycloak_settings.token_sources = "bearer query"
+        keycloak_client.token_extractor = TokenExtractor.from_settings(keycloak_settings)
+        app = _build_app(keycloak_client, require_auth=True)
+
+        # Act
+        with TestClient(app).websocket_connect(f"/ws?access_token={make_token()}") as ws:
+            message = ws.receive_json()
+
+        # Assert
+        assert message == {"sub": "test-user-id"}
+
+    def test_websocket_without_token_is_closed(self, keycloak_client):
+        # Arrange
+        app = _build_app(keycloak_client, require_auth=True)
+
+        # Act & Assert
+        with pytest.raises(WebSocketDisconnect) as exc_info:
+            with TestClient(app).websocket_connect("/ws") as ws:
+                ws.receive_json()
+        assert exc_info.value.code == 1008
+
+    @pytest.mark.parametrize(
+        ("path", "bypassed"),
+        [("/health", True), ("/public/docs", True), ("/healthz", False), ("/api/public/x", False)],
+    )
+    def test_is_bypassed(self, keycloak_client, path, bypassed):
+        # Arrange
+        middleware = KeycloakAuthMiddleware(None, client=keycloak_client, bypass_paths=["/health"], bypass_prefixes=["/public/"])
+
+        # Act & Assert
+        assert middleware.is_bypassed(path) is bypassed
+
+
+@pytest.mark.usefixtures("patched_dependencies")
+@pytest.mark.usefixtures("patched_dependencies")
+class TestKeycloakUnavailable:
+
+    @pytest.fixture(autouse=True)
+    def jwks_unavailable(self, keycloak_client):
+        keycloak_client._jwks = None
+        keycloak_client._signing_keys = {}
+        keycloak_client._jwks_fetched_at = None
+        keycloak_client._http_client = AsyncMock(is_closed=False)
+        keycloak_client._http_client.get.side_effect = httpx.ConnectError("unreachable")
+
+    @pytest.mark.parametrize("path, expected", [("/health", {"status": "ok"}), ("/optional", {"sub": None})])
+    def test_public_routes_keep_working(self, keycloak_client, keycloak_settings, make_token, path, expected):
+        # Arrange
+        client = TestClient(_build_app(keycloak_client))
+        client.cookies.set(keycloak_settings.cookie_name, make_token())
+
+        # Act
+        response = client.get(path)
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json() == expected
+
+    def test_require_auth_returns_503(self, keycloak_client, make_token):
+        # Arrange
+        client = TestClient(_build_app(keycloak_client, require_auth=True))
+
+        # Act
+        response = client.get("/health", headers={"Authorization": f"Bearer {make_token()}"})
+
+        # Assert
+        assert response.status_code == 503
+
+
+class TestSlidingSession:
+
+    @pytest.fixture
+    def refreshed(self, keycloak_client, make_token):
+        tokens = TokenResponse(
+            access_token=make_token(sub="refreshed-user"),
+            refresh_token="new-refresh-token",
+            expires_in=300,
+        )
+        keycloak_client.refresh_tokens = AsyncMock(return_value=tokens)
+        return tokens
+
+    def _client(self, keycloak_client, keycloak_settings, access_token=None, refresh_token="old-refresh-token"):
+        client = TestClient(_build_app(keycloak_client, sliding_session=True))
+        if access_token:
+            client.cookies.set(keycloak_settings.cookie_name, access_token)
+        if refresh_token:
+            client.cookies.set(keycloak_settings.refresh_cookie_name, refresh_token)
+        return client
+
+    def test_expiring_access_cookie_is_refreshed(self, keycloak_client, keycloak_settings, make_token, refreshed):
+        # Arrange
+        client = self._client(keycloak_client, keycloak_settings, access_token=make_token(expires_in=10))
+
+        # Act
+        response = client.get("/optional")
+
+        # Assert
+        assert response.json() == {"sub": "refreshed-user"}
+        keycloak_client.refresh_tokens.assert_awaited_once_with("old-refresh-token")
+        assert response.cookies[keycloak_settings.cookie_name] == refreshed.access_token
+        assert response.cookies[keycloak_settings.refresh_cookie_name] == "new-refresh-token"
+
+    def test_missing_access_cookie_is_refreshed(self, keycloak_client, keycloak_settings, refreshed):
+        # Arrange
+        client = self._client(keycloak_client, keycloak_settings)
+
+        # Act
+        response = client.get("/me")
+
+        # Assert: no 401 round trip, although the role check then fails
+        assert response.status_code == 403
+        assert response.cookies[keycloak_settings.cookie_name] == refreshed.access_token
+
+    def test_fresh_access_cookie_is_not_refreshed(self, keycloak_client, keycloak_settings, make_token, refreshed):
+        # Arrange
+        client = self._client(keycloak_client, keycloak_settings, access_token=make_token(expires_in=300))
+
+        # Act
+        response = client.get("/optional")
+
+        # Assert
+        assert response.json() == {"sub": "test-user-id"}
+        keycloak_client.refresh_tokens.assert_not_called()
+        assert "set-cookie" not in response.headers
+
+    def test_bearer_requests_are_not_refreshed(self, keycloak_client, keycloak_settings, make_token, refreshed):
+        # Arrange
+        client = self._client(keycloak_client, keycloak_settings)
+
+        # Act
+        response = client.get("/optional", headers={"Authorization": f"Bearer {make_token(expires_in=10)}"})
+
+        # Assert
+        assert response.json() == {"sub": "test-user-id"}
+        keycloak_client.refresh_tokens.assert_not_called()
+
+    def test_rejected_refresh_token_clears_cookies(self, keycloak_client, keycloak_settings):
+        # Arrange
+        request = httpx.Request("POST", "https://fake")
+        keycloak_client.refresh_tokens = AsyncMock(side_effect=httpx.HTTPStatusError(
+            "Bad Request", request=request, response=httpx.Response(400, request=request),
+        ))
+        client = self._client(keycloak_client, keycloak_settings)
+
+        # Act
+        response = client.get("/optional")
+
+        # Assert
+        assert response.json() == {"sub": None}
+        set_cookies = response.headers.get_list("set-cookie")
+        assert any(c.startswith(f"{keycloak_settings.refresh_cookie_name}=") and "Max-Age=0" in c for c in set_cookies)
+
+    @pytest.mark.parametrize("status_code", [502, 503])
+    def test_keycloak_outage_keeps_cookies(self, keycloak_client, keycloak_settings, make_token, status_code):
+        # Arrange
+        request = httpx.Request("POST", "https://fake")
+        keycloak_client.refresh_tokens = AsyncMock(side_effect=httpx.HTTPStatusError(
+            "Service Unavailable", request=request, response=httpx.Response(status_code, request=request),
+        ))
+        client = self._client(keycloak_client, keycloak_settings, access_token=make_token(expires_in=10))
+
+        # Act
+        response = client.get("/optional")
+
+        # Assert
+        assert response.json() == {"sub": "test-user-id"}
+        assert "set-cookie" not in response.headers
+
+    def test_network_error_keeps_session(self, keycloak_client, keycloak_settings, make_token):
+        # Arrange
+        keycloak_client.refresh_tokens = AsyncMock(side_effect=httpx.ConnectError("unreachable"))
+        client = self._client(keycloak_client, keycloak_settings, access_token=make_token(expires_in=10))
+
+        # Act
+        response = client.get("/optional")
+
+        # Assert
+        assert response.json() == {"sub": "test-user-id"}
+        assert "set-cookie" not in response.headers
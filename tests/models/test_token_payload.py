@@ -129,3 +129,52 @@ class TestTokenPayloadGetClientRoles:
 
         # Assert
         assert roles == []
+
+
+class TestTokenPayloadGrants:
+
+    def test_role_set_contains_realm_roles(self, sample_token_payload):
+        # Act & Assert
+        assert sample_token_payload.role_set == frozenset({"user", "admin"})
+
+    def test_role_set_is_built_once(self, sample_token_payload):
+        # Act & Assert
+        assert sample_token_payload.role_set is sample_token_payload.role_set
+
+    def test_role_set_ignores_non_string_roles(self):
+        # Arrange
+        payload = TokenPayload(sub="user-123", realm_access={"roles": ["user", {"bad": 1}, 3]})
+
+        # Act & Assert
+        assert payload.role_set == frozenset({"user"})
+
+    def test_grants_cover_roles_groups_and_scopes(self):
+        # Arrange
+        payload = TokenPayload(
+            sub="user-123",
+            realm_access={"roles": ["user"]},
+            resource_access={"my-app": {"roles": ["editor"]}, "broken": "x"},
+            groups=["/staff"],
+            scope="openid orders:write",
+        )
+
+        # Act & Assert
+        assert payload.grants == frozenset({
+            "realm:user",
+            "client:my-app:editor",
+            "group:/staff",
+            "scope:openid",
+            "scope:orders:write",
+        })
+
+    def test_cached_sets_are_not_serialized(self, sample_token_payload):
+        # Arrange
+        _ = sample_token_payload.grants
+
+        # Act
+        data = sample_token_payload.model_dump()
+
+        # Assert
+        assert "grants" not in data
+        assert "role_set" not in data
+        assert TokenPayload.model_validate_json(sample_token_payload.model_dump_json()) == sample_token_payload
@@ -0,0 +1,91 @@
+"""Tests for compiled access policies."""
+
+import pytest
+
+from fastapi_keycloak_auth.models import TokenPayload
+from fastapi_keycloak_auth.policy import Policy, all_of, any_of, compile_term, none_of
+
+
+@pytest.fixture
+def token() -> TokenPayload:
+    return TokenPayload(
+        sub="user-123",
+        realm_access={"roles": ["user", "admin"]},
+        resource_access={"my-api": {"roles": ["editor"]}},
+        groups=["/staff"],
+        scope="openid orders:read",
+    )
+
+
+class TestCompileTerm:
+
+    @pytest.mark.parametrize(
+        ("term", "expected"),
+        [
+            ("admin", "realm:admin"),
+            ("realm:admin", "realm:admin"),
+            ("client:my-api:editor", "client:my-api:editor"),
+            ("group:/staff", "group:/staff"),
+            ("scope:orders:read", "scope:orders:read"),
+        ],
+    )
+    def test_qualifies_terms(self, term, expected):
+        # Act & Assert
+        assert compile_term(term) == expected
+
+    @pytest.mark.parametrize("term", ["", "realm:", "team:x", "client:my-api", "client::editor", "client:my-api:"])
+    def test_invalid_term_raises(self, term):
+        # Act & Assert
+        with pytest.raises(ValueError, match="Invalid policy term"):
+            compile_term(term)
+
+
+class TestPolicy:
+
+    def test_all_of(self, token):
+        # Act & Assert
+        assert all_of("admin", "client:my-api:editor").allows(token) is True
+        assert all_of("admin", "client:my-api:owner").allows(token) is False
+
+    def test_any_of(self, token):
+        # Act & Assert
+        assert any_of("superadmin", "group:/staff").allows(token) is True
+        assert any_of("superadmin", "group:/ops").allows(token) is False
+
+    def test_none_of(self, token):
+        # Act & Assert
+        assert none_of("suspended").allows(token) is True
+        assert none_of("suspended", "scope:orders:read").allows(token) is False
+
+    def test_combined_policy(self, token):
+        # Arrange
+        policy = all_of("user") & any_of("group:/staff", "group:/ops") & any_of("scope:orders:read") & none_of("suspended")
+
+        # Act & Assert
+        assert policy.allows(token) is True
+        assert (policy & any_of("scope:orders:write")).allows(token) is False
+
+    def test_combining_keeps_any_of_groups_separate(self, token):
+        # Arrange: user is in neither of the second group's options
+        policy = any_of("admin", "nobody") & any_of("group:/ops", "scope:orders:write")
+
+        # Act & Assert
+        assert policy.allows(token) is False
+
+    def test_empty_policy_allows_everyone(self):
+        # Act & Assert
+        assert Policy().allows(TokenPayload(sub="user-123")) is True
+
+    def test_any_of_requires_terms(self):
+        # Act & Assert
+        with pytest.raises(ValueError):
+            any_of()
+
+    def test_equality_and_repr(self):
+        # Arrange
+        policy = all_of("admin") & none_of("suspended")
+
+        # Act & Assert
+        assert policy == all_of("realm:admin") & none_of("realm:suspended")
+        assert hash(policy) == hash(all_of("realm:admin") & none_of("realm:suspended"))
+        assert repr(policy) == "all_of('realm:admin',) & none_of('realm:suspended',)"
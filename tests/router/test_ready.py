@@ -0,0 +1,23 @@
+"""Tests for /ready endpoint."""
+
+
+class TestReady:
+
+    def test_returns_200_when_keys_loaded(self, client):
+        # Act
+        response = client.get("/auth/ready")
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json() == {"ready": True}
+
+    def test_returns_503_when_not_ready(self, client, keycloak_client):
+        # Arrange
+        keycloak_client.clear_jwks_cache()
+
+        # Act
+        response = client.get("/auth/ready")
+
+        # Assert
+        assert response.status_code == 503
+        assert response.json() == {"ready": False}
@@ -59,3 +59,21 @@ class TestRefresh:
 
         # Assert
         assert response.status_code == 401
+
+    def test_sets_cookies_when_refreshed_from_cookie(self, client, mock_refresh_tokens, keycloak_settings):
+        # Arrange
+        client.cookies.set(keycloak_settings.refresh_cookie_name, "token")
+
+        # Act
+        response = client.post("/auth/refresh")
+
+        # Assert
+        assert response.cookies[keycloak_settings.cookie_name] == "refreshed-access-token"
+        assert response.cookies[keycloak_settings.refresh_cookie_name] == "refreshed-refresh-token"
+
+    def test_sets_no_cookies_when_refreshed_from_body(self, client, mock_refresh_tokens):
+        # Act
+        response = client.post("/auth/refresh?refresh_token=body-refresh-token")
+
+        # Assert
+        assert "set-cookie" not in response.headers
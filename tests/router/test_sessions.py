@@ -0,0 +1,145 @@
+"""Tests for the auth endpoints with a server-side session store."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from fastapi_keycloak_auth.cache_backends import MemoryCacheBackend
+from fastapi_keycloak_auth.extractors import TokenExtractor
+from fastapi_keycloak_auth.models import TokenResponse
+from fastapi_keycloak_auth.sessions import SessionStore
+
+
+@pytest.fixture
+def session_store(keycloak_settings, keycloak_client) -> SessionStore:
+    keycloak_settings.session_store_url = "memory://"
+    keycloak_client.session_store = SessionStore(MemoryCacheBackend())
+    keycloak_client.token_extractor = TokenExtractor.from_settings(keycloak_settings)
+    return keycloak_client.session_store
+
+
+def _tokens(access_token: str, refresh_token: str = "refresh") -> TokenResponse:
+    return TokenResponse(access_token=access_token, refresh_token=refresh_token, expires_in=300, refresh_expires_in=1200)
+
+
+class TestSessionLogin:
+
+    def test_callback_sets_only_session_cookie(self, client, keycloak_client, session_store, make_token):
+        # Arrange
+        keycloak_client.exchange_code = AsyncMock(return_value=_tokens(make_token()))
+
+        # Act
+        response = client.get("/auth/callback?code=test-code")
+
+        # Assert
+        assert response.status_code == 302
+        assert set(response.cookies) == {"session_id"}
+        set_cookie = response.headers["set-cookie"]
+        assert "HttpOnly" in set_cookie
+        assert "Max-Age" not in set_cookie
+
+    def test_session_authenticates_requests(self, client, keycloak_client, session_store, make_token):
+        # Arrange
+        keycloak_client.exchange_code = AsyncMock(return_value=_tokens(make_token(sub="session-user")))
+        client.get("/auth/callback?code=test-code")
+
+        # Act
+        response = client.get("/auth/me")
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json()["id"] == "session-user"
+
+    def test_callback_rejects_invalid_token(self, client, keycloak_client, session_store):
+        # Arrange
+        keycloak_client.exchange_code = AsyncMock(return_value=_tokens("not-a-jwt"))
+
+        # Act
+        response = client.get("/auth/callback?code=test-code")
+
+        # Assert
+        assert response.status_code == 401
+        assert "session_id" not in response.cookies
+
+    def test_unreachable_store_returns_503(self, client, keycloak_client, session_store, make_token):
+        # Arrange
+        keycloak_client.exchange_code = AsyncMock(return_value=_tokens(make_token()))
+        session_store.backend.set = AsyncMock(side_effect=ConnectionRefusedError())
+
+        # Act
+        response = client.get("/auth/callback?code=test-code")
+
+        # Assert
+        assert response.status_code == 503
+        assert "session_id" not in response.cookies
+
+
+class TestSessionLogout:
+
+    @pytest.mark.asyncio
+    async def test_logout_ends_session(self, client, keycloak_client, session_store, make_token):
+        # Arrange
+        keycloak_client.exchange_code = AsyncMock(return_value=_tokens(make_token()))
+        session_id = client.get("/auth/callback?code=test-code").cookies["session_id"]
+
+        # Act
+        response = client.get("/auth/logout")
+
+        # Assert
+        assert await session_store.get(session_id) is None
+        assert any("session_id=" in h for h in response.headers.get_list("set-cookie"))
+
+    def test_unreachable_store_still_clears_cookies(self, client, session_store):
+        # Arrange
+        session_store.backend.get = AsyncMock(side_effect=TimeoutError())
+        client.cookies.set("session_id", "some-session")
+
+        # Act
+        response = client.get("/auth/logout", follow_redirects=False)
+
+        # Assert
+        assert response.status_code == 307
+        assert any(h.startswith("session_id=") for h in response.headers.get_list("set-cookie"))
+
+
+class TestSessionRefresh:
+
+    @pytest.mark.asyncio
+    async def test_refresh_updates_session(self, client, keycloak_client, session_store, make_token):
+        # Arrange
+        keycloak_client.exchange_code = AsyncMock(return_value=_tokens(make_token(), "old-refresh"))
+        session_id = client.get("/auth/callback?code=test-code").cookies["session_id"]
+        new_access = make_token(sub="refreshed")
+        keycloak_client.refresh_tokens = AsyncMock(return_value=_tokens(new_access, "new-refresh"))
+
+        # Act
+        response = client.post("/auth/refresh")
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json() == {"expires_in": 300}
+        keycloak_client.refresh_tokens.assert_called_once_with("old-refresh")
+        session = await session_store.get(session_id)
+        assert session.access_token == new_access
+        assert session.refresh_token == "new-refresh"
+
+    @pytest.mark.parametrize("method", ["get", "set"])
+    def test_unreachable_store_returns_503(self, client, keycloak_client, session_store, make_token, method):
+        # Arrange
+        keycloak_client.exchange_code = AsyncMock(return_value=_tokens(make_token()))
+        client.get("/auth/callback?code=test-code")
+        keycloak_client.refresh_tokens = AsyncMock(return_value=_tokens(make_token()))
+        setattr(session_store.backend, method, AsyncMock(side_effect=ConnectionRefusedError()))
+
+        # Act
+        response = client.post("/auth/refresh")
+
+        # Assert
+        assert response.status_code == 503
+
+    def test_refresh_without_session_returns_400(self, client, session_store):
+        # Act
+        response = client.post("/auth/refresh")
+
+        # Assert
+        assert response.status_code == 400
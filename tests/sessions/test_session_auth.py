@@ -0,0 +1,172 @@
+"""Tests for authenticating requests with a server-side session."""
+
+import time
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from starlette.testclient import TestClient
+
+from fastapi_keycloak_auth.cache_backends import MemoryCacheBackend
+from fastapi_keycloak_auth.dependencies import CurrentUser
+from fastapi_keycloak_auth.middleware import KeycloakAuthMiddleware
+from fastapi_keycloak_auth.extractors import TokenExtractor
+from fastapi_keycloak_auth.models import TokenResponse
+from fastapi_keycloak_auth.sessions import SessionStore
+
+
+@pytest.fixture
+def session_store(keycloak_settings, keycloak_client) -> SessionStore:
+    keycloak_settings.session_store_url = "memory://"
+    keycloak_client.session_store = SessionStore(MemoryCacheBackend())
+    keycloak_client.token_extractor = TokenExtractor.from_settings(keycloak_settings)
+    return keycloak_client.session_store
+
+
+@pytest.fixture
+def app(keycloak_settings, keycloak_client):
+    application = FastAPI()
+
+    @application.get("/me")
+    async def me(user: CurrentUser):
+        return {"sub": user.sub}
+
+    with patch("fastapi_keycloak_auth.dependencies._settings", keycloak_settings), \
+         patch("fastapi_keycloak_auth.dependencies._client", keycloak_client):
+        yield application
+
+
+def _tokens(access_token: str, expires_in: int = 300) -> TokenResponse:
+    return TokenResponse(access_token=access_token, refresh_token="refresh", expires_in=expires_in)
+
+
+def _get_me(app: FastAPI, session_id: str) -> httpx.Response:
+    client = TestClient(app)
+    client.cookies.set("session_id", session_id)
+    return client.get("/me")
+
+
+async def _login(keycloak_client, session_store, token: str, expires_in: int = 300) -> str:
+    user = await keycloak_client.verify_token(token)
+    return await session_store.create(_tokens(token, expires_in), user)
+
+
+class TestSessionAuthentication:
+
+    @pytest.mark.asyncio
+    async def test_session_cookie_authenticates_without_verifying(self, app, keycloak_client, session_store, make_token):
+        # Arrange
+        session_id = await _login(keycloak_client, session_store, make_token(sub="alice"))
+        keycloak_client.verify_token = AsyncMock()
+
+        # Act
+        response = _get_me(app, session_id)
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json() == {"sub": "alice"}
+        keycloak_client.verify_token.assert_not_called()
+
+    def test_unknown_session_returns_401(self, app, session_store):
+        # Act
+        response = _get_me(app, "unknown")
+
+        # Assert
+        assert response.status_code == 401
+
+    def test_session_cookie_ignored_without_store(self, app):
+        # Act
+        response = _get_me(app, "anything")
+
+        # Assert
+        assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_expiring_session_is_refreshed(self, app, keycloak_client, session_store, make_token):
+        # Arrange
+        session_id = await _login(keycloak_client, session_store, make_token(), expires_in=10)
+        new_access = make_token(sub="refreshed")
+        keycloak_client.refresh_tokens = AsyncMock(return_value=_tokens(new_access))
+
+        # Act
+        response = _get_me(app, session_id)
+
+        # Assert
+        assert response.json() == {"sub": "refreshed"}
+        keycloak_client.refresh_tokens.assert_called_once_with("refresh")
+        session = await session_store.get(session_id)
+        assert session.access_token == new_access
+        assert not session.expires_within(200)
+
+    @pytest.mark.asyncio
+    async def test_rejected_refresh_ends_session(self, app, keycloak_client, session_store, make_token):
+        # Arrange
+        session_id = await _login(keycloak_client, session_store, make_token(), expires_in=10)
+        request = httpx.Request("POST", "https://fake")
+        keycloak_client.refresh_tokens = AsyncMock(side_effect=httpx.HTTPStatusError(
+            "Bad Request", request=request, response=httpx.Response(400, request=request),
+        ))
+
+        # Act
+        response = _get_me(app, session_id)
+
+        # Assert
+        assert response.status_code == 401
+        assert await session_store.get(session_id) is None
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("status_code, body", [(503, None), (502, None), (401, {"error": "invalid_client"})])
+    async def test_failing_keycloak_keeps_valid_session(self, app, keycloak_client, session_store, make_token, status_code, body):
+        # Arrange
+        session_id = await _login(keycloak_client, session_store, make_token(sub="alice"), expires_in=10)
+        request = httpx.Request("POST", "https://fake")
+        keycloak_client.refresh_tokens = AsyncMock(side_effect=httpx.HTTPStatusError(
+            "Error", request=request, response=httpx.Response(status_code, json=body, request=request),
+        ))
+
+        # Act
+        response = _get_me(app, session_id)
+
+        # Assert
+        assert response.json() == {"sub": "alice"}
+        assert await session_store.get(session_id) is not None
+
+    @pytest.mark.asyncio
+    async def test_unreachable_keycloak_keeps_valid_session(self, app, keycloak_client, session_store, make_token):
+        # Arrange
+        session_id = await _login(keycloak_client, session_store, make_token(sub="alice"), expires_in=10)
+        keycloak_client.refresh_tokens = AsyncMock(side_effect=httpx.ConnectError("down"))
+
+        # Act
+        response = _get_me(app, session_id)
+
+        # Assert
+        assert response.json() == {"sub": "alice"}
+
+    @pytest.mark.asyncio
+    async def test_expired_session_returns_401(self, app, keycloak_client, session_store, make_token):
+        # Arrange
+        session_id = await _login(keycloak_client, session_store, make_token())
+        session = await session_store.get(session_id)
+        session.expires_at = time.time() - 1
+        session.refresh_token = None
+        await session_store.backend.set(session_store._key(session_id), session.to_bytes(), ttl=60)
+
+        # Act
+        response = _get_me(app, session_id)
+
+        # Assert
+        assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_middleware_resolves_session(self, app, keycloak_client, session_store, make_token):
+        # Arrange
+        session_id = await _login(keycloak_client, session_store, make_token(sub="alice"))
+        app.add_middleware(KeycloakAuthMiddleware, client=keycloak_client, require_auth=True)
+
+        # Act
+        response = _get_me(app, session_id)
+
+        # Assert
+        assert response.json() == {"sub": "alice"}
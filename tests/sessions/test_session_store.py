@@ -0,0 +1,103 @@
+"""Tests for SessionStore."""
+
+import time
+
+import pytest
+
+from fastapi_keycloak_auth.cache_backends import MemoryCacheBackend
+from fastapi_keycloak_auth.models import TokenPayload, TokenResponse
+from fastapi_keycloak_auth.sessions import Session, SessionStore
+
+
+@pytest.fixture
+def store() -> SessionStore:
+    return SessionStore(MemoryCacheBackend(), default_ttl=600)
+
+
+@pytest.fixture
+def user() -> TokenPayload:
+    return TokenPayload(sub="user-id", preferred_username="user", exp=int(time.time()) + 300)
+
+
+def _tokens(**overrides) -> TokenResponse:
+    return TokenResponse(**{"access_token": "access", "refresh_token": "refresh", "expires_in": 300, **overrides})
+
+
+class TestSessionStore:
+
+    @pytest.mark.asyncio
+    async def test_create_and_get(self, store, user):
+        # Act
+        session_id = await store.create(_tokens(), user)
+        session = await store.get(session_id)
+
+        # Assert
+        assert session.access_token == "access"
+        assert session.refresh_token == "refresh"
+        assert session.user == user
+        assert not session.expires_within(200)
+
+    @pytest.mark.asyncio
+    async def test_session_ids_are_unique_and_not_stored(self, store, user):
+        # Act
+        first = await store.create(_tokens(), user)
+        second = await store.create(_tokens(), user)
+
+        # Assert
+        assert first != second
+        assert all(first not in key and second not in key for key in store.backend._entries)
+
+    @pytest.mark.asyncio
+    async def test_unknown_session_returns_none(self, store):
+        # Act & Assert
+        assert await store.get("unknown") is None
+
+    @pytest.mark.asyncio
+    async def test_delete(self, store, user):
+        # Arrange
+        session_id = await store.create(_tokens(), user)
+
+        # Act
+        await store.delete(session_id)
+
+        # Assert
+        assert await store.get(session_id) is None
+
+    @pytest.mark.asyncio
+    async def test_save_replaces_tokens(self, store, user):
+        # Arrange
+        session_id = await store.create(_tokens(), user)
+
+        # Act
+        await store.save(session_id, _tokens(access_token="new-access"), user)
+
+        # Assert
+        assert (await store.get(session_id)).access_token == "new-access"
+
+    @pytest.mark.asyncio
+    async def test_malformed_session_returns_none(self, store):
+        # Arrange
+        await store.backend.set(store._key("broken"), b'{"access_token": "x"}', ttl=60)
+
+        # Act & Assert
+        assert await store.get("broken") is None
+
+    @pytest.mark.parametrize("refresh_expires_in, expected", [(1200, 1200), (None, 600)])
+    def test_ttl_follows_refresh_token_lifetime(self, store, refresh_expires_in, expected):
+        # Act & Assert
+        assert store.ttl_for(_tokens(refresh_expires_in=refresh_expires_in)) == expected
+
+
+class TestSession:
+
+    def test_round_trip(self, user):
+        # Arrange
+        session = Session(access_token="a", refresh_token=None, expires_at=123.0, user=user)
+
+        # Act & Assert
+        assert Session.from_bytes(session.to_bytes()) == session
+
+    def test_invalid_data_raises(self):
+        # Act & Assert
+        with pytest.raises(ValueError):
+            Session.from_bytes(b'{"access_token": "a"}')
@@ -0,0 +1,120 @@
+"""Tests for SingleFlight."""
+
+import asyncio
+
+import pytest
+
+from fastapi_keycloak_auth.singleflight import SingleFlight
+
+
+class TestCoalescing:
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        # Arrange
+        flights = SingleFlight()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "result"
+
+        # Act
+        results = await asyncio.gather(*(flights.do("key", fetch) for _ in range(10)))
+
+        # Assert
+        assert calls == 1
+        assert results == ["result"] * 10
+
+    @pytest.mark.asyncio
+    async def test_different_keys_run_separately(self):
+        # Arrange
+        flights = SingleFlight()
+        calls = []
+
+        async def fetch(key):
+            calls.append(key)
+            await asyncio.sleep(0.01)
+            return key
+
+        # Act
+        await asyncio.gather(flights.do("a", lambda: fetch("a")), flights.do("b", lambda: fetch("b")))
+
+        # Assert
+        assert sorted(calls) == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_run_again(self):
+        # Arrange
+        flights = SingleFlight()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+
+        # Act
+        await flights.do("key", fetch)
+        await flights.do("key", fetch)
+
+        # Assert
+        assert calls == 2
+
+
+class TestErrors:
+
+    @pytest.mark.asyncio
+    async def test_exception_is_shared_with_all_waiters(self):
+        # Arrange
+        flights = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        # Act
+        results = await asyncio.gather(*(flights.do("key", fail) for _ in range(3)), return_exceptions=True)
+
+        # Assert
+        assert all(isinstance(r, ValueError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_call(self):
+        # Arrange
+        flights = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.02)
+            return "result"
+
+        first = asyncio.create_task(flights.do("key", fetch))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(flights.do("key", fetch))
+        await asyncio.sleep(0)
+
+        # Act
+        first.cancel()
+
+        # Assert
+        assert await second == "result"
+
+    @pytest.mark.asyncio
+    async def test_in_flight_reports_running_call(self):
+        # Arrange
+        flights = SingleFlight()
+        started = asyncio.Event()
+
+        async def fetch():
+            started.set()
+            await asyncio.sleep(0.01)
+
+        # Act
+        task = asyncio.create_task(flights.do("key", fetch))
+        await started.wait()
+
+        # Assert
+        assert flights.in_flight("key") is True
+        await task
+        assert flights.in_flight("key") is False
@@ -0,0 +1,129 @@
+"""Tests for SnapshotStore."""
+
+import json
+import os
+import time
+
+import pytest
+
+from fastapi_keycloak_auth.snapshot import SnapshotStore, jwk_thumbprint, jwks_fingerprints
+
+ISSUER = "https://keycloak.example.local/realms/test-realm"
+
+
+@pytest.fixture
+def store(tmp_path) -> SnapshotStore:
+    return SnapshotStore(str(tmp_path / "snapshot.json"), ttl=60)
+
+
+class TestThumbprint:
+
+    def test_rfc7638_example(self):
+        # Arrange — example key from RFC 7638, section 3.1
+        key = {
+            "kty": "RSA",
+            "n": "0vx7agoebGcQSuuPiLJXZptN9nndrQmbXEps2aiAFbWhM78LhWx4cbbfAAtVT86zwu1RK7aPFFxuhDR1L6tSoc_BJECPebWKRXjBZCiFV4n3oknjhMstn64tZ_2W-5JsGY4Hc5n9yBXArwl93lqt7_RN5w6Cf0h4QyQ5v-65YGjQR0_FDW2QvzqY368QQMicAtaSqzs8KJZgnYb9c7d0zgdAZHzu6qMQvRL5hajrn1n91CbOpbISD08qNLyrdkt-bFTWhAI4vMQFh6WeZu0fM4lFd2NcRwr3XPksINHaQ-G_xBniIqbw0Ls1jF44-csFCur-kEgU8awapJzKnqDKgw",
+            "e": "AQAB",
+            "alg": "RS256",
+            "kid": "2011-04-29",
+        }
+
+        # Act
+        thumbprint = jwk_thumbprint(key)
+
+        # Assert
+        assert thumbprint == "NzbLsXh8uDCcd-6MNwXF4W_7noWXFZAfHkxZsRGC9Xs"
+
+    def test_unsupported_key_type_raises(self):
+        # Act & Assert
+        with pytest.raises(ValueError):
+            jwk_thumbprint({"kty": "oct", "k": "secret"})
+
+
+class TestSaveAndLoad:
+
+    def test_roundtrip(self, store, openid_configuration, jwks_response):
+        # Arrange
+        store.save(ISSUER, openid_configuration, jwks_response)
+
+        # Act
+        snapshot = store.load(ISSUER)
+
+        # Assert
+        assert snapshot is not None
+        assert snapshot.openid_configuration == openid_configuration
+        assert snapshot.jwks == jwks_response
+
+    def test_save_leaves_no_temporary_files(self, store, tmp_path, openid_configuration, jwks_response):
+        # Act
+        store.save(ISSUER, openid_configuration, jwks_response)
+        store.save(ISSUER, openid_configuration, jwks_response)
+
+        # Assert
+        assert os.listdir(tmp_path) == ["snapshot.json"]
+
+    def test_missing_file_returns_none(self, store):
+        # Act & Assert
+        assert store.load(ISSUER) is None
+
+    def test_stale_snapshot_returns_none(self, store, openid_configuration, jwks_response):
+        # Arrange
+        store.save(ISSUER, openid_configuration, jwks_response)
+        store.ttl = 0
+        time.sleep(0.01)
+
+        # Act & Assert
+        assert store.load(ISSUER) is None
+
+    def test_other_issuer_returns_none(self, store, openid_configuration, jwks_response):
+        # Arrange
+        store.save(ISSUER, openid_configuration, jwks_response)
+
+        # Act & Assert
+        assert store.load("https://other.example.local/realms/other") is None
+
+    def test_mismatching_fingerprint_returns_none(self, store, openid_configuration, jwks_response, rotated_rsa_keypair):
+        # Arrange — key material swapped without updating fingerprints
+        store.save(ISSUER, openid_configuration, jwks_response)
+        with open(store.path) as f:
+            data = json.load(f)
+        data["jwks"]["keys"][0]["n"] = rotated_rsa_keypair["jwk"]["n"]
+        with open(store.path, "w") as f:
+            json.dump(data, f)
+
+        # Act & Assert
+        assert store.load(ISSUER) is None
+
+    def test_corrupt_file_returns_none(self, store):
+        # Arrange
+        with open(store.path, "w") as f:
+            f.write("{not json")
+        os.chmod(store.path, 0o600)
+
+        # Act & Assert
+        assert store.load(ISSUER) is None
+
+    @pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+    def test_saved_file_is_private(self, store, openid_configuration, jwks_response):
+        # Act
+        store.save(ISSUER, openid_configuration, jwks_response)
+
+        # Assert
+        assert os.stat(store.path).st_mode & 0o777 == 0o600
+
+    @pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+    def test_group_writable_file_returns_none(self, store, openid_configuration, jwks_response):
+        # Arrange
+        store.save(ISSUER, openid_configuration, jwks_response)
+        os.chmod(store.path, 0o664)
+
+        # Act & Assert
+        assert store.load(ISSUER) is None
+
+    def test_fingerprints_are_stored(self, store, openid_configuration, jwks_response):
+        # Act
+        store.save(ISSUER, openid_configuration, jwks_response)
+
+        # Assert
+        with open(store.path) as f:
+            assert json.load(f)["fingerprints"] == jwks_fingerprints(jwks_response)
@@ -0,0 +1,162 @@
+"""Tests for FakeKeycloak, driven through KeycloakClient."""
+
+from urllib.parse import parse_qs, urlsplit
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from fastapi_keycloak_auth.client import KeycloakClient
+from fastapi_keycloak_auth.config import KeycloakSettings
+from fastapi_keycloak_auth.testing import FakeKeycloak
+
+
+@pytest.fixture(scope="module")
+def fake_keycloak():
+    """One fake realm per module, since generating its RSA key is slow."""
+    return FakeKeycloak(KeycloakSettings(), users={"alice": {"email": "alice@example.local", "roles": ["admin"]}})  # type: ignore[call-arg]
+
+
+@pytest_asyncio.fixture
+async def client(keycloak_settings, fake_keycloak):
+    fake_keycloak.calls.clear()
+    client = KeycloakClient(keycloak_settings, transport=httpx.ASGITransport(app=fake_keycloak))
+    yield client
+    await client.aclose()
+
+
+class TestDiscovery:
+
+    @pytest.mark.asyncio
+    async def test_serves_discovery_document(self, client, keycloak_settings):
+        # Act
+        configuration = await client.get_openid_configuration()
+
+        # Assert
+        assert configuration.issuer == keycloak_settings.issuer
+        assert configuration.jwks_uri.endswith("/protocol/openid-connect/certs")
+
+    @pytest.mark.asyncio
+    async def test_counts_calls(self, client, fake_keycloak):
+        # Act
+        await client.get_jwks()
+
+        # Assert
+        assert fake_keycloak.calls == {"discovery": 1, "jwks": 1}
+
+
+class TestTokens:
+
+    @pytest.mark.asyncio
+    async def test_issued_token_verifies(self, client, fake_keycloak):
+        # Arrange
+        token = fake_keycloak.issue_access_token("alice")
+
+        # Act
+        payload = await client.verify_token(token)
+
+        # Assert
+        assert payload.preferred_username == "alice"
+        assert payload.has_role("admin")
+
+    @pytest.mark.asyncio
+    async def test_exchange_code(self, client, fake_keycloak):
+        # Arrange
+        code = fake_keycloak.issue_code("alice")
+
+        # Act
+        tokens = await client.exchange_code(code)
+
+        # Assert
+        assert tokens.refresh_token
+        assert (await client.verify_token(tokens.access_token)).email == "alice@example.local"
+
+    @pytest.mark.asyncio
+    async def test_code_is_single_use(self, client, fake_keycloak):
+        # Arrange
+        code = fake_keycloak.issue_code()
+        await client.exchange_code(code)
+
+        # Act & Assert
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.exchange_code(code)
+
+    @pytest.mark.asyncio
+    async def test_refresh_rotates_refresh_token(self, client, fake_keycloak):
+        # Arrange: the client would otherwise reuse the first result within its grace period
+        client.settings.refresh_grace_period = 0
+        tokens = await client.exchange_code(fake_keycloak.issue_code())
+
+        # Act
+        refreshed = await client.refresh_tokens(tokens.refresh_token)
+
+        # Assert
+        assert refreshed.refresh_token != tokens.refresh_token
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.refresh_tokens(tokens.refresh_token)
+
+    @pytest.mark.asyncio
+    async def test_wrong_client_secret_is_rejected(self, client, fake_keycloak):
+        # Arrange
+        client.settings.client_secret = "wrong"
+
+        # Act & Assert
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.exchange_code(fake_keycloak.issue_code())
+
+    def test_unknown_user_raises(self, fake_keycloak):
+        # Act & Assert
+        with pytest.raises(KeyError):
+            fake_keycloak.issue_code("nobody")
+
+
+class TestUserinfo:
+
+    @pytest.mark.asyncio
+    async def test_returns_claims_for_issued_token(self, client, fake_keycloak):
+        # Act
+        userinfo = await client.get_userinfo(fake_keycloak.issue_access_token("alice"))
+
+        # Assert
+        assert userinfo["preferred_username"] == "alice"
+
+    @pytest.mark.asyncio
+    async def test_rejects_unknown_token(self, client):
+        # Act & Assert
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.get_userinfo("not-issued")
+
+
+class TestBrowserEndpoints:
+
+    @pytest.mark.asyncio
+    async def test_authorize_redirects_with_code_and_state(self, fake_keycloak, keycloak_settings):
+        # Arrange
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=fake_keycloak)) as http:
+            # Act
+            response = await http.get(
+                fake_keycloak.openid_configuration["authorization_endpoint"],
+                params={"client_id": keycloak_settings.client_id, "redirect_uri": keycloak_settings.callback_url, "state": "/next"},
+            )
+
+        # Assert
+        location = urlsplit(response.headers["location"])
+        query = parse_qs(location.query)
+        assert response.status_code == 302
+        assert f"{location.scheme}://{location.netloc}{location.path}" == keycloak_settings.callback_url
+        assert query["state"] == ["/next"]
+        assert query["code"][0] in fake_keycloak._codes
+
+    @pytest.mark.asyncio
+    async def test_logout_redirects_to_post_logout_uri(self, fake_keycloak):
+        # Arrange
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=fake_keycloak)) as http:
+            # Act
+            response = await http.get(
+                fake_keycloak.openid_configuration["end_session_endpoint"],
+                params={"post_logout_redirect_uri": "http://localhost:8000/auth/logout-callback"},
+            )
+
+        # Assert
+        assert response.headers["location"] == "http://localhost:8000/auth/logout-callback"
+        assert fake_keycloak.calls["end_session"] == 1
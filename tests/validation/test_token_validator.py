@@ -0,0 +1,141 @@
+"""Tests for TokenValidator."""
+
+import time
+
+import pytest
+from jose import JWTError
+from jose.exceptions import ExpiredSignatureError, JWTClaimsError
+
+from fastapi_keycloak_auth.validation import TokenValidator
+
+ISSUER = "https://keycloak.example.local/realms/test-realm"
+
+
+@pytest.fixture
+def validator() -> TokenValidator:
+    return TokenValidator(issuer=ISSUER, audiences={"api", "account"}, algorithms={"RS256"})
+
+
+def _claims(**overrides) -> dict:
+    now = int(time.time())
+    return {"sub": "user", "iss": ISSUER, "aud": "api", "iat": now, "exp": now + 60, **overrides}
+
+
+class TestFromSettings:
+
+    def test_compiles_settings(self, keycloak_settings):
+        # Arrange
+        keycloak_settings.audience = "api, account"
+        keycloak_settings.authorized_parties = "frontend,cli"
+        keycloak_settings.required_claims = "azp typ=Bearer"
+        keycloak_settings.token_leeway = 5
+        keycloak_settings.jwt_algorithms = "ES256"
+
+        # Act
+        validator = TokenValidator.from_settings(keycloak_settings)
+
+        # Assert
+        assert validator.issuer == keycloak_settings.issuer
+        assert validator.audiences == {"api, account", "api", "account"}
+        assert validator.authorized_parties == {"frontend", "cli"}
+        assert validator.required_claims == {"azp", "typ"}
+        assert validator.claim_values == {"typ": "Bearer"}
+        assert validator.algorithms == {"ES256"}
+        assert validator.leeway == 5
+
+    def test_defaults_check_nothing_extra(self, keycloak_settings):
+        # Act
+        validator = TokenValidator.from_settings(keycloak_settings)
+
+        # Assert
+        assert validator.authorized_parties == frozenset()
+        assert validator.required_claims == frozenset()
+        assert validator.leeway == 0
+
+
+class TestCheckHeader:
+
+    def test_allowed_header_passes(self, validator):
+        # Act & Assert
+        validator.check_header({"alg": "RS256", "kid": "key"})
+
+    @pytest.mark.parametrize("header", [{"alg": "HS256"}, {"alg": "none"}, {}, {"alg": "RS256", "kid": 1}])
+    def test_invalid_header_raises(self, validator, header):
+        # Act & Assert
+        with pytest.raises(JWTError):
+            validator.check_header(header)
+
+
+class TestValidate:
+
+    def test_valid_claims_pass(self, validator):
+        # Act & Assert
+        validator.validate(_claims())
+
+    @pytest.mark.parametrize("aud", ["account", ["other", "api"], None, []])
+    def test_accepted_audiences(self, validator, aud):
+        # Act & Assert
+        validator.validate(_claims(aud=aud))
+
+    @pytest.mark.parametrize("aud", ["other", ["other"], 42, [{"a": 1}]])
+    def test_invalid_audience_raises(self, validator, aud):
+        # Act & Assert
+        with pytest.raises(JWTError, match="Invalid audience"):
+            validator.validate(_claims(aud=aud))
+
+    def test_expired_token_raises(self, validator):
+        # Act & Assert
+        with pytest.raises(ExpiredSignatureError):
+            validator.validate(_claims(exp=int(time.time()) - 10))
+
+    def test_leeway_allows_clock_skew(self):
+        # Arrange
+        validator = TokenValidator(issuer=ISSUER, audiences={"api"}, algorithms={"RS256"}, leeway=30)
+
+        # Act & Assert
+        validator.validate(_claims(exp=int(time.time()) - 10, nbf=int(time.time()) + 10))
+
+    def test_wrong_issuer_raises(self, validator):
+        # Act & Assert
+        with pytest.raises(JWTClaimsError, match="Invalid issuer"):
+            validator.validate(_claims(iss="https://other.example.local/realms/test-realm"))
+
+    def test_missing_required_claims_raise(self):
+        # Arrange
+        validator = TokenValidator(
+            issuer=ISSUER, audiences={"api"}, algorithms={"RS256"}, required_claims={"azp", "typ", "nbf"},
+        )
+
+        # Act & Assert
+        with pytest.raises(JWTClaimsError, match="Missing required claims: nbf, typ"):
+            validator.validate(_claims(azp="frontend"))
+
+    def test_expected_claim_values_checked(self):
+        # Arrange
+        validator = TokenValidator(
+            issuer=ISSUER, audiences={"api"}, algorithms={"RS256"}, claim_values={"typ": "Bearer"},
+        )
+
+        # Act & Assert
+        validator.validate(_claims(typ="Bearer"))
+        with pytest.raises(JWTClaimsError, match="Invalid typ claim: Refresh"):
+            validator.validate(_claims(typ="Refresh"))
+        with pytest.raises(JWTClaimsError, match="Invalid typ claim"):
+            validator.validate(_claims(typ=["Bearer"]))
+        with pytest.raises(JWTClaimsError, match="Missing required claims: typ"):
+            validator.validate(_claims())
+
+    def test_authorized_party_checked(self):
+        # Arrange
+        validator = TokenValidator(
+            issuer=ISSUER, audiences={"api"}, algorithms={"RS256"}, authorized_parties={"frontend"},
+        )
+
+        # Act & Assert
+        validator.validate(_claims(azp="frontend"))
+        with pytest.raises(JWTClaimsError, match="Invalid authorized party"):
+            validator.validate(_claims(azp="other"))
+        with pytest.raises(JWTClaimsError, match="Invalid authorized party"):
+            validator.validate(_claims())
+        with pytest.raises(JWTClaimsError, match="Invalid authorized party"):
+            validator.validate(_claims(azp=["frontend"]))